@@ -0,0 +1,133 @@
+"""
+Load test the AI websocket against a local stub model backend.
+
+Serves main.app with uvicorn on a free local port and swaps the Gemini client
+for a stub that waits --latency seconds per generation and echoes the prompt.
+Callers share AIConnection sockets from package.client the way the bots do:
+    - a sequential run, one question at a time, as the baseline
+    - a concurrent run, --requests questions at once over --connections sockets
+
+Every answer is checked against the question that asked it. Reported per run:
+wall time, throughput, latency (median and p95) and the most generations the
+stub saw at once, which model_slots caps at --model-concurrency. Payloads that
+are not JSON objects are checked to get an error frame back.
+
+Usage: python bench_concurrency.py [--requests 200] [--connections 4] [--latency 0.5] [--model-concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import time
+from types import SimpleNamespace
+
+import uvicorn
+import websockets
+
+API_KEY = "bench"
+
+
+class StubModel:
+    """Stands in for genai.Client: sleeps like a model call and answers with the prompt."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self.generate_content))
+
+    async def generate_content(self, model: str, contents: list):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        return SimpleNamespace(text=contents[0])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def ask(connection, prompt: str, timings: list):
+    start = time.perf_counter()
+    response = await connection.request({"text_input": prompt, "files": []})
+    timings.append(time.perf_counter() - start)
+    assert response.get("response") == prompt, f"{prompt!r} got {response!r}"
+
+
+def report(label: str, count: int, wall: float, timings: list, peak: int):
+    timings = sorted(timings)
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"    {label}")
+    print(f"        wall {wall:>7.2f} s   {count / wall:>7.1f} req/s   peak model calls {peak}")
+    print(f"        latency p50 {statistics.median(timings) * 1000:>7.0f} ms  p95 {p95 * 1000:>7.0f} ms")
+
+
+async def check_invalid_payloads(url: str):
+    async with websockets.connect(url) as websocket:
+        for payload in ("[]", '"hi"', "1", "not json"):
+            await websocket.send(payload)
+            reply = json.loads(await asyncio.wait_for(websocket.recv(), 5))
+            assert reply == {"status": "error", "error": "Invalid JSON.", "finished": True}, reply
+    print("    non-object payloads answered with an error frame")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="questions in the concurrent run")
+    parser.add_argument("--connections", type=int, default=4, help="sockets the concurrent run is spread over")
+    parser.add_argument("--sequential", type=int, default=10, help="questions in the sequential run")
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds the stub model takes per answer")
+    parser.add_argument("--model-concurrency", type=int, default=8, help="MODEL_CONCURRENCY for the server")
+    args = parser.parse_args()
+
+    # main reads both at import time
+    os.environ["API_KEY"] = API_KEY
+    os.environ["MODEL_CONCURRENCY"] = str(args.model_concurrency)
+    import main as server_main
+    from package.client import AIConnection
+
+    model = server_main.client = StubModel(args.latency)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(server_main.app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    url = f"ws://127.0.0.1:{port}/ws/process/?api_key={API_KEY}"
+    connections = [AIConnection(url) for _ in range(args.connections)]
+    print(f"stub latency {args.latency}s, MODEL_CONCURRENCY {args.model_concurrency}")
+    try:
+        await check_invalid_payloads(url)
+
+        timings = []
+        start = time.perf_counter()
+        for index in range(args.sequential):
+            await ask(connections[0], f"sequential {index}", timings)
+        report(f"sequential, {args.sequential} requests", args.sequential, time.perf_counter() - start, timings, model.peak)
+
+        model.peak = 0
+        timings = []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            ask(connections[index % len(connections)], f"concurrent {index}", timings)
+            for index in range(args.requests)
+        ))
+        label = f"concurrent, {args.requests} requests over {args.connections} connections"
+        report(label, args.requests, time.perf_counter() - start, timings, model.peak)
+    finally:
+        for connection in connections:
+            if connection._websocket is not None:
+                await connection._websocket.close()
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
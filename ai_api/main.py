@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import base64
 from fastapi.params import Query
 from google import genai
@@ -27,6 +28,12 @@ client = genai.Client(api_key=api_key)
 #MODEL_NAME = "gemini-2.0-flash-lite"
 MODEL_NAME = "gemma-3-27b-it"
 
+# Model calls running at once across all connections, and requests one connection may have in flight
+MODEL_CONCURRENCY = int(os.environ.get("MODEL_CONCURRENCY", "8"))
+MAX_IN_FLIGHT_PER_CONNECTION = int(os.environ.get("MAX_IN_FLIGHT_PER_CONNECTION", "16"))
+
+model_slots = asyncio.Semaphore(MODEL_CONCURRENCY)
+
 async def process_input(text_input: str, file_inputs: Optional[List[Union[str, UploadFile, pathlib.Path, Dict[str, Any]]]] = None) -> dict:
 
     if not isinstance(text_input, str):
@@ -47,7 +54,7 @@ async def process_input(text_input: str, file_inputs: Optional[List[Union[str, U
             
             if isinstance(input_item, dict) and 'filename' in input_item and 'content' in input_item:
                 filename = input_item['filename']
-                file_bytes = base64.b64decode(input_item['content'])
+                file_bytes = await asyncio.to_thread(base64.b64decode, input_item['content'])
             
             elif isinstance(input_item, UploadFile):
                 filename = input_item.filename
@@ -74,6 +81,59 @@ async def process_input(text_input: str, file_inputs: Optional[List[Union[str, U
     
     return result
 
+async def generate(contents: list) -> str:
+    """Run the model through the async client so generation never blocks the event loop."""
+    async with model_slots:
+        response = await client.aio.models.generate_content(
+            model=MODEL_NAME,
+            contents=contents
+        )
+    return response.text
+
+async def handle_request(send, data: dict):
+    """
+    Answer one request. Replies carry the request's "id" so a client can have
+    several requests in flight on one connection; requests without an id get
+    the original untagged replies.
+    """
+    request_id = data.get("id")
+
+    def message(**fields) -> dict:
+        if request_id is not None:
+            fields["id"] = request_id
+        return fields
+
+    try:
+        await send(message(status="processing"))
+
+        text_input = data.get("text_input", "")
+        file_inputs = data.get("files", [])
+
+        processed_data = await process_input(text_input, file_inputs)
+
+        await send(message(status="generating_response"))
+
+        contents = [processed_data["text_content"]] + processed_data["file_parts"]
+        response_text = await generate(contents)
+
+        await send(message(
+            status="complete",
+            response=response_text,
+            finished=True
+        ))
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        try:
+            await send(message(
+                status="error",
+                error=str(e),
+                finished=True
+            ))
+        except Exception:
+            pass
+
 @app.websocket("/ws/process/")
 async def websocket_process(websocket: WebSocket, api_key: Optional[str] = Query(None)):
     await websocket.accept()
@@ -86,39 +146,41 @@ async def websocket_process(websocket: WebSocket, api_key: Optional[str] = Query
         })
         await websocket.close(code=1008)
         return
-    
+
+    send_lock = asyncio.Lock()
+    in_flight = asyncio.Semaphore(MAX_IN_FLIGHT_PER_CONNECTION)
+    tasks = set()
+
+    async def send(payload: dict):
+        async with send_lock:
+            await websocket.send_json(payload)
+
+    def finished(task: asyncio.Task):
+        tasks.discard(task)
+        in_flight.release()
+
     try:
-        data = await websocket.receive_json()
-        await websocket.send_json({"status": "processing"})
-        
-        text_input = data.get("text_input", "")
-        file_inputs = data.get("files", [])
-        
-        processed_data = await process_input(text_input, file_inputs)
-        
-        await websocket.send_json({"status": "generating_response"})
-        
-        contents = [processed_data["text_content"]] + processed_data["file_parts"]
-        
-        response = client.models.generate_content(
-            model=MODEL_NAME, 
-            contents=contents
-        )
-        
-        await websocket.send_json({
-            "status": "complete", 
-            "response": response.text,
-            "finished": True
-        })
-        
+        while True:
+            try:
+                data = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                data = None
+
+            # Requests are objects, anything else could never be answered by id
+            if not isinstance(data, dict):
+                await send({"status": "error", "error": "Invalid JSON.", "finished": True})
+                continue
+
+            await in_flight.acquire()
+            task = asyncio.create_task(handle_request(send, data))
+            tasks.add(task)
+            task.add_done_callback(finished)
+
     except WebSocketDisconnect:
         print("Client disconnected")
-    except Exception as e:
-        await websocket.send_json({
-            "status": "error",
-            "error": str(e),
-            "finished": True
-        })
+    finally:
+        for task in tasks:
+            task.cancel()
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=2)
\ No newline at end of file
@@ -7,6 +7,7 @@ import websockets
 import aiohttp
 import time
 import os
+import uuid
 from urllib.parse import urlparse
 from typing import List, Optional, Dict, Any, Union
 
@@ -39,6 +40,95 @@ class AIResponse:
 
 server_ip = ""
 
+# Seconds to wait for an answer before giving up on a request
+REQUEST_TIMEOUT = 120
+
+CHARGE_CREDIT = """
+UPDATE ai_config SET
+    remaining_credits_free = CASE WHEN remaining_credits_free > 0 THEN remaining_credits_free - 1 ELSE remaining_credits_free END,
+    remaining_credits_paid = CASE WHEN remaining_credits_free > 0 THEN remaining_credits_paid ELSE remaining_credits_paid - 1 END
+WHERE remaining_credits_free > 0 OR remaining_credits_paid > 0
+"""
+
+
+class AIConnection:
+    """
+    One websocket to the AI service shared by every ask_ai call. Requests are
+    tagged with an id and answers are routed back by it, so any number of
+    questions can be in flight at once. The socket is reopened on demand
+    after the service restarts or the connection drops.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._websocket = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: Dict[str, tuple] = {}
+        self._connect_lock = asyncio.Lock()
+
+    async def _connect(self):
+        async with self._connect_lock:
+            if self._reader is None or self._reader.done():
+                self._websocket = await websockets.connect(self.url, max_size=None)
+                self._reader = asyncio.create_task(self._read(self._websocket))
+            return self._websocket
+
+    async def _read(self, websocket):
+        try:
+            async for message in websocket:
+                response = json.loads(message)
+                entry = self._pending.get(response.get("id"))
+                if entry is not None and response.get("finished") and not entry[1].done():
+                    entry[1].set_result(response)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            error = ConnectionError("Connection to the AI service was closed.")
+            for sent_on, future in list(self._pending.values()):
+                if sent_on is websocket and not future.done():
+                    future.set_exception(error)
+
+    async def request(self, payload: dict, timeout: float = REQUEST_TIMEOUT) -> dict:
+        request_id = uuid.uuid4().hex
+        message = json.dumps({"id": request_id, **payload})
+
+        try:
+            # A socket that died while idle only shows up on send, so retry once on a fresh one
+            for attempt in range(2):
+                websocket = await self._connect()
+                future = asyncio.get_running_loop().create_future()
+                self._pending[request_id] = (websocket, future)
+                try:
+                    await websocket.send(message)
+                    break
+                except websockets.ConnectionClosed:
+                    if attempt == 1:
+                        raise
+                    del self._pending[request_id]
+                    await websocket.close()
+                    if self._reader is not None:
+                        await asyncio.wait([self._reader])
+
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+
+_connections: Dict[str, AIConnection] = {}
+
+def get_connection(url: str) -> AIConnection:
+    connection = _connections.get(url)
+    if connection is None:
+        connection = _connections[url] = AIConnection(url)
+    return connection
+
+def _encode_file(content: bytes) -> str:
+    return base64.b64encode(content).decode('utf-8')
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
 async def ask_ai(
     bot,
     text_input: str,
@@ -52,19 +142,19 @@ async def ask_ai(
     if bot is None:
         raise ValueError("Bot instance is required to access AI configuration.")
     
-    ai_config = await bot.db.fetchone("SELECT * FROM ai_config")
-    if ai_config is None:
-        raise ValueError("AI configuration not found in the database.")
-    
-    free_credits = ai_config[1]
-    paid_credits = ai_config[2]
-    
-    if free_credits <= 0 and paid_credits <= 0:
+    has_credits = await bot.db.fetchone(
+        "SELECT 1 FROM ai_config WHERE remaining_credits_free > 0 OR remaining_credits_paid > 0 LIMIT 1"
+    )
+    if not has_credits:
         raise ValueError("No AI credits available. Please check your AI configuration.")
     
     files = []
     if file_paths:
-        async with aiohttp.ClientSession() as session:
+        # Reuse the bot's pooled session when it has one, standalone callers get a temporary one
+        http_client = getattr(bot, "http_client", None)
+        owned_session = None if http_client else aiohttp.ClientSession()
+        session = http_client.session if http_client else owned_session
+        try:
             for path_or_url in file_paths:
                 try:
                     if path_or_url.lower().startswith(('http://', 'https://')):
@@ -73,17 +163,20 @@ async def ask_ai(
                             file_content = await response.read()
                             filename = os.path.basename(urlparse(path_or_url).path)
                     else:
-                        with open(path_or_url, 'rb') as file:
-                            file_content = file.read()
+                        file_content = await asyncio.to_thread(_read_file, path_or_url)
                         filename = os.path.basename(path_or_url)
                     
-                    b64_content = base64.b64encode(file_content).decode('utf-8')
+                    # Large attachments are encoded off the event loop
+                    b64_content = await asyncio.to_thread(_encode_file, file_content)
                     files.append({
                         'filename': filename,
                         'content': b64_content
                     })
                 except Exception as e:
                     pass
+        finally:
+            if owned_session is not None:
+                await owned_session.close()
     
     prompt = text_input
     if return_json:
@@ -94,29 +187,16 @@ async def ask_ai(
         "files": files
     }
     
-    final_response = None
-    
-    async with websockets.connect(websocket_url) as websocket:
-        await websocket.send(json.dumps(payload))
-        
-        while True:
-            response_text = await websocket.recv()
-            response = json.loads(response_text)
-            
-            if response.get("finished"):
-                final_response = response
-                break
+    final_response = await get_connection(websocket_url).request(payload)
     
     end_time = time.time()
     total_time = end_time - start_time
 
-    if final_response is None:
-        raise ValueError("No response received from the AI service.")
-    
-    if free_credits > 0:
-        await bot.db.execute("UPDATE ai_config SET remaining_credits_free = remaining_credits_free - 1")
-    else:
-        await bot.db.execute("UPDATE ai_config SET remaining_credits_paid = remaining_credits_paid - 1")
+    if final_response.get("status") == "error":
+        # Failed generations are not charged
+        return AIResponse(raw_response=final_response, total_time=total_time)
+
+    await bot.db.execute(CHARGE_CREDIT)
 
     await bot.db.execute(
         "INSERT INTO ai_calls (call_type, response_time_ms, input_tokens, output_tokens, response_text) VALUES (?, ?, ?, ?, ?)",
@@ -45,27 +45,20 @@ async def func():
             } if member else None
         }
 
-    vouches_query = await bot.db.fetchall(
+    # Per-seller counters are maintained by triggers on the vouches table
+    vouch_counts = await bot.db.fetchall(
         """
-        SELECT message
-        FROM vouches
+        SELECT s.user_id, s.vouch_count
+        FROM seller_vouch_stats s
+        INNER JOIN sellers ON sellers.user_id = s.user_id
+        WHERE s.vouch_count > 0
         """
     )
     
-    # Count vouches by scanning message content for seller mentions
-    vouch_counts = {}
-    for vouch_row in vouches_query:
-        message = vouch_row[0]
-        if message:
-            # Look for user ID mentions in the message content
-            for seller_id in sellers_data.keys():
-                if seller_id in message:
-                    vouch_counts[seller_id] = vouch_counts.get(seller_id, 0) + 1
-    
     # Add vouch counts to sellers data
-    for seller_id, vouch_count in vouch_counts.items():
-        if seller_id in sellers_data:
-            sellers_data[seller_id]["vouches"] = {
+    for seller_id, vouch_count in vouch_counts:
+        if str(seller_id) in sellers_data:
+            sellers_data[str(seller_id)]["vouches"] = {
                 "count": vouch_count
             }
 
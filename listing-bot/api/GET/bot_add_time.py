@@ -81,6 +81,8 @@ async def func():
             payment_method
         )
     
+    await bot.schedule_hosting_expiry()
+
     status_message = f"Successfully extended hosting by {days} days"
     if is_expired:
         status_message += " (started from current time due to expired subscription)"
@@ -181,5 +181,9 @@ async def func():
         "listings": listings_info,
         "tickets": tickets_info,
         "server": members_info,
+        "profile_cache": bot.profile_cache.stats(),
+        "upstreams": bot.http_client.stats(),
+        "ai_reply_cache": bot.ai_reply_cache.stats(),
+        "scheduled_jobs": bot.scheduler.stats(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }, 200
\ No newline at end of file
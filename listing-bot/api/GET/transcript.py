@@ -1,24 +1,40 @@
 route = "/transcript/<transcript_name>"
 
 import os
+from email.utils import formatdate
+from quart import Response, request
 from bot.util.constants import bot_name
+from bot.util.transcript import find_transcript, iter_file, iter_decompressed
 from api.auth_utils import require_api_key
 
 @require_api_key
 async def func(transcript_name: str):
 
-    if not os.path.exists("./templates"):
-        os.mkdir("./templates")
+    found = find_transcript(transcript_name, bot_name)
+    if not found:
         return {"response": False}, 404
-    
-    if not os.path.exists(f"./templates/{transcript_name}"):
-        if not os.path.exists(f"./templates/{bot_name}-{transcript_name}"):
-            return {"response": False}, 404
-        
-        transcript_name = f"{bot_name}-{transcript_name}"
-    else:
-        transcript_name = f"{transcript_name}"
-        
-    with open(f"./templates/{transcript_name}", "r") as f:
-        transcript = f.read()
-        return {"response": transcript}, 200
+
+    path, compressed = found
+    stat = os.stat(path)
+    # The stored file only changes when it is rewritten, which lets the parent API revalidate cheaply
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Vary": "Accept-Encoding"
+    }
+
+    if request.headers.get("If-None-Match") == etag:
+        return Response("", status=304, headers=headers)
+
+    if not compressed:
+        headers["Content-Length"] = str(stat.st_size)
+        return Response(iter_file(path), mimetype="text/html", headers=headers)
+
+    # Stored gzipped, send as-is to clients that accept it
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(stat.st_size)
+        return Response(iter_file(path), mimetype="text/html", headers=headers)
+
+    return Response(iter_decompressed(path), mimetype="text/html", headers=headers)
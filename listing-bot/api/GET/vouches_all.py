@@ -2,6 +2,7 @@ from quart import request, jsonify
 from api.auth_utils import require_api_key
 from quart import current_app
 from bot.bot import Bot
+from bot.util.vouch import extract_amount_from_message, extract_mentioned_user_from_message
 
 route = "/vouches/all"
 
@@ -15,15 +16,14 @@ async def func():
             return jsonify({"error": "Bot not available"}), 500
         
         # Get all vouches from database
-        vouches = await bot.db.fetchall("SELECT user_id, message, avatar, username FROM vouches")
+        vouches = await bot.db.fetchall("SELECT user_id, message, avatar, username, mentioned_user_id, amount FROM vouches")
         
         vouch_data = []
-        for user_id, message, avatar, username in vouches:
-            # Extract amount from vouch message
-            amount = extract_amount_from_message(message)
-            
-            # Extract mentioned user ID (person being vouched for)
-            mentioned_user_id = extract_mentioned_user_from_message(message)
+        for user_id, message, avatar, username, mentioned_user_id, amount in vouches:
+            # Seller and amount are parsed at insert time, rows not yet backfilled are parsed here
+            if amount is None:
+                amount = extract_amount_from_message(message)
+                mentioned_user_id = extract_mentioned_user_from_message(message)
             
             vouch_data.append({
                 "user_id": user_id,  # Person who sent the vouch
@@ -51,47 +51,3 @@ async def func():
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-
-def extract_amount_from_message(message):
-    """Extract dollar amount from vouch message"""
-    import re
-    
-    if not message:
-        return 0.0
-    
-    # Patterns to match: $50, 50$, 50 bucks, etc.
-    patterns = [
-        r'(\d+(?:\.\d{2})?)\$',  # 50$ or 50.99$
-        r'\$(\d+(?:\.\d{2})?)',  # $50 or $50.99
-        r'(\d+(?:\.\d{2})?)\s?(?:bucks?|dollars?)',  # 50 bucks, 50 dollars
-        r'(\d+(?:\.\d{2})?)\s?(?:usd|USD)',  # 50 USD
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, message, re.IGNORECASE)
-        if match:
-            try:
-                return float(match.group(1))
-            except (ValueError, IndexError):
-                continue
-    
-    return 0.0
-
-def extract_mentioned_user_from_message(message):
-    """Extract mentioned user ID from vouch message using regex"""
-    import re
-    
-    if not message:
-        return None
-    
-    # Look for Discord mention pattern: <@userid> or <@!userid>
-    pattern = r'<@!?(\d+)>'
-    match = re.search(pattern, message)
-    
-    if match:
-        try:
-            return int(match.group(1))
-        except ValueError:
-            pass
-    
-    return None
@@ -46,7 +46,7 @@ async def func():
             
             if value_str is None:
                 try:
-                    await bot.db.execute("DELETE FROM config WHERE key = ?", config_key)
+                    await bot.db.delete_config(config_key)
                     results[config_key] = {"status": "deleted", "value": None}
                     continue
                 except Exception as e:
@@ -135,6 +135,9 @@ async def func():
         except Exception as e:
             errors.append(f"Unexpected error processing {config_key}: {str(e)}")
     
+    if results.keys() & {"domain", "email_address"}:
+        await bot.push_routing_update()
+
     response_data = {
         "success": len(errors) == 0,
         "results": results,
@@ -4,7 +4,7 @@ from bot.bot import Bot
 from quart import current_app, request, jsonify
 from api.auth_utils import require_api_key
 
-from bot.util.calcs import gather_lowball_value, gather_value
+from bot.util.calcs import gather_values
 
 @require_api_key
 async def func(data: dict):
@@ -86,8 +86,7 @@ async def func(data: dict):
     }
     """
 
-    lowball_value = gather_lowball_value(data)
-    total_value = gather_value(data)
+    total_value, lowball_value = gather_values(data)
     return jsonify({
         "success": True,
         "data": {
@@ -0,0 +1,209 @@
+"""
+Benchmark /bulk values against a stand-in Mojang proxy and SkyBlock API.
+
+Starts a stub serving the Mojang single and bulk lookups, /live/data-fetch and
+/v1/profiles/ with synthetic profiles, each answering after a set latency, and
+values --names usernames (one of them unknown) with:
+    - sequential: one name at a time on a new HTTP client, sleeping --sleep
+      seconds in between, as the bulk commands did before
+    - concurrent: the current bulk_valuations, on the shared client and under
+      the per-upstream rate limits
+
+Both runs start with empty Mojang and profile caches and must produce the same
+embeds. Reported per run: wall time, names per second, time to the first
+valued account and the requests the stub saw per endpoint.
+
+Usage: python bench_bulk.py [--names 40] [--mojang-latency 0.05] [--profile-latency 0.3] [--sleep 1]
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import ujson as json
+from aiohttp import web
+
+import bot.util.fetch as fetch
+import bot.util.mojang as mojang
+from bot.util.cache import ResponseCache
+from bot.util.http import HttpClient
+from bot.util.value import bulk_valuations, value_username
+
+SLAYERS = ("zombie", "spider", "wolf", "enderman", "blaze", "vampire")
+SKILLS = ("farming", "foraging", "fishing", "alchemy", "enchanting", "combat", "mining", "taming", "carpentry", "social")
+ITEM_TYPES = ("armor", "equipment", "wardrobe", "inventory", "enderchest", "accessories", "pets", "storage", "museum")
+CUTE_NAMES = ("Apple", "Banana", "Blueberry", "Coconut", "Cucumber", "Grapes", "Kiwi", "Lemon", "Mango", "Pomegranate")
+KUUDRA_TIERS = ("none", "hot", "burning", "fiery", "infernal")
+
+INVALID_NAME = "not_a_player"
+
+
+def synthetic_profile(rng: random.Random, items: int = 300) -> dict:
+    """A profile document with every section the valuation reads, holding `items` networth items."""
+    item_list = [
+        {
+            "name": f"Item {index}",
+            "price": 10 ** rng.uniform(3, 10.5),
+            "soulbound": rng.random() < 0.2,
+            "cosmetic": rng.random() < 0.05,
+            "calculation": [{"id": "RECOMBOBULATOR_3000", "price": 6e6}] if rng.random() < 0.3 else [],
+        }
+        for index in range(items)
+    ]
+    return {
+        "name": rng.choice(CUTE_NAMES),
+        "gamemode": rng.choice(("normal", "normal", "ironman", "island")),
+        "dungeons": {"catacombs": {"skill": {"totalXp": rng.randrange(600_000_000)}}},
+        "slayer": {slayer: {"xp": rng.randrange(5_000_000)} for slayer in SLAYERS},
+        "networth": {
+            "purse": rng.randrange(2_000_000_000),
+            "bank": rng.randrange(2_000_000_000),
+            "personalBank": rng.randrange(100_000_000),
+            "types": {
+                item_type: {"items": item_list[index::len(ITEM_TYPES)]}
+                for index, item_type in enumerate(ITEM_TYPES)
+            },
+        },
+        "skills": {skill: {"xp": rng.randrange(120_000_000)} for skill in SKILLS},
+        "mining": {
+            powder: {"total": rng.randrange(40_000_000)}
+            for powder in ("mithril_powder", "gemstone_powder", "glacite_powder")
+        },
+        "farming": {"jacob": {
+            "unique_golds": rng.randrange(60),
+            "perks": {"double_drops": rng.randrange(16), "farming_level_cap": rng.randrange(11)},
+        }},
+        "crimson": {
+            "factions": {"mages_reputation": rng.randrange(15000), "barbarians_reputation": rng.randrange(15000)},
+            "kuudra": {tier: rng.randrange(500) for tier in rng.sample(KUUDRA_TIERS, rng.randrange(6))},
+        },
+    }
+
+
+def uuid_of(name: str) -> str:
+    return hashlib.md5(name.lower().encode()).hexdigest()
+
+
+async def start_stub(mojang_latency: float, profile_latency: float, items: int, hits: Counter) -> tuple:
+    async def single(request):
+        hits["mojang"] += 1
+        await asyncio.sleep(mojang_latency)
+        name = request.match_info["name"]
+        if name == INVALID_NAME:
+            return web.json_response({"error": "Not Found"}, status=404)
+        return web.json_response({"id": uuid_of(name), "name": name})
+
+    async def bulk(request):
+        hits["mojang bulk"] += 1
+        await asyncio.sleep(mojang_latency)
+        names = await request.json()
+        return web.json_response([{"id": uuid_of(name), "name": name} for name in names if name != INVALID_NAME])
+
+    async def data_fetch(request):
+        hits["data-fetch"] += 1
+        return web.json_response({"success": True})
+
+    async def profile(request):
+        hits["profile"] += 1
+        await asyncio.sleep(profile_latency)
+        uuid = request.match_info["uuid"]
+        document = synthetic_profile(random.Random(uuid), items)
+        return web.Response(body=json.dumps({"status": 200, "data": document}), content_type="application/json")
+
+    app = web.Application(client_max_size=2 ** 20)
+    app.router.add_get("/mojang/{name}", single)
+    app.router.add_post("/mojang/bulk", bulk)
+    app.router.add_post("/live/data-fetch", data_fetch)
+    app.router.add_get("/v1/profiles/{uuid}/{selection:.*}", profile)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+def stand_in_bot(http_client: HttpClient) -> SimpleNamespace:
+    return SimpleNamespace(http_client=http_client, profile_cache=ResponseCache(), item_emojis={})
+
+
+def fresh_caches():
+    mojang.mojang_resolver._entries.clear()
+
+
+def fields_of(embed) -> list | None:
+    return None if embed is None else [(field.name, field.value) for field in embed.fields]
+
+
+async def sequential(usernames: list, sleep: float) -> tuple:
+    """The bulk commands before: each name valued on its own client, with a sleep in between."""
+    results, first = {}, None
+    start = time.perf_counter()
+    for index, username in enumerate(usernames):
+        bot = stand_in_bot(HttpClient())
+        try:
+            embed, _ = await value_username(bot, username)
+        finally:
+            await bot.http_client.close()
+        results[username] = fields_of(embed)
+        if first is None and embed is not None:
+            first = time.perf_counter() - start
+        if index != len(usernames) - 1:
+            await asyncio.sleep(sleep)
+    return time.perf_counter() - start, first, results
+
+
+async def concurrent(usernames: list) -> tuple:
+    results, first = {}, None
+    bot = stand_in_bot(HttpClient())
+    start = time.perf_counter()
+    try:
+        async for username, embed, _ in bulk_valuations(bot, usernames):
+            results[username] = fields_of(embed)
+            if first is None and embed is not None:
+                first = time.perf_counter() - start
+    finally:
+        await bot.http_client.close()
+    return time.perf_counter() - start, first, results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=40, help="usernames valued, one more unknown name is added")
+    parser.add_argument("--items", type=int, default=300, help="networth items per profile")
+    parser.add_argument("--mojang-latency", type=float, default=0.05, help="seconds a Mojang lookup takes")
+    parser.add_argument("--profile-latency", type=float, default=0.3, help="seconds a profile fetch takes")
+    parser.add_argument("--sleep", type=float, default=1.0, help="seconds the sequential path sleeps between names")
+    args = parser.parse_args()
+
+    hits = Counter()
+    runner, port = await start_stub(args.mojang_latency, args.profile_latency, args.items, hits)
+    mojang.MOJANG_URL = f"http://127.0.0.1:{port}/mojang"
+    mojang.MOJANG_BULK_URL = f"http://127.0.0.1:{port}/mojang/bulk"
+    fetch.SKYBLOCK_API_HOST = fetch.PARENT_API_HOST = "127.0.0.1"
+    fetch.SKYBLOCK_API_PORT = fetch.PARENT_API_PORT = str(port)
+
+    usernames = [f"player{index}" for index in range(args.names)]
+    usernames.insert(len(usernames) // 2, INVALID_NAME)
+    print(f"{len(usernames)} names, Mojang {args.mojang_latency * 1000:.0f} ms, profiles {args.profile_latency * 1000:.0f} ms")
+
+    outputs = {}
+    try:
+        for label, run in (("sequential", lambda: sequential(usernames, args.sleep)), ("concurrent", lambda: concurrent(usernames))):
+            fresh_caches()
+            hits.clear()
+            wall, first, outputs[label] = await run()
+            valued = sum(fields is not None for fields in outputs[label].values())
+            print(f"    {label}")
+            print(f"        {wall:>7.1f} s   {len(usernames) / wall:>5.1f} names/s   first valued {first * 1000:>6.0f} ms")
+            print(f"        valued {valued}, failed {len(usernames) - valued}   stub requests {dict(sorted(hits.items()))}")
+    finally:
+        await runner.cleanup()
+
+    assert outputs["sequential"] == outputs["concurrent"], "the two paths valued the names differently"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Count the database statements Event.on_message runs per message.
+
+Feeds stub messages through the real on_message listener and counts every SQL
+statement SQLite sees, with:
+    - uncached config: get_config runs a SELECT per call, as it did before the cache
+    - cached config: the current in-memory config cache
+
+Messages: a chat message, a vouch in the vouch channel and a question while
+no AI info is configured. Also times get_config itself on both paths.
+
+Usage: python bench_config.py [--repeat 2000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import discord
+
+from data.db import Database
+from bot.cogs.events import Event
+
+VOUCH_CHANNEL_ID = 2
+CHAT_CHANNEL_ID = 3
+
+
+class UncachedDatabase(Database):
+    """get_config as it was before the cache: one SELECT and conversion per call."""
+
+    async def get_config(self, key: str):
+        result = await self.fetchone("SELECT value, data_type FROM config WHERE key = ?", key)
+        if result:
+            value, data_type = result
+            return self._convert_config(value, data_type)
+        return None
+
+
+def text_channel(channel_id: int) -> discord.TextChannel:
+    channel = object.__new__(discord.TextChannel)
+    channel.id = channel_id
+    channel.name = f"channel-{channel_id}"
+    return channel
+
+
+def message(channel: discord.TextChannel, content: str):
+    async def add_reaction(emoji):
+        pass
+
+    author = SimpleNamespace(
+        id=1000, bot=False, display_name="buyer", avatar=None,
+        default_avatar=SimpleNamespace(url="https://cdn.example/avatar.png"),
+    )
+    return SimpleNamespace(
+        author=author, channel=channel, content=content, mentions=[],
+        guild=SimpleNamespace(id=1, name="shop"), add_reaction=add_reaction,
+    )
+
+
+async def count_statements(database: type, directory: str, repeat: int):
+    db = database(os.path.join(directory, f"{database.__name__}.db"), read_pool_size=0)
+    await db.connect()
+    await db.set_config("vouch_channel", str(VOUCH_CHANNEL_ID))
+
+    statements = Counter()
+    await db.conn.set_trace_callback(lambda sql: statements.update([sql.split(None, 1)[0].upper()]))
+
+    channels = {VOUCH_CHANNEL_ID: text_channel(VOUCH_CHANNEL_ID), CHAT_CHANNEL_ID: text_channel(CHAT_CHANNEL_ID)}
+    bot = SimpleNamespace(db=db, user=object(), get_channel=channels.get)
+    cog = object.__new__(Event)
+    cog.bot = bot
+
+    messages = {
+        "chat message": message(channels[CHAT_CHANNEL_ID], "anyone selling a maxed account tonight"),
+        "vouch": message(channels[VOUCH_CHANNEL_ID], "+rep <@5> $25 smooth trade"),
+        "question, no AI info": message(channels[CHAT_CHANNEL_ID], "how long does a transfer usually take?"),
+    }
+    counts = {}
+    for label, sample in messages.items():
+        statements.clear()
+        await cog.on_message(sample)
+        counts[label] = sum(count for kind, count in statements.items() if kind != "COMMIT"), statements["SELECT"]
+
+    await db.conn.set_trace_callback(None)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await db.get_config("vouch_channel")
+    lookup = (time.perf_counter() - start) / repeat
+
+    await db.close()
+    return counts, lookup
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000, help="get_config calls timed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        before, before_lookup = await count_statements(UncachedDatabase, directory, args.repeat)
+        after, after_lookup = await count_statements(Database, directory, args.repeat)
+
+    print("statements per on_message (of which SELECT), uncached -> cached")
+    for label in before:
+        (old_total, old_selects), (new_total, new_selects) = before[label], after[label]
+        print(f"    {label:<22} {old_total} ({old_selects}) -> {new_total} ({new_selects})")
+    print(f"get_config  {before_lookup * 1e6:>8.1f} us -> {after_lookup * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
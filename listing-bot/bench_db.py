@@ -0,0 +1,157 @@
+"""
+Load test the bot database: API reads running alongside on_message writes.
+
+Serves /vouches/all and /api/accounts/all through the Quart app's test client
+while simulated on_message handlers look up the ticket, read the vouch channel
+config, store a vouch and look up a tag. Each configuration runs the same
+workload on a fresh copy of the database:
+    - rollback journal, reads on the writer connection (the old setup)
+    - WAL, reads on the writer connection
+    - WAL with the read-only pool
+
+Reported per configuration: wall time, API request latency and on_message
+latency (median and p95). The endpoints build their JSON on the event loop, so
+on a single core the pool mostly shows up in on_message latency rather than in
+API throughput.
+
+Usage: python bench_db.py [--vouches 20000] [--clients 8] [--requests 10] [--messages 400]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+from api import auth_utils
+from api.api import create_api
+from data.db import Database
+from bot.util.vouch import VOUCH_COLUMNS, store_vouch, vouch_row
+
+API_KEY = "bench"
+ENDPOINTS = ["/vouches/all", "/api/accounts/all"]
+GUILD_ID = 1
+VOUCH_CHANNEL_ID = 2
+SELLERS = 50
+
+CONFIGURATIONS = [
+    ("rollback journal, no pool", "DELETE", 0),
+    ("WAL, no pool", "WAL", 0),
+    ("WAL, read pool of 4", "WAL", 4),
+]
+
+
+async def fill(db: Database, vouches: int):
+    rng = random.Random(0)
+    rows = []
+    for index in range(vouches):
+        seller = rng.randrange(1, SELLERS + 1)
+        message = f"+rep <@{seller}> bought a maxed account for ${rng.randrange(5, 500)}, fast and legit #{index}"
+        rows.append(vouch_row(1000 + index, message, "https://cdn.example/avatar.png", f"buyer{index}"))
+
+    await db.insert_many("vouches", VOUCH_COLUMNS, rows)
+    await db.insert_many("sellers", ("user_id", "payment_methods"), [(seller, "PayPal, LTC") for seller in range(1, SELLERS + 1)])
+    await db.insert_many("tags", ("name", "content"), [(f"tag{index}", f"Tag {index}") for index in range(100)])
+    await db.set_config("main_guild", GUILD_ID)
+    await db.set_config("vouch_channel", str(VOUCH_CHANNEL_ID))
+
+
+def stub_bot(db: Database):
+    guild = SimpleNamespace(id=GUILD_ID, get_member=lambda user_id: None)
+    return SimpleNamespace(
+        db=db,
+        bot_name="bench",
+        invite="https://discord.gg/bench",
+        get_guild=lambda guild_id: guild if guild_id == GUILD_ID else None,
+        get_channel=lambda channel_id: None,
+    )
+
+
+async def on_message(bot, author_id: int, channel_id: int, content: str):
+    """The database work events.on_message does for a vouch posted in the vouch channel."""
+    await bot.db.fetchone("SELECT * FROM tickets WHERE channel_id=?", channel_id)
+    vouch_channel = await bot.db.get_config("vouch_channel")
+    if vouch_channel and int(vouch_channel) == channel_id:
+        await store_vouch(bot, author_id, content, "https://cdn.example/avatar.png", f"user{author_id}")
+    await bot.db.fetchone("SELECT * FROM tags WHERE name=?", content)
+
+
+def summary(label: str, timings: list) -> str:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+    return f"{label} p50 {statistics.median(timings) * 1000:>7.1f} ms  p95 {p95 * 1000:>7.1f} ms"
+
+
+async def run(path: str, journal_mode: str, read_pool_size: int, clients: int, requests: int, messages: int):
+    db = Database(path, read_pool_size=read_pool_size)
+    await db.connect()
+    if journal_mode != "WAL":
+        await db.conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+    app = create_api()
+    app.bot = stub_bot(db)
+    client = app.test_client()
+    request_timings, message_timings = [], []
+
+    async def api_client(index: int):
+        for request in range(requests):
+            start = time.perf_counter()
+            response = await client.get(ENDPOINTS[(index + request) % len(ENDPOINTS)], query_string={"api_key": API_KEY})
+            await response.get_data()
+            assert response.status_code == 200, response.status_code
+            request_timings.append(time.perf_counter() - start)
+
+    async def chatter():
+        for index in range(messages):
+            start = time.perf_counter()
+            await on_message(app.bot, 500000 + index, VOUCH_CHANNEL_ID, f"+rep <@{index % SELLERS + 1}> $25 thanks")
+            message_timings.append(time.perf_counter() - start)
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(chatter(), *(api_client(index) for index in range(clients)))
+    finally:
+        await db.close()
+    wall = time.perf_counter() - start
+    return wall, request_timings, message_timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vouches", type=int, default=20000, help="vouches in the database")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent API clients")
+    parser.add_argument("--requests", type=int, default=10, help="requests per API client")
+    parser.add_argument("--messages", type=int, default=400, help="simulated on_message events")
+    args = parser.parse_args()
+
+    auth_utils.API_KEY = API_KEY
+    with tempfile.TemporaryDirectory() as directory:
+        seed = os.path.join(directory, "seed.db")
+        db = Database(seed, read_pool_size=0)
+        await db.connect()
+        await fill(db, args.vouches)
+        await db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        await db.close()
+        with open(seed, "rb") as file:
+            snapshot = file.read()
+
+        print(f"{args.vouches} vouches, {args.clients} API clients x {args.requests} requests, {args.messages} messages")
+        for label, journal_mode, read_pool_size in CONFIGURATIONS:
+            path = os.path.join(directory, f"{journal_mode}-{read_pool_size}.db")
+            with open(path, "wb") as file:
+                file.write(snapshot)
+
+            wall, request_timings, message_timings = await run(
+                path, journal_mode, read_pool_size, args.clients, args.requests, args.messages
+            )
+            print(f"    {label}")
+            print(f"        wall {wall:>7.2f} s")
+            print(f"        {summary('API request', request_timings)}")
+            print(f"        {summary('on_message ', message_timings)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+Benchmark alt detection: the per-pair SQL path against the fingerprint index.
+
+Fills a temporary database with synthetic fingerprints (a few percent of them
+near-copies, like alts) and reports, per size:
+    - one verification with the old per-pair SQL scoring, extrapolated from a sample
+    - building the index from the database
+    - one verification with the index, scoring everyone and only LSH candidates
+    - a full suspect graph rescan
+
+Usage: python bench_fingerprint.py [--sizes 1000 10000 100000] [--sample 200]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+from data.db import Database
+from bot.util.fingerprint import _calculate_fingerprint_similarity_optimized
+from bot.util.fingerprint_index import FingerprintIndex
+
+RENDERERS = [f"ANGLE (NVIDIA, GeForce {model} Direct3D11)" for model in range(60)]
+VENDORS = ["Google Inc. (NVIDIA)", "Google Inc. (AMD)", "Google Inc. (Intel)", "Apple Inc."]
+PLATFORMS = ["Win32", "MacIntel", "Linux x86_64"]
+USER_AGENTS = [f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/{version}.0.0.0 Safari/537.36" for version in range(110, 130)]
+SCREENS = [(1920, 1080), (2560, 1440), (1366, 768), (1536, 864), (3840, 2160)]
+LANGUAGES = ["en-US", "en", "de", "fr", "es", "pl", "nl", "pt-BR", "ru", "tr"]
+FONTS = [f"Font {i}" for i in range(300)]
+PLUGINS = ["PDF Viewer", "Chrome PDF Viewer", "Chromium PDF Viewer", "Microsoft Edge PDF Viewer", "WebKit built-in PDF"]
+
+ALT_RATE = 0.03
+FONTS_PER_USER = 20
+
+
+def synthetic_fingerprints(count: int, seed: int = 0):
+    """Yield (fields, languages, fonts, plugins), every few users is an alt of an earlier one."""
+    rng = random.Random(seed)
+    generated = []
+    for user_id in range(1, count + 1):
+        if generated and rng.random() < ALT_RATE:
+            fields, languages, fonts, plugins = rng.choice(generated)
+            fields = {**fields, "user_id": user_id, "network_downlink": round(rng.uniform(1, 10), 1)}
+        else:
+            width, height = rng.choice(SCREENS)
+            fields = {
+                "user_id": user_id,
+                "user_agent": rng.choice(USER_AGENTS),
+                "platform": rng.choice(PLATFORMS),
+                "hardware_concurrency": rng.choice([4, 8, 12, 16]),
+                "device_memory": rng.choice([4, 8]),
+                "screen_width": width,
+                "screen_height": height,
+                "screen_color_depth": 24,
+                "webgl_unmasked_vendor": rng.choice(VENDORS),
+                "webgl_unmasked_renderer": rng.choice(RENDERERS),
+                "audio_fingerprint": f"{rng.randrange(count // 4 + 1):08x}.{rng.randrange(100)}",
+                "network_downlink": round(rng.uniform(1, 10), 1),
+                "network_effective_type": "4g",
+            }
+            languages = rng.sample(LANGUAGES, rng.randint(1, 3))
+            fonts = rng.sample(FONTS, FONTS_PER_USER)
+            plugins = rng.sample(PLUGINS, rng.randint(0, 5))
+        generated.append((fields, languages, fonts, plugins))
+        yield fields, languages, fonts, plugins
+
+
+async def fill(db: Database, count: int):
+    columns = None
+    fingerprints, languages, fonts, plugins = [], [], [], []
+    for fields, user_languages, user_fonts, user_plugins in synthetic_fingerprints(count):
+        columns = columns or tuple(fields)
+        user_id = fields["user_id"]
+        fingerprints.append(tuple(fields.values()))
+        languages.extend((user_id, language) for language in user_languages)
+        fonts.extend((user_id, font) for font in user_fonts)
+        plugins.extend((user_id, plugin) for plugin in user_plugins)
+
+    await db.insert_many("browser_fingerprints", columns, fingerprints)
+    await db.insert_many("fingerprint_languages", ("user_id", "language"), languages)
+    await db.insert_many("fingerprint_fonts", ("user_id", "font_name"), fonts)
+    await db.insert_many("fingerprint_plugins", ("user_id", "plugin_name"), plugins)
+
+
+def timed(function, *args, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+async def bench(count: int, sample: int):
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "bench.db"), read_pool_size=0)
+        await db.connect()
+        await fill(db, count)
+        bot = SimpleNamespace(db=db, fingerprint_index=None)
+
+        target = 1
+        others = random.Random(1).sample(range(2, count + 1), min(sample, count - 1))
+        start = time.perf_counter()
+        for other in others:
+            await _calculate_fingerprint_similarity_optimized(bot, target, other)
+        sql_verification = (time.perf_counter() - start) / len(others) * (count - 1)
+
+        index = FingerprintIndex()
+        start = time.perf_counter()
+        await index.load(db)
+        load = time.perf_counter() - start
+
+        scan = timed(index.find_suspects, target, 0.85, False)
+        blocked = timed(index.find_suspects, target, 0.85, True)
+        candidates = len(index.candidates(target))
+
+        start = time.perf_counter()
+        edges = index.suspect_graph()
+        graph = time.perf_counter() - start
+
+        await db.close()
+
+    print(f"{count:>7} fingerprints")
+    print(f"    SQL verification (extrapolated)  {sql_verification * 1000:>10.1f} ms")
+    print(f"    index load                       {load * 1000:>10.1f} ms")
+    print(f"    index verification, full scan    {scan * 1000:>10.3f} ms")
+    print(f"    index verification, LSH          {blocked * 1000:>10.3f} ms  ({candidates} candidates)")
+    print(f"    suspect graph rescan             {graph * 1000:>10.1f} ms  ({len(edges)} pairs)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--sample", type=int, default=200, help="pairs timed on the SQL path")
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        await bench(count, args.sample)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
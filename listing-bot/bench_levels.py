@@ -0,0 +1,135 @@
+"""
+Check and benchmark level lookups: the old dict scans against bot.util.levels.
+
+The old calcs functions rebuilt a string-keyed dict of cumulative XP on every
+call and walked it until a threshold passed the XP. They are reproduced here
+as the reference. The script first asserts that level_from_xp, the calcs
+wrappers and skill_levels return the same values and types as the reference:
+    - at every threshold of every table, and one below and above it
+    - for every integer XP up to --exhaustive
+    - for --random random ints and floats up to past the top of each table
+    - for every slayer name and alias
+Then it times single lookups and a whole profile's skills.
+
+Usage: python bench_levels.py [--exhaustive 50000] [--random 50000] [--repeat 100000]
+"""
+import argparse
+import random
+import time
+
+from bot.util.calcs import get_cata_lvl, get_skill_lvl, get_slayer_level
+from bot.util.levels import CATACOMBS_XP, SKILL_MAX_LEVELS, SKILL_XP, SLAYER_ALIASES, SLAYER_XP, skill_levels
+
+
+LEVEL_KEYS = [str(level) for level in range(len(SKILL_XP))]
+
+
+def old_scan(table, exp, max_level):
+    # The old functions rebuilt a dict literal per call, zip is the closest cheap stand-in
+    levels = dict(zip(LEVEL_KEYS, table))
+    for level in levels:
+        if exp >= levels[str(max_level)]:
+            return max_level
+        if levels[level] > exp:
+            lowexp = levels[str(int(level) - 1)]
+            highexp = levels[level]
+            difference = highexp - lowexp
+            extra = exp - lowexp
+            percentage = (extra / difference)
+            return (int(level) - 1) + percentage
+
+
+def old_cata_lvl(exp):
+    return old_scan(CATACOMBS_XP, exp, 50)
+
+
+def old_skill_lvl(skill_type, exp):
+    return old_scan(SKILL_XP, exp, SKILL_MAX_LEVELS[skill_type]["maxLevel"])
+
+
+def old_slayer_level(slayer_type, exp):
+    if slayer_type in ["revenant", "zombie"]:
+        levels = SLAYER_XP["zombie"]
+    elif slayer_type in ["spider", "tarantula"]:
+        levels = SLAYER_XP["spider"]
+    elif slayer_type in ["sven", "wolf"]:
+        levels = SLAYER_XP["wolf"]
+    elif slayer_type in ["enderman", "voidgloom"]:
+        levels = SLAYER_XP["enderman"]
+    elif slayer_type in ["blaze", "demonlord"]:
+        levels = SLAYER_XP["blaze"]
+    return old_scan(levels, exp, 9)
+
+
+SLAYER_NAMES = list(SLAYER_XP) + list(SLAYER_ALIASES)
+
+CASES = [(get_cata_lvl, old_cata_lvl, (), CATACOMBS_XP)]
+CASES += [(get_skill_lvl, old_skill_lvl, (skill,), SKILL_XP) for skill in SKILL_MAX_LEVELS]
+CASES += [
+    (get_slayer_level, old_slayer_level, (name,), SLAYER_XP[SLAYER_ALIASES.get(name, name)])
+    for name in SLAYER_NAMES
+]
+
+
+def same(new, old):
+    return new == old and type(new) is type(old)
+
+
+def check(exhaustive: int, samples: int):
+    rng = random.Random(0)
+    checked = 0
+    for new, old, prefix, table in CASES:
+        top = table[-1] * 2
+        values = [xp + delta for xp in table for delta in (-1, 0, 1) if xp + delta >= 0]
+        values += range(min(exhaustive, top) + 1)
+        values += [rng.randrange(top) for _ in range(samples)]
+        values += [rng.uniform(0, top) for _ in range(samples)]
+        for xp in values:
+            expected, actual = old(*prefix, xp), new(*prefix, xp)
+            assert same(actual, expected), f"{new.__name__}{(*prefix, xp)}: {actual!r} != {expected!r}"
+        checked += len(values)
+
+    for _ in range(samples // 10):
+        skills = {skill: rng.choice([rng.randrange(SKILL_XP[-1] * 2), rng.uniform(0, SKILL_XP[-1] * 2)])
+                  for skill in SKILL_MAX_LEVELS if rng.random() < 0.8}
+        expected = {skill: old_skill_lvl(skill, xp) for skill, xp in skills.items()}
+        actual = skill_levels(skills)
+        assert actual.keys() == expected.keys() and all(same(actual[s], expected[s]) for s in skills), skills
+        checked += len(skills)
+
+    print(f"{checked} lookups match the old functions ({len(SLAYER_NAMES)} slayer names)")
+
+
+def timed(function, args, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def bench(repeat: int):
+    profile = {skill: SKILL_XP[30] + 12345 for skill in SKILL_MAX_LEVELS}
+    rows = [
+        ("catacombs level 35", old_cata_lvl, get_cata_lvl, (CATACOMBS_XP[35] + 1,)),
+        ("skill level 45", old_skill_lvl, get_skill_lvl, ("farming", SKILL_XP[45] + 1)),
+        ("slayer level 7", old_slayer_level, get_slayer_level, ("sven", SLAYER_XP["wolf"][7] + 1)),
+        ("all 8 skills", lambda p: {s: old_skill_lvl(s, xp) for s, xp in p.items()}, skill_levels, (profile,)),
+    ]
+    for label, old, new, args in rows:
+        before, after = timed(old, args, repeat), timed(new, args, repeat)
+        print(f"    {label:<20} old {before * 1e6:>7.2f} us   new {after * 1e6:>7.2f} us   {before / after:>5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exhaustive", type=int, default=50000, help="check every integer XP up to this")
+    parser.add_argument("--random", type=int, default=50000, help="random ints and floats checked per table")
+    parser.add_argument("--repeat", type=int, default=100000, help="calls timed per lookup")
+    args = parser.parse_args()
+
+    check(args.exhaustive, args.random)
+    bench(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
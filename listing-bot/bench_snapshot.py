@@ -0,0 +1,138 @@
+"""
+Benchmark event-loop lag from the guild snapshot on a large guild.
+
+Builds a stand-in guild of --members members (plus channels and roles) and
+measures how late a 1ms ticker on the event loop runs while each of these runs:
+    - old tick: update_server_data before the snapshot, loading server_data.json,
+      walking every member and rewriting the file on the loop every 60s
+    - startup: GuildSnapshot.load and a full sync_guild, as on_ready does
+    - new tick: flushing a minute of member updates to the delta log
+    - compaction: folding the log into server_data.json, once an hour
+
+Reported per step: wall time, the loop's worst and p99 lag.
+
+Usage: python bench_snapshot.py [--members 50000] [--updates 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from bot.util.guild_snapshot import GuildSnapshot, channel_entry, member_entry, role_entry
+
+TICK = 0.001
+
+
+def stand_in_guild(members: int) -> SimpleNamespace:
+    roles = [
+        SimpleNamespace(
+            id=10_000 + index, name=f"role-{index}", color=SimpleNamespace(value=index), position=index,
+            permissions=SimpleNamespace(value=0), mentionable=False, hoist=False, managed=False,
+            is_bot_managed=lambda: False, is_premium_subscriber=lambda: False,
+        )
+        for index in range(50)
+    ]
+    category = SimpleNamespace(name="shop")
+    channels = [
+        SimpleNamespace(id=20_000 + index, name=f"channel-{index}", type="text", position=index,
+                        category=category, overwrites={})
+        for index in range(100)
+    ]
+    return SimpleNamespace(
+        id=1, name="stand-in guild", roles=roles, channels=channels,
+        members=[
+            SimpleNamespace(id=1_000_000 + index, bot=index % 100 == 0, roles=roles[index % 7:index % 7 + 3])
+            for index in range(members)
+        ],
+    )
+
+
+def old_tick(path: str, guilds: list):
+    """The file half of update_server_data before the in-memory snapshot."""
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            json.dump({}, f)
+
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    for guild in guilds:
+        key = str(guild.id)
+        existing_members = {member["id"]: member for member in data.get(key, {}).get("members", [])}
+        for member in guild.members:
+            existing_members[member.id] = member_entry(member)
+        data[key] = {
+            "name": guild.name,
+            "members": list(existing_members.values()),
+            "channels": [channel_entry(channel) for channel in guild.channels],
+            "roles": [role_entry(role) for role in guild.roles],
+        }
+
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+async def measure(label: str, step):
+    """Run step while a ticker records how late each TICK sleep wakes up."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    probe = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK * 5)
+    start = time.perf_counter()
+    await step()
+    wall = time.perf_counter() - start
+    done.set()
+    await probe
+
+    lags.sort()
+    p99 = lags[max(int(len(lags) * 0.99) - 1, 0)]
+    print(f"    {label:<34} wall {wall * 1000:>8.1f} ms   max lag {lags[-1] * 1000:>7.1f} ms   p99 {p99 * 1000:>6.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=50000, help="members in the stand-in guild")
+    parser.add_argument("--updates", type=int, default=500, help="member updates flushed per tick")
+    args = parser.parse_args()
+
+    guild = stand_in_guild(args.members)
+    print(f"{args.members} members, {len(guild.channels)} channels, {len(guild.roles)} roles")
+    with tempfile.TemporaryDirectory() as directory:
+        old_path = os.path.join(directory, "old_server_data.json")
+        old_tick(old_path, [guild])  # The file already exists in a running bot
+
+        async def run_old_tick():
+            old_tick(old_path, [guild])
+
+        await measure("old tick, every 60s", run_old_tick)
+
+        snapshot = GuildSnapshot(os.path.join(directory, "server_data.json"), os.path.join(directory, "server_data.log"))
+
+        async def startup():
+            await snapshot.load()
+            await snapshot.sync_guild(guild)
+
+        await measure("startup load and resync", startup)
+        await snapshot.compact()
+
+        async def new_tick():
+            for member in guild.members[:args.updates]:
+                snapshot.update_member(SimpleNamespace(**vars(member), guild=guild))
+            await snapshot.flush()
+
+        await measure(f"new tick, {args.updates} member updates", new_tick)
+        await measure("compaction, every hour", snapshot.compact)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Benchmark profile valuation: two passes per calculator against one memoized pass.
+
+Values --profiles synthetic profile documents per size (networth items per
+profile) the three ways a value and lowball pair can be computed:
+    - two passes: gather_value and gather_lowball_value each running every
+      calculator, as the lowball embed and POST /value did before
+    - one pass, cold: gather_values with an empty memo
+    - one pass, memo hit: gather_values on a document it has valued already,
+      as when toggling, re-listing or valuing then lowballing
+
+All three must agree. Reported per size: mean milliseconds per profile for each
+path and the cost of the memo key alone.
+
+Usage: python bench_values.py [--sizes 0 300 3000 10000] [--profiles 20] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from bot.util import calcs
+from bench_bulk import synthetic_profile
+
+
+def two_pass_lowball_value(data: dict) -> dict:
+    return {name: calculator(data)[1] for name, calculator in calcs.VALUATIONS}
+
+
+def two_pass_value(data: dict) -> dict:
+    return {name: calculator(data)[0] for name, calculator in calcs.VALUATIONS}
+
+
+def two_passes(data: dict) -> tuple:
+    return two_pass_value(data), two_pass_lowball_value(data)
+
+
+def one_pass_cold(data: dict) -> tuple:
+    calcs._valuation_memo.clear()
+    return calcs.gather_values(data)
+
+
+def timed(function, profiles: list, repeat: int) -> float:
+    """Mean milliseconds of function over every profile, best of repeat rounds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in profiles:
+            function(data)
+        best = min(best, time.perf_counter() - start)
+    return best / len(profiles) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 300, 3000, 10000], help="networth items per profile")
+    parser.add_argument("--profiles", type=int, default=20, help="profiles valued per size")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds timed, the best is reported")
+    args = parser.parse_args()
+
+    print(f"{'items':>6}  {'two passes':>11}  {'one pass':>9}  {'memo hit':>9}  {'memo key':>9}   (ms per profile)")
+    for size in args.sizes:
+        rng = random.Random(size)
+        profiles = [{**synthetic_profile(rng, size), "uuid": f"{index:032x}"} for index in range(args.profiles)]
+        for data in profiles:
+            assert one_pass_cold(data) == two_passes(data), "the single pass valued a profile differently"
+
+        two = timed(two_passes, profiles, args.repeat)
+        cold = timed(one_pass_cold, profiles, args.repeat)
+        for data in profiles:
+            calcs.gather_values(data)
+        hit = timed(calcs.gather_values, profiles, args.repeat)
+        key = timed(calcs._valuation_key, profiles, args.repeat)
+        print(f"{size:>6}  {two:>11.3f}  {cold:>9.3f}  {hit:>9.3f}  {key:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark database writes: one commit per statement against group commit.
+
+Two workloads, each timed on a fresh temporary database:
+    - concurrent fingerprint saves through save_browser_fingerprint
+    - concurrent single-row inserts, like vouches and command logs
+
+"per-statement commits" replays the writes the way they ran before group
+commit: every statement, including every row of a bulk insert, committed on
+its own. "group commit" is the current setup, the bot's batch_writes mode with
+fingerprint saves in one transaction each.
+
+Usage: python bench_writes.py [--saves 300] [--inserts 3000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from data.db import Database
+from bot.util.fingerprint import save_browser_fingerprint
+from bench_fingerprint import synthetic_fingerprints
+
+
+class PerStatementDatabase(Database):
+    """Commits every statement by itself, as the bot did before group commit."""
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield self
+
+    async def executemany(self, query, rows):
+        for row in rows:
+            await self.execute(query, *row)
+
+
+def fingerprint_payloads(count: int):
+    """Fingerprints in the shape the verification page posts them."""
+    rng = random.Random(0)
+    payloads = []
+    for fields, languages, fonts, plugins in synthetic_fingerprints(count):
+        payloads.append((fields["user_id"], {
+            "userAgent": fields["user_agent"],
+            "platform": fields["platform"],
+            "hardwareConcurrency": fields["hardware_concurrency"],
+            "deviceMemory": fields["device_memory"],
+            "screen": {"width": fields["screen_width"], "height": fields["screen_height"], "colorDepth": 24},
+            "timezone": {"name": "Europe/Berlin", "offset": -60},
+            "webgl": {
+                "unmaskedVendor": fields["webgl_unmasked_vendor"],
+                "unmaskedRenderer": fields["webgl_unmasked_renderer"],
+                "extensions": [f"EXT_extension_{index}" for index in rng.sample(range(40), 25)],
+            },
+            "audio": {"fingerprint": fields["audio_fingerprint"]},
+            "network": {"downlink": fields["network_downlink"], "effectiveType": "4g"},
+            "languages": languages,
+            "fonts": fonts,
+            "plugins": [{"name": plugin, "filename": "internal-pdf-viewer", "description": ""} for plugin in plugins],
+            "storage": {"localStorage": True, "sessionStorage": True, "indexedDB": True},
+            "protocols": ["mailto", "web+discord"],
+        }))
+    return payloads
+
+
+async def open_database(directory: str, name: str, grouped: bool) -> Database:
+    database = Database if grouped else PerStatementDatabase
+    db = database(os.path.join(directory, f"{name}.db"), batch_writes=grouped, read_pool_size=0)
+    await db.connect()
+    return db
+
+
+async def bench_saves(directory: str, grouped: bool, payloads: list) -> float:
+    db = await open_database(directory, f"saves-{grouped}", grouped)
+    bot = SimpleNamespace(db=db, fingerprint_index=None)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(save_browser_fingerprint(bot, user_id, data) for user_id, data in payloads))
+    await db.flush()
+    elapsed = time.perf_counter() - start
+    await db.close()
+    assert all(results), "a fingerprint save failed"
+    return len(payloads) / elapsed
+
+
+async def bench_inserts(directory: str, grouped: bool, count: int) -> float:
+    db = await open_database(directory, f"inserts-{grouped}", grouped)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        db.execute("INSERT INTO tags (name, content, created_by) VALUES (?, ?, ?)", f"tag{index}", "content", index)
+        for index in range(count)
+    ))
+    await db.flush()
+    elapsed = time.perf_counter() - start
+    await db.close()
+    return count / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--saves", type=int, default=300, help="concurrent fingerprint saves")
+    parser.add_argument("--inserts", type=int, default=3000, help="concurrent single-row inserts")
+    args = parser.parse_args()
+
+    payloads = fingerprint_payloads(args.saves)
+    with tempfile.TemporaryDirectory() as directory:
+        for label, grouped in (("per-statement commits", False), ("group commit", True)):
+            saves = await bench_saves(directory, grouped, payloads)
+            inserts = await bench_inserts(directory, grouped, args.inserts)
+            print(f"{label}")
+            print(f"    fingerprint saves  {saves:>9.0f} /s  ({args.saves} concurrent)")
+            print(f"    single-row inserts {inserts:>9.0f} /s  ({args.inserts} concurrent)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,26 +1,52 @@
+import aiohttp
 import discord
 from discord.ext import commands, tasks
 import os
 
 from data.db import Database
 
-import aiohttp
 import base64
 import os
 import traceback
 
-from datetime import datetime, timezone
+from datetime import datetime, time, timezone, timedelta
 from bot.util.reconstruct import reconstruct
 from bot.util.proxy import APIProxyManager, BotCommunicator
+from api.auth_utils import API_KEY
+from bot.util.fingerprint_index import FingerprintIndex
+from bot.util.fingerprint import rescan_alternate_accounts
+from bot.util.guild_snapshot import GuildSnapshot
+from bot.util.mojang import mojang_resolver
+from bot.util.cache import ResponseCache
+from bot.util.http import HttpClient, RetryPolicy
+from bot.util.reply_cache import ReplyCache
+from bot.util.scheduler import Scheduler
 
 
 from dotenv import load_dotenv
 load_dotenv()
 
-import json
+import ujson as json
 
 PARENT_API_HOST = os.getenv("PARENT_API_HOST", "127.0.0.1")
 PARENT_API_PORT = os.getenv("PARENT_API_PORT", "7000")
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "60"))
+PROFILE_CACHE_STALE_TTL = float(os.getenv("PROFILE_CACHE_STALE_TTL", "300"))
+PROFILE_CACHE_MAX_BYTES = int(os.getenv("PROFILE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+AI_REPLY_CACHE_TTL = float(os.getenv("AI_REPLY_CACHE_TTL", str(6 * 3600)))
+AI_REPLY_SIMILARITY = float(os.getenv("AI_REPLY_SIMILARITY", "0.9"))
+FINGERPRINT_RESCAN_HOUR = int(os.getenv("FINGERPRINT_RESCAN_HOUR", "4"))
+SKYBLOCK_API_HOST = os.getenv("SKYBLOCK_API_HOST", "127.0.0.1")
+SKYBLOCK_API_PORT = os.getenv("SKYBLOCK_API_PORT", "3002")
+
+# Retry policies per upstream, anything not listed is tried once with aiohttp's default timeout
+UPSTREAM_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+UPSTREAM_POLICIES = {
+    "discord.com": RetryPolicy(attempts=3, backoff=1.0, timeout=UPSTREAM_TIMEOUT),
+    "api.hypixel.net": RetryPolicy(attempts=2, timeout=UPSTREAM_TIMEOUT),
+    f"{SKYBLOCK_API_HOST}:{SKYBLOCK_API_PORT}": RetryPolicy(attempts=3, backoff=0.25, timeout=UPSTREAM_TIMEOUT),
+    f"{PARENT_API_HOST}:{PARENT_API_PORT}": RetryPolicy(attempts=2, backoff=0.25, timeout=UPSTREAM_TIMEOUT)
+}
 
 class Bot(commands.Bot):
     def __init__(self, *args, **kwargs):
@@ -32,12 +58,25 @@ class Bot(commands.Bot):
         self.bot_name = os.path.basename(os.getcwd())
         self.owner_ids = []
 
-        self.db = Database("data/bot.db")
-        self.session = None
+        self.db = Database("data/bot.db", batch_writes=True)
+        self.http_client = HttpClient(policies=UPSTREAM_POLICIES)
+        self.session = None  # The http_client's session, set in on_ready
         self.invite: str = None
         self.item_emojis = {}  # Initialize to avoid AttributeError
         self.proxy_api = None  # Initialize to avoid AttributeError
         self.communication = None  # Initialize to avoid AttributeError
+        self.fingerprint_index = None  # Built in on_ready, alt detection falls back to SQL until then
+        self.guild_snapshot = None  # Loaded in on_ready, kept current by the snapshot cog
+        self.profile_cache = ResponseCache(
+            max_bytes=PROFILE_CACHE_MAX_BYTES,
+            ttl=PROFILE_CACHE_TTL,
+            stale_ttl=PROFILE_CACHE_STALE_TTL
+        )
+        self.ai_reply_cache = ReplyCache(ttl=AI_REPLY_CACHE_TTL, threshold=AI_REPLY_SIMILARITY)
+        self.scheduler = Scheduler(self.db)  # Started in on_ready, cogs register their job kinds on load
+        self.scheduler.register("delete_message", self.delete_message_job)
+        self.scheduler.register("ai_credit_reset", self.reset_ai_credits)
+        self.scheduler.register("hosting_expiry", self.hosting_expiry_job)
 
     async def upload_emoji(self, name: str, image_path: str):
         application_id = self.user.id
@@ -73,26 +112,44 @@ class Bot(commands.Bot):
             'Content-Type': 'application/json'
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 201:
-                    return
-                else:
-                    raise ValueError(f"Failed to upload emoji: {response.status} {response.reason}")
+        async with self.http_client.post(url, headers=headers, json=payload) as response:
+            if response.status == 201:
+                return
+            else:
+                raise ValueError(f"Failed to upload emoji: {response.status} {response.reason}")
 
     async def on_ready(self):
         await self.db.connect()
         print("Connected to database")
+        mojang_resolver.attach(self.db)
+
+        if self.fingerprint_index is None:
+            # Shared before loading, so fingerprints saved during the load are
+            # queued on it and a second ready doesn't start another load
+            self.fingerprint_index = FingerprintIndex()
+            try:
+                await self.fingerprint_index.load(self.db)
+            except Exception:
+                self.fingerprint_index = None
+                raise
+
+        if self.guild_snapshot is None:
+            guild_snapshot = GuildSnapshot()
+            await guild_snapshot.load()
+            self.guild_snapshot = guild_snapshot
+        # Events may have been missed while disconnected, so resync on every ready
+        for guild in self.guilds:
+            await self.guild_snapshot.sync_guild(guild)
         
         owner_id = await self.db.get_config("owner_id")
         if owner_id:
             self.owner_ids = [owner_id]
 
-        self.session = aiohttp.ClientSession()
-        self.proxy_api = APIProxyManager(self.session)
-        self.communication = BotCommunicator(self.session)
+        self.session = self.http_client.session
+        self.proxy_api = APIProxyManager(self.http_client)
+        self.communication = BotCommunicator(self.http_client)
 
-        async with self.session.get("https://backup.noemt.dev/accounts") as resp:
+        async with self.http_client.get("https://backup.noemt.dev/accounts") as resp:
             response = await resp.json()
             current_account = response.get("current")
             if current_account:
@@ -104,7 +161,7 @@ class Bot(commands.Bot):
         data = {}
         new_emojis_uploaded = False
 
-        async with self.session.get(url, headers=headers) as resp:
+        async with self.http_client.get(url, headers=headers) as resp:
             response: dict = await resp.json()
             items: list = response.get("items", [])
 
@@ -124,7 +181,7 @@ class Bot(commands.Bot):
                     continue
         
         if new_emojis_uploaded:
-            async with self.session.get(url, headers=headers) as resp:
+            async with self.http_client.get(url, headers=headers) as resp:
                 response: dict = await resp.json()
                 items: list = response.get("items", [])
                 
@@ -163,7 +220,15 @@ class Bot(commands.Bot):
                     print(f"Error loading custom view for panel '{panel[0]}': {e}")
                     traceback.print_exc()
         
-        self.update_server_data.start()
+        await self.scheduler.start()
+        if not self.scheduler.pending("ai_credit_reset"):
+            await self.scheduler.schedule("ai_credit_reset", key="ai_credit_reset")
+        await self.schedule_hosting_expiry()
+
+        if not self.update_server_data.is_running():
+            self.update_server_data.start()
+        if not self.rescan_fingerprints.is_running():
+            self.rescan_fingerprints.start()
         print("aiohttp ClientSession created")
         print("Connected to API Proxy Manager")
         print("Owner IDs:", self.owner_ids)
@@ -176,11 +241,36 @@ class Bot(commands.Bot):
             status=discord.Status.dnd
         )
         
+    async def close(self):
+        await self.scheduler.stop()
+        await self.http_client.close()
+        await super().close()
+
+    def get_cached_data(self, key):
+        body = self.profile_cache.get(key)
+        return json.loads(body) if body is not None else None
+
+    def cache_data(self, key, data):
+        self.profile_cache.put(key, json.dumps(data).encode())
+
     async def get_domain(self):
         domain = await self.db.get_config("domain")
         if not domain:
             return "v2.noemt.dev"
         return domain
+
+    async def push_routing_update(self):
+        """Tell the parent API to re-read this bot's domain and email for its routing table."""
+        try:
+            async with self.http_client.post(
+                f"http://{PARENT_API_HOST}:{PARENT_API_PORT}/internal/routing/refresh",
+                json={"bot": self.bot_name},
+                headers={"X-API-Key": API_KEY}
+            ) as resp:
+                if resp.status != 200:
+                    print(f"Failed to push routing update: {resp.status} {await resp.text()}")
+        except Exception as e:
+            print(f"Failed to POST routing update: {e}")
             
     async def on_interaction(self, interaction: discord.Interaction):
         # Debug/logging: ensure this handler is being reached
@@ -213,9 +303,9 @@ class Bot(commands.Bot):
                     return await super().on_interaction(interaction)
 
                 # Attempt to log command execution (best-effort)
-                if full_command and self.session:
+                if full_command:
                     try:
-                        async with self.session.post(
+                        async with self.http_client.post(
                             f"http://{PARENT_API_HOST}:{PARENT_API_PORT}/live/command-execution",
                             json={
                                 "command": full_command,
@@ -286,9 +376,14 @@ class Bot(commands.Bot):
                 # If even super fails, swallow to avoid crashing the loop
                 return
 
-    @tasks.loop(seconds=60)
-    async def update_server_data(self):
+    async def delete_message_job(self, payload: dict):
+        try:
+            await self.http.delete_message(payload["channel_id"], payload["message_id"])
+        except discord.NotFound:
+            pass
 
+    async def reset_ai_credits(self, payload: dict = None):
+        """Monthly reset of the free AI credits, re-schedules itself for the next month."""
         now = datetime.now(timezone.utc)
         current_day = now.day
         current_month = now.month
@@ -320,82 +415,66 @@ class Bot(commands.Bot):
                     )
                     print("AI credits last_reset timestamp initialized")
 
+        next_month = (now.replace(day=1, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=32)).replace(day=1)
+        await self.scheduler.schedule("ai_credit_reset", key="ai_credit_reset", at=next_month.timestamp())
 
-        if not os.path.exists("./data/server_data.json"):
-            with open("./data/server_data.json", "w") as f:
-                json.dump({}, f)
-
-        with open("./data/server_data.json", "r") as f:
-            data = json.load(f)
-
-        for guild in self.guilds:
+    async def get_paid_until(self) -> datetime | None:
+        hosting_data = await self.db.fetchone("SELECT paid_until FROM hosting LIMIT 1")
+        if not hosting_data or not hosting_data[0]:
+            return None
+        try:
+            paid_until = datetime.fromisoformat(hosting_data[0].replace(' ', 'T'))
+        except (ValueError, TypeError):
+            return None
+        if paid_until.tzinfo is None:
+            paid_until = paid_until.replace(tzinfo=timezone.utc)
+        return paid_until
+
+    async def schedule_hosting_expiry(self):
+        """(Re-)schedule the expiry notice for the current paid_until, called on ready and when hosting is extended."""
+        paid_until = await self.get_paid_until()
+        if paid_until and paid_until > datetime.now(timezone.utc):
+            await self.scheduler.schedule("hosting_expiry", key="hosting_expiry", at=paid_until.timestamp())
+
+    async def hosting_expiry_job(self, payload: dict):
+        paid_until = await self.get_paid_until()
+        if paid_until and paid_until > datetime.now(timezone.utc):
+            # Extended since this was scheduled
+            return await self.schedule_hosting_expiry()
+
+        logs_channel = self.get_channel(await self.db.get_config("logs_channel") or 0)
+        if not logs_channel:
+            return
+
+        embed = discord.Embed(
+            title="⚠️ Hosting Expired",
+            description=(
+                "This bot's hosting subscription has expired.\n\n"
+                "Commands cannot be used until hosting is paid for."
+            ),
+            color=discord.Color.red()
+        )
+        await logs_channel.send(embed=embed)
 
-            key = str(guild.id)
-            if key not in data:
-                data[key] = {}
-            
-            key_data = {
-                "name": guild.name,
-                "members": data[key].get("members", []),
-                "channels": [],
-                "roles": []
-            }
-
-            existing_members = {member["id"]: member for member in key_data["members"]}
-
-            for member in guild.members:
-                member_data = {
-                    "id": member.id,
-                    "bot": member.bot,
-                    "roles": [role.id for role in member.roles]
-                }
-                existing_members[member.id] = member_data
-
-            key_data["members"] = list(existing_members.values())
-
-            key_data["channels"] = [
-                {
-                    channel.name: {
-                        "type": str(channel.type),
-                        "id": channel.id,
-                        "position": channel.position,
-                        "category": channel.category.name if channel.category else None,
-                        "overwrites": {
-                            overwrite.name: [value.value for value in channel.overwrites[overwrite].pair()]
-                            for overwrite in channel.overwrites
-                        }
-                    }
-                } for channel in guild.channels
-            ]
-
-            key_data["roles"] = [
-                {
-                    role.name: {
-                        "id": role.id,
-                        "color": role.color.value,
-                        "position": role.position,
-                        "permissions": role.permissions.value,
-                        "mentionable": role.mentionable,
-                        "hoist": role.hoist,
-                        "managed": role.managed,
-                        "is_bot_managed": role.is_bot_managed(),
-                        "is_premium_subscriber": role.is_premium_subscriber()
-                    }
-                } for role in guild.roles
-            ]
-
-            data[key] = key_data
-
-        with open("./data/server_data.json", "w") as f:
-            json.dump(data, f)
+    @tasks.loop(seconds=60)
+    async def update_server_data(self):
+        await self.guild_snapshot.flush()
+        if self.update_server_data.current_loop % 60 == 0:
+            await self.guild_snapshot.compact()
 
+        main_guild = None
         try:
             main_guild = self.get_guild(int(await self.db.get_config("main_guild")))
         except Exception as e:
             print(f"Error getting main guild: {e}")
 
-        invite = (await main_guild.invites())[0] if main_guild and (await main_guild.invites()) else None
-        self.invite = invite.url if invite else None
+        invites = await main_guild.invites() if main_guild else []
+        self.invite = invites[0].url if invites else None
+
+    # Nightly at a fixed time, not 24 hours after every restart
+    @tasks.loop(time=time(hour=FINGERPRINT_RESCAN_HOUR, tzinfo=timezone.utc))
+    async def rescan_fingerprints(self):
+        await rescan_alternate_accounts(self)
 
     def get_emoji(self, name):
         return self.item_emojis.get(name)
@@ -6,7 +6,6 @@ from bot.util.constants import is_authorized_to_use_bot, auth_config_options
 from discord.ui import View, Button
 from auth.request import Requests
 from bot.bot import Bot
-import json
 
 from bot.util.helper.account import AccountObject
 from bot.util.helper.profile import ProfileObject
@@ -15,13 +14,6 @@ from bot.util.list import list_account, list_profile, list_alt
 
 from bot.util.restore import *
 
-def get_guild_data(guild_id: int) -> dict:
-    with open("./data/server_data.json", "r") as f:
-        data = json.load(f)
-
-    return data.get(str(guild_id), {})
-
-
 class Auth(commands.Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
@@ -260,7 +252,7 @@ class Auth(commands.Cog):
         guild = self.bot.get_guild(main_guild)
 
         if main_guild:
-            data = get_guild_data(main_guild)
+            data = self.bot.guild_snapshot.view(main_guild)
             if not data:
                 embed = discord.Embed(
                     title="Error",
@@ -401,7 +393,7 @@ class Auth(commands.Cog):
                 else:
                     webhook = webhooks[0]
 
-                vouches = await self.bot.db.fetchall("SELECT * FROM vouches")
+                vouches = await self.bot.db.fetchall("SELECT user_id, message, avatar, username FROM vouches")
 
                 for vouch in vouches:
                     user_id, vouch_content, avatar, username = vouch
@@ -431,7 +423,7 @@ class Auth(commands.Cog):
             )
             return await ctx.respond(embed=embed, ephemeral=True)
             
-        data = get_guild_data(main_guild)
+        data = self.bot.guild_snapshot.view(main_guild)
         if not data:
             embed = discord.Embed(
                 title="Error",
@@ -693,7 +685,7 @@ class Auth(commands.Cog):
         
         try:
             # Delete the configuration option from database
-            await self.bot.db.execute("DELETE FROM config WHERE key = ?", option)
+            await self.bot.db.delete_config(option)
             
             config_info = auth_config_options[option]
             embed = discord.Embed(
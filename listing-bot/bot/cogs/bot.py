@@ -3,7 +3,6 @@ from discord.ext import commands
 from discord import SlashCommandGroup, option
 from count_lines import count_lines
 from discord.ui import View, Button
-import aiohttp
 from bot.util.constants import bot_name, is_authorized_to_use_bot
 import subprocess
 
@@ -52,10 +51,9 @@ class Bot(commands.Cog):
     async def bot_stats(self, ctx: discord.ApplicationContext):
         await ctx.defer()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://backup.noemt.dev/accounts") as r:
-                data: dict = await r.json()
-                current_account = data.get("current", "1323257877711818753")
+        async with self.bot.http_client.get("https://backup.noemt.dev/accounts") as r:
+            data: dict = await r.json()
+            current_account = data.get("current", "1323257877711818753")
 
         invite = "t4D7Njgcgg"
 
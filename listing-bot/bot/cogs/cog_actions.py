@@ -4,17 +4,15 @@ from discord import SlashCommandGroup, option
 from bot.bot import Bot
 from bot.util.constants import is_authorized_to_use_bot, cog_action_types
 from bot.util.listing_objects.ticket import Ticket as TicketObject
-from chat_exporter.construct.transcript import Transcript
-from bot.util.attachment_handler import CustomHandler
+from bot.util.transcript import save_transcript
 from typing import Optional
-import asyncio
-import os
 
 class CogActions(commands.Cog):
     """Cog for managing server action configurations"""
     
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.bot.scheduler.register("ticket_auto_close", self._auto_close_tickets)
     
     _cog_actions = SlashCommandGroup("actions", description="Configure server actions")
 
@@ -350,6 +348,9 @@ class CogActions(commands.Cog):
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         """Handle member join events"""
+        # Member came back before their tickets were auto-closed
+        await self.bot.scheduler.cancel(self._auto_close_key(member.guild.id, member.id))
+
         try:
             if not await self.is_action_enabled(member.guild.id, "join_leave_messages"):
                 return
@@ -414,74 +415,71 @@ class CogActions(commands.Cog):
         except Exception as e:
             print(f"Error in member remove handler: {e}")
     
+    @staticmethod
+    def _auto_close_key(guild_id: int, member_id: int) -> str:
+        return f"ticket_auto_close:{guild_id}:{member_id}"
+
     async def _handle_ticket_auto_close(self, member: discord.Member):
-        """Handle automatic ticket closing when a member leaves"""
+        """Schedule closing the tickets of a member who left"""
         try:
             # Get close delay setting (default 5 minutes)
             delay_minutes = await self.get_action_setting(member.guild.id, "ticket_auto_close", "close_delay_minutes")
             delay_seconds = int(delay_minutes) * 60 if delay_minutes else 300  # Default 5 minutes
             
-            # Find all tickets opened by this member
-            tickets = await self.bot.db.fetchall(
-                "SELECT * FROM tickets WHERE opened_by = ? AND is_open = 1",
+            # Only schedule if this member has open tickets
+            ticket = await self.bot.db.fetchone(
+                "SELECT 1 FROM tickets WHERE opened_by = ? AND is_open = 1",
                 member.id
             )
             
-            if not tickets:
+            if not ticket:
                 return
             
-            # Wait for the specified delay
-            await asyncio.sleep(delay_seconds)
-            
-            # Check if member rejoined during the delay
-            if member.guild.get_member(member.id):
-                return  # Member rejoined, don't close tickets
-            
-            # Close each ticket
-            for ticket_data in tickets:
-                try:
-                    ticket_object = TicketObject(*ticket_data)
-                    channel = member.guild.get_channel(ticket_object.channel_id)
-                    
-                    if not channel:
-                        continue
-                    
-                    # Check if ticket is still open
-                    current_ticket = await self.bot.db.fetchone(
-                        "SELECT is_open FROM tickets WHERE channel_id = ?",
-                        ticket_object.channel_id
-                    )
-                    
-                    if not current_ticket or not current_ticket[0]:
-                        continue  # Ticket already closed
-                    
-                    await self._auto_delete_ticket(channel, ticket_object, member)
-                    
-                except Exception as e:
-                    print(f"Error closing ticket {ticket_data[0]}: {e}")
+            await self.bot.scheduler.schedule(
+                "ticket_auto_close",
+                delay=delay_seconds,
+                payload={"guild_id": member.guild.id, "member_id": member.id},
+                key=self._auto_close_key(member.guild.id, member.id)
+            )
                     
         except Exception as e:
             print(f"Error in ticket auto close handler: {e}")
+
+    async def _auto_close_tickets(self, payload: dict):
+        """Scheduled job, closes the departed member's tickets that are still open"""
+        guild = self.bot.get_guild(payload["guild_id"])
+        if not guild:
+            return
+
+        member_id = payload["member_id"]
+        # Check if member rejoined during the delay
+        if guild.get_member(member_id):
+            return  # Member rejoined, don't close tickets
+
+        tickets = await self.bot.db.fetchall(
+            "SELECT * FROM tickets WHERE opened_by = ? AND is_open = 1",
+            member_id
+        )
+        
+        # Close each ticket
+        for ticket_data in tickets:
+            try:
+                ticket_object = TicketObject(*ticket_data)
+                channel = guild.get_channel(ticket_object.channel_id)
+                
+                if not channel:
+                    continue
+                
+                await self._auto_delete_ticket(channel, ticket_object, discord.Object(id=member_id))
+                
+            except Exception as e:
+                print(f"Error closing ticket {ticket_data[0]}: {e}")
     
-    async def _auto_delete_ticket(self, channel: discord.TextChannel, ticket_object: TicketObject, departed_member: discord.Member):
+    async def _auto_delete_ticket(self, channel: discord.TextChannel, ticket_object: TicketObject, departed_member: discord.abc.Snowflake):
         """Automatically delete a ticket with transcript generation"""
         try:
             # Generate transcript
-            transcript = (
-                await Transcript(
-                    channel=channel,
-                    limit=None,
-                    messages=None,
-                    pytz_timezone="UTC",
-                    military_time=True,
-                    fancy_times=True,
-                    before=None,
-                    after=None,
-                    support_dev=True,
-                    bot=self.bot,
-                    attachment_handler=CustomHandler()
-                ).export()
-            ).html
+            await save_transcript(self.bot, channel, ticket_object.opened_by)
 
             transcript_url = f"https://{await self.bot.get_domain()}/transcript/{self.bot.bot_name}/{channel.id}-{ticket_object.opened_by}"
 
@@ -492,14 +490,9 @@ class CogActions(commands.Cog):
             transcript_embed.set_author(name="Transcript (Auto-Deleted)", icon_url=self.bot.user.avatar.url)
             transcript_embed.set_footer(text=f"{channel.name}")
             transcript_embed.add_field(name="Auto-Deleted Reason", value="Member left the server")
-            transcript_embed.add_field(name="Departed Member", value=f"{departed_member.mention}")
+            transcript_embed.add_field(name="Departed Member", value=f"<@{departed_member.id}>")
             transcript_embed.add_field(name="Opened By", value=f"<@{ticket_object.opened_by}>")
             
-            # Save transcript
-            os.makedirs("./templates", exist_ok=True)
-            with open(f"./templates/{self.bot.bot_name}-{channel.id}-{ticket_object.opened_by}.html", "wb") as f:
-                f.write(transcript.encode())
-
             button = discord.ui.Button(
                 style=discord.ButtonStyle.link,
                 label="Transcript",
@@ -1,8 +1,6 @@
 import discord
 from discord.ext import commands, tasks
 from discord import option, SlashCommandGroup
-import re
-from collections import defaultdict
 import asyncio
 
 from bot.bot import Bot
@@ -12,6 +10,8 @@ from bot.util.paginator import Paginator
 class Customer(commands.Cog):
     def __init__(self, bot):
         self.bot: Bot = bot
+        # Milestones the last checker run used, a change means every customer is re-checked
+        self.checked_milestones = None
         self.milestone_checker.start()
 
     def cog_unload(self):
@@ -112,66 +112,17 @@ class Customer(commands.Cog):
     async def customer_leaderboard(self, ctx: discord.ApplicationContext):
         await ctx.defer()
 
-        vouches = await self.bot.db.fetchall("SELECT user_id, message, username FROM vouches")
-        
-        if not vouches:
-            embed = discord.Embed(
-                title="Customer Leaderboard",
-                description="No vouches found in the database.",
-                color=discord.Color.red()
-            )
-            return await ctx.respond(embed=embed)
-
-        customer_stats = defaultdict(lambda: {'total_spent': 0, 'purchase_count': 0, 'name': None, 'username': None})
-        pattern = re.compile(r'(\d+)\$|\$(\d+)|(\d+)\s?bucks')
-        
-        for user_id, message, username in vouches:
-            matches = pattern.findall(message)
-            amounts = [int(match) for group in matches for match in group if match and match.isdigit()]
-            amount = max(amounts) if amounts else 0
-            
-            if amount > 0:
-                customer_id = str(user_id)
-                customer_stats[customer_id]['total_spent'] += amount
-                customer_stats[customer_id]['purchase_count'] += 1
-                customer_stats[customer_id]['username'] = username
-        
-        if not customer_stats:
-            embed = discord.Embed(
-                title="Customer Leaderboard",
-                description="No valid customer spending data found in vouches.",
-                color=discord.Color.red()
-            )
-            return await ctx.respond(embed=embed)
-
-        sorted_customers = sorted(
-            customer_stats.items(),
-            key=lambda x: (x[1]['total_spent'], x[1]['purchase_count']),
-            reverse=True
+        # customer_spend is maintained by triggers on vouches and read in leaderboard order
+        rows = await self.bot.db.fetchall(
+            """
+            SELECT user_id, total_spent, purchase_count, username FROM customer_spend
+            WHERE total_spent > 0
+            ORDER BY total_spent DESC, purchase_count DESC
+            LIMIT 50
+            """
         )
-        
-        top_customers = sorted_customers[:50]
-        user_cache = {}
-        
-        if ctx.guild:
-            for member in ctx.guild.members:
-                user_cache[str(member.id)] = member.display_name
-        
-        for customer_id, stats in top_customers:
-            if customer_id not in user_cache:
-                try:
-                    user = self.bot.get_user(int(customer_id))
-                    if user:
-                        user_cache[customer_id] = user.display_name
-                    else:
-                        user_cache[customer_id] = stats['username'] or f"User {customer_id}"
-                except:
-                    user_cache[customer_id] = stats['username'] or f"User {customer_id}"
-        
-        for customer_id, stats in customer_stats.items():
-            stats['name'] = user_cache.get(customer_id, stats['username'] or f"User {customer_id}")
 
-        if not customer_stats:
+        if not rows:
             embed = discord.Embed(
                 title="Customer Leaderboard",
                 description="No valid customer spending data found in vouches.",
@@ -179,11 +130,15 @@ class Customer(commands.Cog):
             )
             return await ctx.respond(embed=embed)
 
-        sorted_customers = sorted(
-            customer_stats.items(),
-            key=lambda x: (x[1]['total_spent'], x[1]['purchase_count']),
-            reverse=True
-        )
+        sorted_customers = []
+        for user_id, total_spent, purchase_count, username in rows:
+            member = ctx.guild.get_member(user_id) if ctx.guild else None
+            user = member or self.bot.get_user(user_id)
+            sorted_customers.append((str(user_id), {
+                'total_spent': total_spent,
+                'purchase_count': purchase_count,
+                'name': user.display_name if user else username or f"User {user_id}"
+            }))
 
         embeds = []
         customers_per_page = 10
@@ -348,90 +303,129 @@ class Customer(commands.Cog):
         embed.set_footer(text=f"{len(milestones)} milestone(s) configured")
         await ctx.respond(embed=embed)
 
+    async def get_milestones(self) -> list[tuple[int, int]]:
+        """(amount, role_id) of every milestone, highest first."""
+        milestones = []
+        for key, role_id in (await self.bot.db.get_configs(prefix="milestone_role_")).items():
+            try:
+                amount = int(key.replace("milestone_role_", ""))
+                milestones.append((amount, int(role_id)))
+            except (ValueError, TypeError):
+                continue
+
+        milestones.sort(key=lambda x: x[0], reverse=True)
+        return milestones
+
+    async def assign_milestone(self, member: discord.Member, total_spent: int, milestones: list[tuple[int, int]]) -> bool:
+        """
+        Give the member the role of the highest milestone they reached.
+        Returns False only when Discord refused the role change.
+        """
+        guild = member.guild
+
+        qualified_milestone = None
+        for amount, role_id in milestones:
+            if total_spent >= amount:
+                qualified_milestone = (amount, role_id)
+                break
+
+        if not qualified_milestone:
+            return True
+
+        milestone_amount, milestone_role_id = qualified_milestone
+        role = guild.get_role(milestone_role_id)
+        if not role:
+            return True
+
+        # Check if user already has this role
+        if role in member.roles:
+            return True
+
+        # Remove lower milestone roles and add the new one
+        roles_to_remove = []
+        for amount, role_id in milestones:
+            if amount < milestone_amount:
+                lower_role = guild.get_role(role_id)
+                if lower_role and lower_role in member.roles:
+                    roles_to_remove.append(lower_role)
+
+        try:
+            if roles_to_remove:
+                await member.remove_roles(*roles_to_remove, reason="Milestone upgrade")
+            await member.add_roles(role, reason=f"Reached ${milestone_amount:,} spending milestone")
+            
+            # Log the milestone achievement
+            print(f"Assigned milestone role {role.name} to {member.display_name} for spending ${milestone_amount:,}")
+            return True
+        except discord.Forbidden:
+            return False
+        except discord.HTTPException:
+            return False
+
     @tasks.loop(minutes=1)
     async def milestone_checker(self):
-        """Check and assign milestone roles every minute"""
+        """
+        Assign milestone roles to customers whose spending crossed a milestone
+        since the last run. Everyone is re-checked when the milestones change.
+        """
         try:
-            all_configs = await self.bot.db.fetchall("SELECT key, value FROM config WHERE key LIKE 'milestone_role_%'")
-            if not all_configs:
-                return
-
-            milestones = []
-            for key, role_id in all_configs:
-                try:
-                    amount = int(key.replace("milestone_role_", ""))
-                    milestones.append((amount, int(role_id)))
-                except (ValueError, TypeError):
-                    continue
-
+            milestones = await self.get_milestones()
             if not milestones:
+                self.checked_milestones = None
                 return
 
-            milestones.sort(key=lambda x: x[0], reverse=True)
-
-            vouches = await self.bot.db.fetchall("SELECT user_id, message FROM vouches")
-            customer_spending = defaultdict(int)
-            pattern = re.compile(r'(\d+)\$|\$(\d+)|(\d+)\s?bucks')
+            recheck_all = milestones != self.checked_milestones
+            if recheck_all:
+                rows = await self.bot.db.fetchall(
+                    "SELECT user_id, total_spent, milestone_checked_total FROM customer_spend WHERE total_spent > 0"
+                )
+            else:
+                rows = await self.bot.db.fetchall(
+                    "SELECT user_id, total_spent, milestone_checked_total FROM customer_spend WHERE total_spent != milestone_checked_total"
+                )
 
-            for user_id, message in vouches:
-                matches = pattern.findall(message)
-                amounts = [int(match) for group in matches for match in group if match and match.isdigit()]
-                amount = max(amounts) if amounts else 0
-                if amount > 0:
-                    customer_spending[user_id] += amount
+            due = [
+                (user_id, total_spent)
+                for user_id, total_spent, checked_total in rows
+                if recheck_all or any(checked_total < amount <= total_spent for amount, _ in milestones)
+            ]
 
+            failed = set()
             for guild in self.bot.guilds:
-                try:
-                    for user_id, total_spent in customer_spending.items():
-                        member = guild.get_member(user_id)
-                        if not member:
-                            continue
-
-                        qualified_milestone = None
-                        for amount, role_id in milestones:
-                            if total_spent >= amount:
-                                qualified_milestone = (amount, role_id)
-                                break
-
-                        if not qualified_milestone:
-                            continue
-
-                        milestone_amount, milestone_role_id = qualified_milestone
-                        role = guild.get_role(milestone_role_id)
-                        if not role:
-                            continue
-
-                        # Check if user already has this role
-                        if role in member.roles:
-                            continue
-
-                        # Remove lower milestone roles and add the new one
-                        roles_to_remove = []
-                        for amount, role_id in milestones:
-                            if amount < milestone_amount:
-                                lower_role = guild.get_role(role_id)
-                                if lower_role and lower_role in member.roles:
-                                    roles_to_remove.append(lower_role)
-
-                        try:
-                            if roles_to_remove:
-                                await member.remove_roles(*roles_to_remove, reason="Milestone upgrade")
-                            await member.add_roles(role, reason=f"Reached ${milestone_amount:,} spending milestone")
-                            
-                            # Log the milestone achievement
-                            print(f"Assigned milestone role {role.name} to {member.display_name} for spending ${milestone_amount:,}")
-                        except discord.Forbidden:
-                            continue
-                        except discord.HTTPException:
-                            continue
-
-                except Exception as e:
-                    print(f"Error processing milestones for guild {guild.name}: {e}")
-                    continue
+                for user_id, total_spent in due:
+                    member = guild.get_member(user_id)
+                    if not member:
+                        continue
+                    try:
+                        if not await self.assign_milestone(member, total_spent, milestones):
+                            failed.add(user_id)
+                    except Exception as e:
+                        print(f"Error processing milestones for {user_id} in guild {guild.name}: {e}")
+                        failed.add(user_id)
+
+            # A checked total of 0 makes the next run try every milestone of a
+            # customer whose role couldn't be applied, like before the ledger
+            if rows:
+                await self.bot.db.executemany(
+                    "UPDATE customer_spend SET milestone_checked_total = ? WHERE user_id = ?",
+                    [(0 if user_id in failed else total_spent, user_id) for user_id, total_spent, _ in rows]
+                )
+            self.checked_milestones = milestones
 
         except Exception as e:
             print(f"Error in milestone checker: {e}")
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        # The checker only looks at changed totals, so returning customers are handled here
+        milestones = await self.get_milestones()
+        if not milestones:
+            return
+
+        row = await self.bot.db.fetchone("SELECT total_spent FROM customer_spend WHERE user_id = ?", member.id)
+        if row and row[0] > 0:
+            await self.assign_milestone(member, row[0], milestones)
+
     @milestone_checker.before_loop
     async def before_milestone_checker(self):
         await self.bot.wait_until_ready()
@@ -227,23 +227,22 @@ class ErrorHandler(commands.Cog):
             # Hardcoded webhook URL
             webhook_url = "https://discord.com/api/webhooks/1397964240366731405/AeF5QNtX4ORQ1agL1U3VHHo04GiD45jguu4xfiBhHu02z2IcP9eCxnzPUQOWlWjOoh18"
             
-            async with aiohttp.ClientSession() as session:
-                webhook_data = {
-                    "embeds": [embed.to_dict()],
-                    "content": f"🚨 **{error_source.title()} Error Detected** 🚨 | @everyone"
-                }
-                
-                # Prepare data without file for initial payload construction
-                data = aiohttp.FormData()
-                data.add_field('payload_json', discord.utils.to_json(webhook_data))
-                
-                if file:
-                    data.add_field('file', file.fp, filename=file.filename, content_type='text/plain')
-                
-                async with session.post(webhook_url, data=data) as response:
-                    if response.status not in (200, 204):
-                        print(f"Failed to send error webhook: {response.status}")
-                        
+            webhook_data = {
+                "embeds": [embed.to_dict()],
+                "content": f"🚨 **{error_source.title()} Error Detected** 🚨 | @everyone"
+            }
+            
+            # Prepare data without file for initial payload construction
+            data = aiohttp.FormData()
+            data.add_field('payload_json', discord.utils.to_json(webhook_data))
+            
+            if file:
+                data.add_field('file', file.fp, filename=file.filename, content_type='text/plain')
+            
+            async with self.bot.http_client.post(webhook_url, data=data) as response:
+                if response.status not in (200, 204):
+                    print(f"Failed to send error webhook: {response.status}")
+                    
         except Exception as webhook_error:
             print(f"Error sending webhook notification: {webhook_error}")
 
@@ -4,9 +4,10 @@ from discord.commands import SlashCommandGroup, option
 from bot.util.vouch import insert_vouch
 from datetime import datetime
 from bot.bot import Bot
+import asyncio
 import json
-import os
 from bot.util.constants import is_authorized_to_use_bot
+from bot.util.event_log import LoggingSettings, LogDispatcher
 import ai
 
 sample_json = {
@@ -42,29 +43,16 @@ class Event(commands.Cog):
     def __init__(self, bot):
         self.bot: Bot = bot
 
-        if not os.path.exists("data/logging.json"):
-            # Ensure data directory exists
-            os.makedirs("data", exist_ok=True)
-            with open("data/logging.json", "w") as f:
-                json.dump(sample_json, f, indent=4)
+        self.log_settings = LoggingSettings(defaults=sample_json)
+        self.log_settings.load(initial=sample_json)
+        self.log_dispatcher = LogDispatcher()
+
+    def cog_unload(self):
+        asyncio.create_task(self.log_dispatcher.close())
 
     # Helper method to check if logging is enabled
     async def is_logging_enabled(self, guild_id, event_type):
-        try:
-            with open("data/logging.json", "r") as f:
-                settings = json.load(f)
-        except FileNotFoundError:
-             # Ensure data directory exists
-            os.makedirs("data", exist_ok=True)
-            with open("data/logging.json", "w") as f:
-                json.dump({}, f, indent=4) # Start with empty if file truly missing
-            return False
-            
-        guild_id_str = str(guild_id)
-        if guild_id_str not in settings:
-            return False
-            
-        return settings[guild_id_str].get(event_type, False)
+        return self.log_settings.is_enabled(guild_id, event_type)
     
     # Helper method to send log messages
     async def send_log(self, guild, event_type, embed_to_send: discord.Embed):
@@ -92,12 +80,8 @@ class Event(commands.Cog):
 
         embed_to_send.timestamp = datetime.utcnow()
         embed_to_send.set_footer(text=f"Event ID: {event_type}")
-        try:
-            await channel.send(embed=embed_to_send)
-        except discord.Forbidden:
-            print(f"Missing permissions to send log message in {channel.name} ({channel.id})")
-        except discord.HTTPException as e:
-            print(f"Failed to send log message: {e}")
+        # Queued and sent together with the rest of the burst
+        self.log_dispatcher.send(channel, embed_to_send)
     
     # Define the logging command group
     logging = SlashCommandGroup("logging", "Commands for configuring logging settings")
@@ -126,29 +110,9 @@ class Event(commands.Cog):
     )
     async def logging_config(self, ctx: discord.ApplicationContext, event: str, enabled: bool):
         await ctx.defer(ephemeral=True)
-        
-        try:
-            with open("data/logging.json", "r") as f:
-                settings = json.load(f)
-        except FileNotFoundError:
-            os.makedirs("data", exist_ok=True)
-            settings = {} # Initialize empty settings
-        
-        guild_id = str(ctx.guild.id)
-        
-        if guild_id not in settings:
-            settings[guild_id] = sample_json.copy() # Use a copy of sample_json as a base
-        
-        # Ensure all keys from sample_json are present for the guild
-        for key, value in sample_json.items():
-            if key not in settings[guild_id]:
-                settings[guild_id][key] = value
 
-        if event in settings[guild_id]:
-            settings[guild_id][event] = enabled
-            
-            with open("data/logging.json", "w") as f:
-                json.dump(settings, f, indent=4)
+        if event in self.log_settings.guild(ctx.guild.id):
+            await self.log_settings.set(ctx.guild.id, event, enabled)
             
             status = "enabled" if enabled else "disabled"
             await ctx.respond(f"Logging for `{event}` has been {status}.", ephemeral=True)
@@ -182,25 +146,8 @@ class Event(commands.Cog):
     async def logging_status(self, ctx: discord.ApplicationContext):
         await ctx.defer(ephemeral=True)
         
-        try:
-            with open("data/logging.json", "r") as f:
-                settings = json.load(f)
-        except FileNotFoundError:
-            os.makedirs("data", exist_ok=True)
-            settings = {}
-        
-        guild_id = str(ctx.guild.id)
-        
-        if guild_id not in settings:
-            settings[guild_id] = sample_json.copy()
-            with open("data/logging.json", "w") as f: # Save initial settings if not present
-                json.dump(settings, f, indent=4)
-        
-        # Ensure all keys from sample_json are present
-        guild_settings = settings[guild_id]
-        for key, value in sample_json.items():
-            if key not in guild_settings:
-                guild_settings[key] = value # Default to sample_json value if missing
+        # Every key from sample_json is filled in
+        guild_settings = self.log_settings.guild(ctx.guild.id)
 
         embed = discord.Embed(
             title="Logging Configuration",
@@ -350,16 +297,23 @@ class Event(commands.Cog):
                 {ai_info}
                 The users\'s question/message is: {message.content}
                 Please provide a helpful and concise response. Do not repeat the info I have given you about my server.'''
+            context = ""
             try:
                 if message.guild and message.channel:
-                    query_message += f'\nSent from:{message.channel.name} in {message.guild.name}'
+                    context = f'\nSent from:{message.channel.name} in {message.guild.name}'
+                    query_message += context
             except AttributeError:
                 pass
             
+            async def ask():
+                query_response = await ai.ask_ai(self.bot, query_message, return_json=False)
+                reply = query_response.parse()
+                # Bans are about the asker, only plain answers are reused for other users
+                return reply, isinstance(reply, str) and bool(reply) and '{"ban"' not in reply
+
             async with message.channel.typing():
                 try:
-                    query_response = await ai.ask_ai(self.bot, query_message, return_json=False)
-                    reply_content = query_response.parse()
+                    reply_content = await self.bot.ai_reply_cache.fetch(ai_info, message.content, ask, context=context)
                     if '{"ban": True' in reply_content:
                         ban_info = json.loads(reply_content)
                         await message.author.ban(reason=ban_info['reason'], delete_message_seconds=0)
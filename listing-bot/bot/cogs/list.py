@@ -1,21 +1,77 @@
 import discord
+import time
 from discord import SlashCommandGroup, option
-from discord.ext import commands
+from discord.ext import commands, tasks
 from bot.util.constants import is_authorized_to_use_bot
 from bot.bot import Bot
 from bot.util.list import list_account, list_profile, list_alt
 from bot.util.selector import profile_selector
-from bot.util.fetch import fetch_profile_data
 from bot.util.get_payment_methods import get_payment_methods
-from bot.util.convert_payment_methods import convert_payment_methods
+from bot.util.refresh import ListingRefresher, RefreshResult
 
-from bot.util.helper.account import AccountObject, create_embed_account_listing
-from bot.util.helper.profile import ProfileObject, create_embed_profile_listing
-from bot.util.helper.macro_alt import AltObject, create_embed_alt_listing
+from bot.util.helper.account import AccountObject
+from bot.util.helper.profile import ProfileObject
+from bot.util.helper.macro_alt import AltObject
 
 class List(commands.Cog):
     def __init__(self, bot):
         self.bot: Bot = bot
+        self.refresher = ListingRefresher(bot)
+        self.last_scheduled_refresh = time.monotonic()
+        self.scheduled_refresh.start()
+
+    def cog_unload(self):
+        self.scheduled_refresh.cancel()
+
+    def progress_embed(self, label: str, noun: str, result: RefreshResult, finished: bool = False) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"{label} Found",
+            description=f"Found {result.total} {noun} matching the given criteria.",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Progress", value=f"{'🟢' if finished else '🔴'} {result.done}/{result.total}", inline=False)
+        embed.add_field(name="Updated", value=str(result.updated))
+        embed.add_field(name="Unchanged", value=str(result.unchanged))
+        if result.missing:
+            embed.add_field(name="Missing", value=str(result.missing))
+        if result.failed:
+            embed.add_field(name="Failed", value=str(result.failed))
+        if finished:
+            embed.set_footer(text=f"Finished in {result.elapsed:.1f}s")
+        return embed
+
+    async def refresh_listings(self, ctx: discord.ApplicationContext, kind: str, rows, label: str, noun: str):
+        response: discord.WebhookMessage = await ctx.respond(embed=self.progress_embed(label, noun, RefreshResult(len(rows))))
+
+        async def report(result: RefreshResult):
+            await response.edit(embed=self.progress_embed(label, noun, result))
+
+        result = await self.refresher.refresh(kind, rows, on_progress=report)
+        await response.edit(embed=self.progress_embed(label, noun, result, finished=True))
+
+    @tasks.loop(minutes=1)
+    async def scheduled_refresh(self):
+        """Refreshes every listing each `listing_refresh_interval` minutes, if configured."""
+        try:
+            interval = int(await self.bot.db.get_config("listing_refresh_interval") or 0)
+        except (TypeError, ValueError):
+            return
+        if interval <= 0 or time.monotonic() - self.last_scheduled_refresh < interval * 60:
+            return
+
+        self.last_scheduled_refresh = time.monotonic()
+        try:
+            results = await self.refresher.refresh_all()
+        except Exception as e:
+            print(f"Error in scheduled listing refresh: {e}")
+            return
+        for kind, result in results.items():
+            if result.total:
+                print(f"Refreshed {kind}: {result}")
+
+    @scheduled_refresh.before_loop
+    async def before_scheduled_refresh(self):
+        await self.bot.wait_until_ready()
 
     list = SlashCommandGroup(name="list", description="Listing related commands.")
     update = SlashCommandGroup(name="update", description="Updating related commands.")
@@ -56,11 +112,8 @@ class List(commands.Cog):
     async def accounts_update(self, ctx: discord.ApplicationContext, number: int=None):
         await ctx.defer(ephemeral=True)
 
-        query = "SELECT * FROM accounts" + (" WHERE number=?" if number else "")
-        params = (number,) if number else ()
-        accounts = await self.bot.db.fetchall(query, *params)
-
-        if not accounts:
+        rows = await self.refresher.listings("accounts", number)
+        if not rows:
             response_embed = discord.Embed(
                 title="No Accounts Found",
                 description="No accounts found with the specified criteria.",
@@ -68,42 +121,8 @@ class List(commands.Cog):
             )
             return await ctx.respond(embed=response_embed)
 
+        await self.refresh_listings(ctx, "accounts", rows, "Accounts", "account(s)")
 
-        response_embed = discord.Embed(
-            title="Accounts Found",
-            description=f"Found {len(accounts)} account(s) matching the given criteria.",
-            color=discord.Color.green()
-        )
-        for i, account in enumerate(accounts):
-            if i < 24:
-                account = AccountObject(*account)
-                response_embed.add_field(name=account.username, value=f"🔴")
-            else:
-                response_embed.add_field(name=f"And {len(accounts)-24} more", value="🔴", inline=False)
-                break
-
-        response: discord.WebhookMessage = await ctx.respond(embed=response_embed)
-
-        for i, account in enumerate(accounts):
-            if i < 24:
-                account = AccountObject(*account)
-                profile_data, profile = await fetch_profile_data(self.bot.session, account.uuid, self.bot, account.profile)
-                embed = create_embed_account_listing(profile_data, profile, account.uuid, account.username, account.price, account.additional_info, convert_payment_methods(self.bot, account.payment_methods), ctx, self.bot, f"<@{account.listed_by}>")
-                response_embed.fields[i].value = f"🟢"
-
-                channel = self.bot.get_channel(account.channel_id)
-                if not channel:
-                    continue
-                message = await channel.fetch_message(account.message_id)
-                if not message:
-                    continue
-
-                await message.edit(embed=embed)
-                await response.edit(embed=response_embed)
-
-        response_embed.fields[-1].value = "🟢"
-        await response.edit(embed=response_embed)
-    
     @restore.command(name="accounts", description="Restore all accounts")
     @is_authorized_to_use_bot()
     async def accounts_restore(self, ctx: discord.ApplicationContext):
@@ -186,11 +205,8 @@ class List(commands.Cog):
     async def profiles_update(self, ctx: discord.ApplicationContext, number: int=None):
         await ctx.defer(ephemeral=True)
 
-        query = "SELECT * FROM profiles" + (" WHERE number=?" if number else "")
-        params = (number,) if number else ()
-        profiles = await self.bot.db.fetchall(query, *params)
-
-        if not profiles:
+        rows = await self.refresher.listings("profiles", number)
+        if not rows:
             response_embed = discord.Embed(
                 title="No Profiles Found",
                 description="No profiles found with the specified criteria.",
@@ -198,40 +214,7 @@ class List(commands.Cog):
             )
             return await ctx.respond(embed=response_embed)
 
-        response_embed = discord.Embed(
-            title="Profiles Found",
-            description=f"Found {len(profiles)} profile(s) matching the given criteria.",
-            color=discord.Color.green()
-        )
-        for i, profile in enumerate(profiles):
-            if i < 24:
-                profile = ProfileObject(*profile)
-                response_embed.add_field(name=profile.username, value=f"🔴")
-            else:
-                response_embed.add_field(name=f"And {len(profiles)-24} more", value="🔴", inline=False)
-                break
-
-        response: discord.WebhookMessage = await ctx.respond(embed=response_embed)
-
-        for i, profile in enumerate(profiles):
-            if i < 24:
-                account = ProfileObject(*profile)
-                profile_data, profile = await fetch_profile_data(self.bot.session, account.uuid, self.bot, account.profile)
-                embed = create_embed_profile_listing(profile_data, profile, account.price, convert_payment_methods(self.bot, account.payment_methods), self.bot, f"<@{account.listed_by}>")
-                response_embed.fields[i].value = f"🟢"
-
-                channel = self.bot.get_channel(account.channel_id)
-                if not channel:
-                    continue
-                message = await channel.fetch_message(account.message_id)
-                if not message:
-                    continue
-
-                await message.edit(embed=embed)
-                await response.edit(embed=response_embed)
-
-        response_embed.fields[-1].value = "🟢"
-        await response.edit(embed=response_embed)
+        await self.refresh_listings(ctx, "profiles", rows, "Profiles", "profile(s)")
 
     @restore.command(name="profiles", description="Restore all profiles")
     @is_authorized_to_use_bot()
@@ -318,11 +301,8 @@ class List(commands.Cog):
     async def alts_update(self, ctx: discord.ApplicationContext, number: int=None):
         await ctx.defer(ephemeral=True)
 
-        query = "SELECT * FROM alts" + (" WHERE number=?" if number else "")
-        params = (number,) if number else ()
-        alts = await self.bot.db.fetchall(query, *params)
-
-        if not alts:
+        rows = await self.refresher.listings("alts", number)
+        if not rows:
             response_embed = discord.Embed(
                 title="No Alt Accounts Found",
                 description="No Alt Accounts found with the specified criteria.",
@@ -330,40 +310,7 @@ class List(commands.Cog):
             )
             return await ctx.respond(embed=response_embed)
 
-        response_embed = discord.Embed(
-            title="Alt Accounts Found",
-            description=f"Found {len(alts)} Alt Account(s) matching the given criteria.",
-            color=discord.Color.green()
-        )
-        for i, profile in enumerate(alts):
-            if i < 24:
-                profile = AltObject(*profile)
-                response_embed.add_field(name=profile.username, value=f"🔴")
-            else:
-                response_embed.add_field(name=f"And {len(alts)-24} more", value="🔴", inline=False)
-                break
-
-        response: discord.WebhookMessage = await ctx.respond(embed=response_embed)
-
-        for i, profile in enumerate(alts):
-            if i < 24:
-                account = AltObject(*profile)
-                profile_data, profile = await fetch_profile_data(self.bot.session, account.uuid, self.bot, account.profile)
-                embeds = create_embed_alt_listing(profile_data, profile, account.price, convert_payment_methods(self.bot, account.payment_methods), self.bot, f"<@{account.listed_by}>", account.mining, account.farming)
-                response_embed.fields[i].value = f"🟢"
-
-                channel = self.bot.get_channel(account.channel_id)
-                if not channel:
-                    continue
-                message = await channel.fetch_message(account.message_id)
-                if not message:
-                    continue
-
-                await message.edit(embeds=embeds)
-                await response.edit(embed=response_embed)
-
-        response_embed.fields[-1].value = "🟢"
-        await response.edit(embed=response_embed)
+        await self.refresh_listings(ctx, "alts", rows, "Alt Accounts", "Alt Account(s)")
 
     @restore.command(name="alts", description="Restore all alt accounts")
     @is_authorized_to_use_bot()
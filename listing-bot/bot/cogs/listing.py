@@ -140,7 +140,7 @@ class Listings(commands.Cog):
             new_price, channel.id
         )
 
-        profile_data, profile = await fetch_profile_data(self.bot.session, account.uuid, self.bot, account.profile)
+        profile_data, profile = await fetch_profile_data(account.uuid, self.bot, account.profile)
 
         if used_table == "accounts":
             embeds = [create_embed_account_listing(profile_data, profile, account.uuid, account.username, new_price, account.additional_info, convert_payment_methods(self.bot, account.payment_methods), ctx, self.bot, f"<@{account.listed_by}>")]
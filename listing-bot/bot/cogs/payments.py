@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import SlashCommandGroup, option
-import aiohttp
 
 import urllib.parse
 import io
@@ -20,13 +19,12 @@ class Payments(commands.Cog):
         url = f"https://api.coingecko.com/api/v3/simple/price?ids={crypto_id}&vs_currencies=usd"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data[crypto_id]["usd"]
-                    else:
-                        return None
+            async with self.bot.http_client.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data[crypto_id]["usd"]
+                else:
+                    return None
         except Exception as e:
             print(f"Error fetching crypto price: {e}")
             return None
@@ -399,10 +397,8 @@ class Payments(commands.Cog):
             )
             return await ctx.respond(embed=embed, ephemeral=True)
         
-        await self.bot.db.execute(
-            "INSERT OR REPLACE INTO config (key, value, data_type) VALUES (?, ?, ?)",
-            "email_address", email, "str"
-        )
+        await self.bot.db.set_config("email_address", email)
+        await self.bot.push_routing_update()
         
         embed = discord.Embed(
             title="Email Set Up",
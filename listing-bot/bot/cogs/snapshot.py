@@ -0,0 +1,74 @@
+import discord
+from discord.ext import commands
+from bot.bot import Bot
+
+
+class Snapshot(commands.Cog):
+    """Keeps bot.guild_snapshot in step with member, role and channel events."""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+
+    @property
+    def snapshot(self):
+        return self.bot.guild_snapshot
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        if self.snapshot:
+            await self.snapshot.sync_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
+        if self.snapshot and before.name != after.name:
+            self.snapshot.rename_guild(after)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if self.snapshot:
+            self.snapshot.update_member(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if self.snapshot and before.roles != after.roles:
+            self.snapshot.update_member(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if self.snapshot:
+            self.snapshot.update_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if self.snapshot:
+            self.snapshot.update_channel(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if self.snapshot:
+            self.snapshot.remove_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        if self.snapshot:
+            self.snapshot.update_role(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if not self.snapshot:
+            return
+        self.snapshot.update_role(after)
+        # Channel overwrites are stored by role name
+        if before.name != after.name:
+            for channel in after.guild.channels:
+                if after in channel.overwrites:
+                    self.snapshot.update_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        if self.snapshot:
+            self.snapshot.remove_role(role)
+
+
+def setup(bot: Bot):
+    bot.add_cog(Snapshot(bot))
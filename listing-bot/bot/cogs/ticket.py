@@ -2,15 +2,13 @@ import discord
 from discord import SlashCommandGroup, option
 from discord.ext import commands
 
-from chat_exporter.construct.transcript import Transcript
 from bot.bot import Bot
 
 from bot.util.constants import is_authorized_to_use_bot
 from bot.util.listing_objects.ticket import Ticket as TicketObject
 from bot.util.ticket import get_default_overwrites
 from bot.util.paginator import Paginator
-import os
-from bot.util.attachment_handler import CustomHandler
+from bot.util.transcript import save_transcript
 
 
 class Ticket(commands.Cog):
@@ -52,21 +50,7 @@ class Ticket(commands.Cog):
             )
             return await ctx.respond(embed=embed)
 
-        transcript = (
-            await Transcript(
-                channel=ctx.channel,
-                limit=None,
-                messages=None,
-                pytz_timezone="UTC",
-                military_time=True,
-                fancy_times=True,
-                before=None,
-                after=None,
-                support_dev=True,
-                bot=self.bot,
-                attachment_handler=CustomHandler()
-            ).export()
-        ).html
+        await save_transcript(self.bot, ctx.channel, ticket_object.opened_by)
 
         transcript_url = f"https://{await self.bot.get_domain()}/transcript/{self.bot.bot_name}/{ctx.channel.id}-{ticket_object.opened_by}"
 
@@ -78,10 +62,6 @@ class Ticket(commands.Cog):
         transcript_embed.set_footer(text=f"{ctx.channel.name}")
         transcript_embed.add_field(name="Closed By", value=f"{ctx.author.mention}")
         transcript_embed.add_field(name="Opened By", value=f"<@{ticket_object.opened_by}>")
-        os.makedirs("./templates", exist_ok=True)
-
-        with open(f"./templates/{self.bot.bot_name}-{ctx.channel.id}-{ticket_object.opened_by}.html", "wb") as f:
-            f.write(transcript.encode())
 
         button = discord.ui.Button(
             style=discord.ButtonStyle.link,
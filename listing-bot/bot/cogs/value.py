@@ -1,14 +1,16 @@
 import discord
 from discord.ext import commands
 from discord import option, SlashCommandGroup
-import asyncio
+import time
 
 from discord.ui import View, Button
 
-from bot.util.value import old_value, old_lowball
+from bot.util.value import old_value, old_lowball, bulk_valuations
 from bot.util.constants import is_authorized_to_use_bot
 from bot.util.selector import profile_selector
 
+BULK_EDIT_INTERVAL = 2
+
 class MassView(View):
     def __init__(self, embeds: list[discord.Embed], views: list[discord.ui.View]):
         super().__init__()
@@ -18,6 +20,15 @@ class MassView(View):
 
         self.update_buttons()
 
+    def add(self, embed: discord.Embed, view: discord.ui.View):
+        self.embeds.append(embed)
+        self.views.append(view)
+        self.update_buttons()
+
+    def page_embeds(self) -> list[discord.Embed]:
+        start = self.index * 5
+        return self.embeds[start:start + 5]
+
     def update_buttons(self):
 
         self.clear_items()
@@ -110,12 +121,7 @@ class Value(commands.Cog):
     async def lowball_singular(self, ctx: discord.ApplicationContext, username: str, profile: str = None):
         await old_lowball(ctx, self.bot, username, profile)
 
-    @bulk.command(name="lowballs", description="Get the lowball value of MANY accounts.")
-    @option(name="usernames", description="The usernames to check (separate by commas)", type=str, required=False)
-    @option(name="file", description="The file to check (txt file with one username per line)", type=discord.Attachment, required=False)
-    @is_authorized_to_use_bot()
-    async def bulk_lowball(self, ctx: discord.ApplicationContext, usernames: str = None, file: discord.Attachment = None):
-
+    async def run_bulk(self, ctx: discord.ApplicationContext, usernames: str, file: discord.Attachment, lowball: bool):
         if not usernames and not file:
             embed = discord.Embed(
                 title="Input Error",
@@ -138,26 +144,29 @@ class Value(commands.Cog):
             usernames = file_content.decode("utf-8").split("\n")
         else:
             usernames = usernames.split(",")
+        usernames = [username.strip() for username in usernames if username.strip()]
 
-        embeds = []
-        views = []
-
+        view = MassView([], [])
         failed_usernames = []
+        message = await ctx.respond(f"Valuing 0/{len(usernames)} accounts...", ephemeral=True)
+        last_edit = time.monotonic()
 
-        for i, username in enumerate(usernames):
-            embed, view = await old_lowball(ctx, self.bot, username, just_embed=True)
-
+        # Results are shown as they arrive; edits are throttled to stay clear of Discord's rate limits
+        done = 0
+        async for username, embed, account_view in bulk_valuations(self.bot, usernames, lowball=lowball):
+            done += 1
             if embed is None:
                 failed_usernames.append(username)
-                continue
-
-            embeds.append(embed)
-            views.append(view)
+            else:
+                view.add(embed, account_view)
 
-            if i != len(usernames) - 1:
-                await asyncio.sleep(1)
-
-        view = MassView(embeds, views)
+            if done < len(usernames) and time.monotonic() - last_edit >= BULK_EDIT_INTERVAL:
+                await message.edit(
+                    content=f"Valuing {done}/{len(usernames)} accounts...",
+                    embeds=view.page_embeds(),
+                    view=view if view.embeds else None
+                )
+                last_edit = time.monotonic()
 
         if failed_usernames:
             embed = discord.Embed(
@@ -167,67 +176,24 @@ class Value(commands.Cog):
             )
             await ctx.respond(embed=embed)
 
-        await ctx.respond(embeds=embeds[:5], view=view, ephemeral=True)
+        if view.embeds:
+            await message.edit(content=None, embeds=view.page_embeds(), view=view)
+        else:
+            await message.delete()
+
+    @bulk.command(name="lowballs", description="Get the lowball value of MANY accounts.")
+    @option(name="usernames", description="The usernames to check (separate by commas)", type=str, required=False)
+    @option(name="file", description="The file to check (txt file with one username per line)", type=discord.Attachment, required=False)
+    @is_authorized_to_use_bot()
+    async def bulk_lowball(self, ctx: discord.ApplicationContext, usernames: str = None, file: discord.Attachment = None):
+        await self.run_bulk(ctx, usernames, file, lowball=True)
 
     @bulk.command(name="values", description="Get the account value of MANY accounts.")
     @option(name="usernames", description="The usernames to check (separate by commas)", type=str, required=False)
     @option(name="file", description="The file to check (txt file with one username per line)", type=discord.Attachment, required=False)
     @is_authorized_to_use_bot()
     async def bulk_value(self, ctx: discord.ApplicationContext, usernames: str = None, file: discord.Attachment = None):
-
-        if not usernames and not file:
-            embed = discord.Embed(
-                title="Input Error",
-                description="You must provide either usernames or a file.",
-                color=discord.Color.red()
-            )
-            return await ctx.respond(embed=embed, ephemeral=True)
-        if usernames and file:
-            embed = discord.Embed(
-                title="Input Error",
-                description="You must provide either usernames or a file, not both.",
-                color=discord.Color.red()
-            )
-            return await ctx.respond(embed=embed, ephemeral=True)
-        
-        await ctx.defer(ephemeral=True)
-        
-        if file:
-            file_content = await file.read()
-            usernames = file_content.decode("utf-8").split("\n")
-        else:
-            usernames = usernames.split(",")
-
-        embeds = []
-        views = []
-
-        failed_usernames = []
-
-        for i, username in enumerate(usernames):
-            embed, view = await old_value(ctx, self.bot, username, just_embed=True)
-
-            if embed is None:
-                failed_usernames.append(username)
-                continue
-
-            embeds.append(embed)
-            views.append(view)
-
-            if i != len(usernames) - 1:
-                await asyncio.sleep(1)
-
-        view = MassView(embeds, views)
-
-        if failed_usernames:
-            embed = discord.Embed(
-                title="Some Accounts Failed to fetch",
-                description=f"**Failed usernames**: `{'`, `'.join(failed_usernames)}`",
-                color=discord.Color.red()
-            )
-            await ctx.respond(embed=embed)
-
-        if not failed_usernames == usernames:
-            await ctx.respond(embeds=embeds[:5], view=view, ephemeral=True)
+        await self.run_bulk(ctx, usernames, file, lowball=False)
 
 def setup(bot):
     bot.add_cog(Value(bot))
@@ -7,6 +7,7 @@ from discord.ui import View, button
 
 from bot.util.constants import is_customer
 from bot.util.paginator import Paginator
+from bot.util.vouch import store_vouch, vouch_row, VOUCH_COLUMNS
 
 from bot.bot import Bot
 
@@ -252,7 +253,7 @@ class Vouches(commands.Cog):
         else:
             webhook = webhooks[0]
 
-        vouches = await self.bot.db.fetchall("SELECT * FROM vouches")
+        vouches = await self.bot.db.fetchall("SELECT user_id, message, avatar, username FROM vouches")
 
         embed = discord.Embed(
             title="Vouch Restoration in Progress",
@@ -545,23 +546,27 @@ class Vouches(commands.Cog):
         )
         response: discord.WebhookMessage = await ctx.respond(embed=embed, ephemeral=True)
         count = 0
+        pending = []
         async for message in channel.history(limit=None):
             if message.content in vouch_set:
                 continue
             
-            await self.bot.db.execute(
-                "INSERT INTO vouches (user_id, message, avatar, username) VALUES (?, ?, ?, ?)",
+            pending.append(vouch_row(
                 message.author.id,
                 message.content,
                 str(message.author.display_avatar.url),
                 message.author.name
-            )
+            ))
             count += 1
 
             if count % 10 == 0:
+                await self.bot.db.insert_many("vouches", VOUCH_COLUMNS, pending)
+                pending = []
                 embed.description = f"This may take a while. ({count} messages processed)"
                 await response.edit(embed=embed)
 
+        await self.bot.db.insert_many("vouches", VOUCH_COLUMNS, pending)
+
     @remove.command(
         name="match",
         description="Remove vouches that include a text."
@@ -604,7 +609,7 @@ class Vouches(commands.Cog):
         )
         embed.set_thumbnail(url=user.avatar.url if user.avatar else user.default_avatar.url)
 
-        vouches = await self.bot.db.fetchall("SELECT * FROM vouches WHERE message LIKE ?", f"%{user.id}%")
+        vouches = await self.bot.db.fetchall("SELECT user_id, message, avatar, username FROM vouches WHERE message LIKE ?", f"%{user.id}%")
 
         if not vouches:
             embed.description += "\nNo vouches found for this user."
@@ -810,9 +815,8 @@ class Vouches(commands.Cog):
         if amount < 0:
             return await ctx.respond("Amount must be a positive number.", ephemeral=True)
         
-        query = f"INSERT INTO vouches (user_id, message, avatar, username) VALUES (?, ?, ?, ?)"
-        await self.bot.db.execute(
-            query,
+        await store_vouch(
+            self.bot,
             ctx.author.id,
             f"{message} ({user.mention}; {amount}$)",
             str(ctx.author.avatar.url if ctx.author.avatar else ctx.author.default_avatar.url),
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+
+class ResponseCache:
+    """
+    Byte-budgeted LRU of raw response bodies with stale-while-revalidate.
+
+    Entries younger than `ttl` are served as-is. Entries up to `stale_ttl`
+    past that are still served instantly while one background fetch refreshes
+    them. Bodies are kept as bytes, so every reader parses its own copy and
+    no caller can mutate what the next one gets.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60, stale_ttl: float = 300):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[object, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[object, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def _lookup(self, key) -> tuple[bytes | None, float]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, 0
+        stored_at, body = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            self._pop(key)
+            return None, 0
+        self._entries.move_to_end(key)
+        return body, age
+
+    def get(self, key) -> bytes | None:
+        """Return a fresh body, or None if the key is missing or expired."""
+        body, age = self._lookup(key)
+        if body is None or age > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return body
+
+    def put(self, key, body: bytes):
+        self._pop(key)
+        if len(body) > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic(), body)
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def invalidate(self, key):
+        self._pop(key)
+
+    def _refresh(self, key, fetcher: Callable[[], Awaitable[tuple[bytes, bool]]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def run():
+            body, cacheable = await fetcher()
+            if cacheable:
+                self.put(key, body)
+            return body
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def fetch(self, key, fetcher: Callable[[], Awaitable[tuple[bytes, bool]]], fresh: bool = False) -> bytes:
+        """
+        Return the body for `key`, calling `fetcher` on a miss. The fetcher
+        returns (body, cacheable); uncacheable bodies (errors) are passed
+        through to every waiter but not stored. With `fresh`, a cached body
+        is ignored and the call waits for a new fetch, which replaces it.
+        """
+        body, age = (None, 0) if fresh else self._lookup(key)
+        if body is not None:
+            if age <= self.ttl:
+                self.hits += 1
+                return body
+
+            self.stale_hits += 1
+            if key not in self._inflight:
+                self.refreshes += 1
+                task = self._refresh(key, fetcher)
+                task.add_done_callback(_log_refresh_error)
+            return body
+
+        self.misses += 1
+        return await asyncio.shield(self._refresh(key, fetcher))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
+
+
+def _log_refresh_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background cache refresh failed: {task.exception()}")
@@ -1,135 +1,24 @@
+import hashlib
+import marshal
+from collections import OrderedDict
 from typing import Tuple
 
+import numpy as np
+import ujson as json
+
+from .levels import SKILL_MAX_LEVELS, SKILL_XP, catacombs_level, skill_level, skill_levels, slayer_level
+
 def get_cata_lvl(exp):
-    levels = {
-        '0': 0, '1': 50, '2': 125, '3': 235, '4': 395, '5': 625, '6': 955, '7': 1425, '8': 2095, '9': 3045,
-        '10': 4385, '11': 6275, '12': 8940, '13': 12700, '14': 17960, '15': 25340, '16': 35640,
-        '17': 50040, '18': 70040, '19': 97640, '20': 135640, '21': 188140, '22': 259640, '23': 356640,
-        '24': 488640, '25': 668640, '26': 911640, '27': 1239640, '28': 1684640, '29': 2284640,
-        '30': 3084640, '31': 4149640, '32': 5559640, '33': 7459640, '34': 9959640, '35': 13259640,
-        '36': 17559640, '37': 23159640, '38': 30359640, '39': 39559640, '40': 51559640, '41': 66559640,
-        '42': 85559640, '43': 109559640, '44': 139559640, '45': 177559640, '46': 225559640,
-        '47': 285559640, '48': 360559640, '49': 453559640, '50': 569809640
-    }
-    for level in levels:
-        if exp >= levels["50"]:
-            return 50
-        if levels[level] > exp:
-            lowexp = levels[str(int(level) - 1)]
-            highexp = levels[level]
-            difference = highexp - lowexp
-            extra = exp - lowexp
-            percentage = (extra / difference)
-            return (int(level) - 1) + percentage
-
-
-SKILL_MAX_LEVELS = {
-    "mining": {
-        "maxLevel": 60,
-    },
-
-    "foraging": {
-        "maxLevel": 50,
-    },
-
-    "enchanting": {
-        "maxLevel": 60,
-    },
-
-    "farming": {
-        "maxLevel": 60,
-    },
-
-    "combat": {
-        "maxLevel": 60,
-    },
-
-    "fishing": {
-        "maxLevel": 50,
-    },
-
-    "alchemy": {
-        "maxLevel": 50,
-    },
-
-    "taming": {
-        "maxLevel": 50,
-    }
-}
+    return catacombs_level(exp)
 
 
 def get_slayer_level(slayer_type, exp):
-    revenant = {"0": 0, "1": 5, "2": 15, "3": 200, "4": 1000,
-                "5": 5000, "6": 20000, "7": 100000, "8": 400000, "9": 1000000}
-    spider = {"0": 0, "1": 5, "2": 15, "3": 200, "4": 1000,
-              "5": 5000, "6": 20000, "7": 100000, "8": 400000, "9": 1000000}
-    sven = {"0": 0, "1": 10, "2": 30, "3": 250, "4": 1500, "5": 5000,
-            "6": 20000, "7": 100000, "8": 400000, "9": 1000000}
-    enderman = {"0": 0, "1": 10, "2": 30, "3": 250, "4": 1500,
-                "5": 5000, "6": 20000, "7": 100000, "8": 400000, "9": 1000000}
-    blaze = {"0": 0, "1": 10, "2": 30, "3": 250, "4": 1500,
-             "5": 5000, "6": 20000, "7": 100000, "8": 400000, "9": 1000000}
-
-    if slayer_type in ["revenant", "zombie"]:
-        levels = revenant
-    elif slayer_type in ["spider", "tarantula"]:
-        levels = spider
-    elif slayer_type in ["sven", "wolf"]:
-        levels = sven
-    elif slayer_type in ["enderman", "voidgloom"]:
-        levels = enderman
-    elif slayer_type in ["blaze", "demonlord"]:
-        levels = blaze
-
-    for level in levels:
-        if exp >= levels["9"]:
-            return 9
-        if levels.get(level) > exp:
-            lowexp = levels[str(int(level) - 1)]
-            highexp = levels.get(level)
-            difference = highexp - lowexp
-            extra = exp - lowexp
-            percentage = (extra / difference)
-            return (int(level) - 1) + percentage
-
-
-skill_levels = {
-    "0": 0, "1": 50, "2": 175, "3": 375, "4": 675, "5": 1175, "6": 1925, "7": 2925, "8": 4425, "9": 6425,
-    "10": 9925, "11": 14925, "12": 22425, "13": 32425, "14": 47425, "15": 67425, "16": 97425, "17": 147425,
-    "18": 222425, "19": 322425, "20": 522425, "21": 822425, "22": 1222425, "23": 1722425, "24": 2322425,
-    "25": 3022425, "26": 3822425, "27": 4722425, "28": 5722425, "29": 6822425, "30": 8022425, "31": 9322425,
-    "32": 10722425, "33": 12222425, "34": 13822425, "35": 15522425, "36": 17322425, "37": 19222425,
-    "38": 21222425, "39": 23322425, "40": 25522425, "41": 27822425, "42": 30222425, "43": 32722425,
-    "44": 35322425, "45": 38072425, "46": 40972425, "47": 44072425, "48": 47472425, "49": 51172425,
-    "50": 55172425, "51": 59472425, "52": 64072425, "53": 68972425, "54": 74172425, "55": 79672425,
-    "56": 85472425, "57": 91572425, "58": 97972425, "59": 104672425, "60": 111672425
-
-}
+    return slayer_level(slayer_type, exp)
 
 
 def get_skill_lvl(skill_type, exp):
-    levels = {
-        "0": 0, "1": 50, "2": 175, "3": 375, "4": 675, "5": 1175, "6": 1925, "7": 2925, "8": 4425, "9": 6425,
-        "10": 9925, "11": 14925, "12": 22425, "13": 32425, "14": 47425, "15": 67425, "16": 97425, "17": 147425,
-        "18": 222425, "19": 322425, "20": 522425, "21": 822425, "22": 1222425, "23": 1722425, "24": 2322425,
-        "25": 3022425, "26": 3822425, "27": 4722425, "28": 5722425, "29": 6822425, "30": 8022425, "31": 9322425,
-        "32": 10722425, "33": 12222425, "34": 13822425, "35": 15522425, "36": 17322425, "37": 19222425,
-        "38": 21222425, "39": 23322425, "40": 25522425, "41": 27822425, "42": 30222425, "43": 32722425,
-        "44": 35322425, "45": 38072425, "46": 40972425, "47": 44072425, "48": 47472425, "49": 51172425,
-        "50": 55172425, "51": 59472425, "52": 64072425, "53": 68972425, "54": 74172425, "55": 79672425,
-        "56": 85472425, "57": 91572425, "58": 97972425, "59": 104672425, "60": 111672425
-    }
-    for level in levels:
-        if exp >= levels[str(SKILL_MAX_LEVELS[skill_type]["maxLevel"])]:
-            return SKILL_MAX_LEVELS[skill_type]["maxLevel"]
-        if levels[level] > exp:
-            lowexp = levels[str(int(level) - 1)]
-            highexp = levels[level]
-            difference = highexp - lowexp
-            extra = exp - lowexp
-            percentage = (extra / difference)
-            return (int(level) - 1) + percentage
-        
+    return skill_level(skill_type, exp)
+
 
 def catacombs_to_usd(data: dict) -> Tuple[float, float]:
     dungeon_data = data.get("dungeons", {})
@@ -281,62 +170,67 @@ def slayer_to_usd(data: dict) -> Tuple[float, float]:
     
     return total_value, total_value / 1.8
 
-def networth_to_usd(data: dict) -> Tuple[float, float]:
-    coin_multiplier = 4e-8
-
-    def process_item(item: dict) -> float:
-        soulbound = item.get("soulbound", False)
+COIN_MULTIPLIER = 4e-8
 
-        cosmetic = item.get("cosmetic", False)
-        value = item.get("price", 0.0)
-        calculation = item.get("calculation", [])
 
-        def calc_multiplier(value: float) -> float:
-            if value < 1e7:
-                return 0.5
-                
-            if value >= 1e10:
-                return 0.9
+def _networth_items(data: dict) -> list[dict]:
+    item_types = data.get("networth", {}).get("types", {})
+    return [
+        item
+        for item_type_data in item_types.values()
+        for item in item_type_data.get("items", [])
+        if isinstance(item, dict)
+    ]
 
-            t = (value - 1e7) / (1e10 - 1e7)
-            return 0.5 + (0.9 - 0.5) * (t**0.9)
+def _liquid_usd(data: dict) -> float:
+    networth_data = data.get("networth", {})
+    liquid_networth = networth_data.get("purse", 0) + networth_data.get("bank", 0) + networth_data.get("personalBank", 0)
+    return liquid_networth * COIN_MULTIPLIER
 
-        multiplier = calc_multiplier(value)
-        if soulbound:
-            multiplier *= 0.65
+def _items_usd(items: list[dict]) -> np.ndarray:
+    """USD value of each item, computed over the whole list as arrays."""
+    price = np.array([item.get("price", 0.0) for item in items], dtype=np.float64)
+    soulbound = np.array([bool(item.get("soulbound", False)) for item in items], dtype=bool)
+    cosmetic = np.array([bool(item.get("cosmetic", False)) for item in items], dtype=bool)
+    calculated = np.array([bool(item.get("calculation", [])) for item in items], dtype=bool)
 
-        item_usd_value = value * multiplier * coin_multiplier
-        
-        if cosmetic and item_usd_value > 0 and calculation:
-            cosmetic_deduction = (item_usd_value / 1e6) * 0.01
-            item_usd_value = max(0, item_usd_value - cosmetic_deduction)
+    # 0.5 below 10m coins, 0.9 from 10b, curving between the two
+    t = np.clip((price - 1e7) / (1e10 - 1e7), 0.0, 1.0)
+    multiplier = np.where(price < 1e7, 0.5, np.where(price >= 1e10, 0.9, 0.5 + (0.9 - 0.5) * t ** 0.9))
+    multiplier = np.where(soulbound, multiplier * 0.65, multiplier)
 
-        elif cosmetic and item_usd_value > 0:
-            cosmetic_deduction = (item_usd_value / 1e6) * 0.03
-            item_usd_value = max(0, item_usd_value - cosmetic_deduction)
+    usd = price * multiplier * COIN_MULTIPLIER
 
-        return item_usd_value
+    deducted = cosmetic & (usd > 0)
+    deduction = (usd / 1e6) * np.where(calculated, 0.01, 0.03)
+    return np.where(deducted, np.maximum(0.0, usd - deduction), usd)
 
-    total_value = 0
-
-    networth_data = data.get("networth", {})
+def networth_to_usd(data: dict) -> Tuple[float, float]:
+    total_value = _liquid_usd(data)
 
-    liquid_networth = networth_data.get("purse", 0) + networth_data.get("bank", 0) + networth_data.get("personalBank", 0)
-    total_value += liquid_networth * coin_multiplier
+    items = _networth_items(data)
+    if items:
+        total_value += float(_items_usd(items).sum())
 
-    item_types = networth_data.get("types", {})
-    for item_type in item_types:
-        item_type_data = item_types[item_type]
-        items = item_type_data.get("items", [])
-        for item in items:
-            if isinstance(item, dict):
-                value = process_item(item)
-                total_value += value
-    
     lowball_value = max(0, total_value / 1.8)
 
     return total_value, lowball_value
 
+def networth_to_usd_many(profiles: list[dict]) -> list[Tuple[float, float]]:
+    """networth_to_usd for many profiles, valuing all of their items in one array pass."""
+    items = []
+    owners = []
+    for index, data in enumerate(profiles):
+        profile_items = _networth_items(data)
+        items.extend(profile_items)
+        owners.extend([index] * len(profile_items))
+
+    totals = np.array([_liquid_usd(data) for data in profiles], dtype=np.float64)
+    if items:
+        totals += np.bincount(owners, weights=_items_usd(items), minlength=len(profiles))
+
+    return [(total_value, max(0, total_value / 1.8)) for total_value in totals.tolist()]
+
 def skills_to_usd(data: dict) -> Tuple[float, float]:
     skills_data: dict = data.get("skills", {})
     if not skills_data:
@@ -358,8 +252,14 @@ def skills_to_usd(data: dict) -> Tuple[float, float]:
     
     def get_max_xp(skill):
         max_level = SKILL_MAX_LEVELS.get(skill, {}).get("maxLevel", 50)
-        return int(skill_levels[str(max_level)])
+        return SKILL_XP[max_level]
     
+    levels = skill_levels({
+        skill: skill_info.get("xp", 0)
+        for skill, skill_info in skills_data.items()
+        if skill in conversion_rates and skill_info.get("xp", 0)
+    })
+
     for skill, skill_info in skills_data.items():
         if skill not in conversion_rates:
             continue
@@ -375,7 +275,7 @@ def skills_to_usd(data: dict) -> Tuple[float, float]:
         value = capped_xp * rate
         
         skill_values[skill] = {
-            'level': get_skill_lvl(skill, xp),
+            'level': levels[skill],
             'value': round(value, 2)
         }
         
@@ -472,27 +372,58 @@ def crimson_to_usd(data: dict) -> Tuple[float, float]:
 
     return total_value, total_value / 1.8
 
+VALUATIONS = (
+    ("catacombs", catacombs_to_usd),
+    ("slayer", slayer_to_usd),
+    ("networth", networth_to_usd),
+    ("skills", skills_to_usd),
+    ("mining", mining_to_usd),
+    ("farming", farming_to_usd),
+    ("crimson", crimson_to_usd)
+)
+
+# The parts of a profile document the valuation reads, hashed to key the memo
+VALUATION_SECTIONS = ("dungeons", "slayer", "networth", "skills", "mining", "farming", "crimson")
+VALUATION_MEMO_SIZE = 256
+
+_valuation_memo: OrderedDict[tuple, tuple[dict, dict]] = OrderedDict()
+
+
+def _valuation_key(data: dict) -> tuple:
+    sections = [data.get(section) for section in VALUATION_SECTIONS]
+    try:
+        # marshal is several times faster than json.dumps on float-heavy networth items
+        serialized = marshal.dumps(sections)
+    except ValueError:
+        serialized = json.dumps(sections).encode()
+    digest = hashlib.blake2b(serialized, digest_size=16).digest()
+    return data.get("uuid"), data.get("name"), digest
+
+def gather_values(data: dict) -> Tuple[dict, dict]:
+    """
+    Standard and lowball values of a profile in one pass over the calculators.
+    Results are memoized by profile contents, so valuing the same document
+    again (toggling, re-listing, value then lowball) is a dictionary lookup.
+    """
+    key = _valuation_key(data)
+    cached = _valuation_memo.get(key)
+    if cached is None:
+        value, lowball = {}, {}
+        for name, calculator in VALUATIONS:
+            value[name], lowball[name] = calculator(data)
+        cached = _valuation_memo[key] = (value, lowball)
+        if len(_valuation_memo) > VALUATION_MEMO_SIZE:
+            _valuation_memo.popitem(last=False)
+    else:
+        _valuation_memo.move_to_end(key)
+
+    return dict(cached[0]), dict(cached[1])
+
 def gather_lowball_value(data: dict) -> dict:
-    return {
-        "catacombs": catacombs_to_usd(data)[1],
-        "slayer": slayer_to_usd(data)[1],
-        "networth": networth_to_usd(data)[1],
-        "skills": skills_to_usd(data)[1],
-        "mining": mining_to_usd(data)[1],
-        "farming": farming_to_usd(data)[1],
-        "crimson": crimson_to_usd(data)[1]
-    }
+    return gather_values(data)[1]
 
 def gather_value(data: dict) -> dict:
-    return {
-        "catacombs": catacombs_to_usd(data)[0],
-        "slayer": slayer_to_usd(data)[0],
-        "networth": networth_to_usd(data)[0],
-        "skills": skills_to_usd(data)[0],
-        "mining": mining_to_usd(data)[0],
-        "farming": farming_to_usd(data)[0],
-        "crimson": crimson_to_usd(data)[0]
-    }
+    return gather_values(data)[0]
 
 async def calculate_coin_price(type: str, bot, amount: int):
     base_key = f"coin_price_{type}"
@@ -502,11 +433,12 @@ async def calculate_coin_price(type: str, bot, amount: int):
     
     base_price = float(base_price_value)
     
+    tier_configs = await bot.db.get_configs(prefix=f"{type}_coins_tier_")
+
     dynamic_tiers = []
     tier_number = 1
     while True:
-        tier_key = f"{type}_coins_tier_{tier_number}"
-        tier_value = await bot.db.get_config(tier_key)
+        tier_value = tier_configs.get(f"{type}_coins_tier_{tier_number}")
         if tier_value is None:
             break
         parts = tier_value.split(';')
@@ -1,7 +1,6 @@
 import json
 import os
 import discord
-import aiohttp
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -156,6 +155,10 @@ config_options = {
         "description": "Main guild ID for the bot",
         "type": int,
     },
+    "listing_refresh_interval": {
+        "description": "Minutes between automatic refreshes of all listings (0 to disable)",
+        "type": int,
+    },
     "owner_id": {
         "description": "Bot owner ID",
         "type": int,
@@ -292,36 +295,33 @@ def is_authorized_to_use_bot(strict=False):
         if strict:
             return ctx.author.id in ctx.bot.owner_ids
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"http://{BOT_SERVICE_HOST}:{port}/seller?user_id={ctx.author.id}&api_key=ae75e9b7-9f08-4da5-b99b-18b90c4ac7bc") as resp:
-                data: dict = await resp.json()
-                if data.get("response"):
-                    return True
-                
-                return False
+        async with ctx.bot.http_client.get(f"http://{BOT_SERVICE_HOST}:{port}/seller?user_id={ctx.author.id}&api_key=ae75e9b7-9f08-4da5-b99b-18b90c4ac7bc") as resp:
+            data: dict = await resp.json()
+            if data.get("response"):
+                return True
+            
+            return False
         return True
 
     return commands.check(predicate)
 
 async def is_seller(user_id: int):
     async def predicate(ctx: discord.ApplicationContext):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"http://{BOT_SERVICE_HOST}:{port}/seller?user_id={user_id}&api_key=ae75e9b7-9f08-4da5-b99b-18b90c4ac7bc") as resp:
-                data: dict = await resp.json()
-                if data.get("response"):
-                    return True
-                
-                return False
+        async with ctx.bot.http_client.get(f"http://{BOT_SERVICE_HOST}:{port}/seller?user_id={user_id}&api_key=ae75e9b7-9f08-4da5-b99b-18b90c4ac7bc") as resp:
+            data: dict = await resp.json()
+            if data.get("response"):
+                return True
+            
+            return False
         return False
 
 def is_customer():
     async def predicate(ctx: discord.ApplicationContext):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"http://{BOT_SERVICE_HOST}:{port}/customer?user_id={ctx.author.id}&api_key=ae75e9b7-9f08-4da5-b99b-18b90c4ac7bc") as resp:
-                data: dict = await resp.json()
-                if data.get("response"):
-                    return True
-                return False
+        async with ctx.bot.http_client.get(f"http://{BOT_SERVICE_HOST}:{port}/customer?user_id={ctx.author.id}&api_key=ae75e9b7-9f08-4da5-b99b-18b90c4ac7bc") as resp:
+            data: dict = await resp.json()
+            if data.get("response"):
+                return True
+            return False
         return True
     return commands.check(predicate)
 
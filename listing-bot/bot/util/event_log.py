@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import time
+
+import discord
+
+LOGGING_SETTINGS_PATH = "data/logging.json"
+
+# How often the settings file is stat'ed for edits made outside the bot
+RELOAD_CHECK_INTERVAL = 2.0
+
+# Discord's limits for one message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+class LoggingSettings:
+    """
+    In-memory copy of data/logging.json. Lookups never touch the disk; the
+    file is only re-read when its mtime changes, and writes replace it
+    atomically from a worker thread.
+    """
+
+    def __init__(self, defaults: dict, path: str = LOGGING_SETTINGS_PATH):
+        self.defaults = defaults
+        self.path = path
+        self.settings: dict = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._write_lock = asyncio.Lock()
+
+    def load(self, initial: dict = None):
+        """Read the file, creating it with `initial` if it doesn't exist."""
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._write(initial if initial is not None else {})
+        self._reload()
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            self.settings, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r") as f:
+                self.settings = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return  # Keep the last good copy if the file is mid-edit
+        self._mtime = mtime
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at >= RELOAD_CHECK_INTERVAL:
+            self._checked_at = now
+            self._reload()
+
+    def _write(self, settings: dict):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(settings, f, indent=4)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def is_enabled(self, guild_id, event_type: str) -> bool:
+        self._maybe_reload()
+        guild_settings = self.settings.get(str(guild_id))
+        if not guild_settings:
+            return False
+        return guild_settings.get(event_type, False)
+
+    def guild(self, guild_id) -> dict:
+        """The guild's settings with every default filled in."""
+        self._maybe_reload()
+        return {**self.defaults, **self.settings.get(str(guild_id), {})}
+
+    async def set(self, guild_id, event_type: str, enabled: bool):
+        async with self._write_lock:
+            self._reload()
+            guild_settings = self.guild(guild_id)
+            guild_settings[event_type] = enabled
+            settings = {**self.settings, str(guild_id): guild_settings}
+            await asyncio.to_thread(self._write, settings)
+            self.settings = settings
+
+
+class LogDispatcher:
+    """
+    Batches log embeds per channel. The first embed of a burst starts a short
+    timer; everything queued by then goes out as messages of up to 10 embeds
+    instead of one message per event.
+    """
+
+    def __init__(self, delay: float = 1.5):
+        self.delay = delay
+        self._queues: dict[int, tuple[discord.TextChannel, list[discord.Embed]]] = {}
+        self._timers: dict[int, asyncio.Task] = {}
+        self.embeds_sent = 0
+        self.messages_sent = 0
+
+    def send(self, channel: discord.TextChannel, embed: discord.Embed):
+        queued = self._queues.get(channel.id)
+        if queued is None:
+            queued = self._queues[channel.id] = (channel, [])
+        queued[1].append(embed)
+
+        if channel.id not in self._timers:
+            self._timers[channel.id] = asyncio.create_task(self._flush_later(channel.id))
+
+    async def _flush_later(self, channel_id: int):
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._timers.pop(channel_id, None)
+        await self._flush(channel_id)
+
+    @staticmethod
+    def _batches(embeds: list[discord.Embed]):
+        batch, size = [], 0
+        for embed in embeds:
+            embed_size = len(embed)
+            if batch and (len(batch) == MAX_EMBEDS_PER_MESSAGE or size + embed_size > MAX_EMBED_CHARS_PER_MESSAGE):
+                yield batch
+                batch, size = [], 0
+            batch.append(embed)
+            size += embed_size
+        if batch:
+            yield batch
+
+    async def _flush(self, channel_id: int):
+        queued = self._queues.pop(channel_id, None)
+        if queued is None:
+            return
+        channel, embeds = queued
+
+        for batch in self._batches(embeds):
+            try:
+                await channel.send(embeds=batch)
+                self.embeds_sent += len(batch)
+                self.messages_sent += 1
+            except discord.Forbidden:
+                print(f"Missing permissions to send log message in {channel.name} ({channel.id})")
+                return
+            except discord.HTTPException as e:
+                print(f"Failed to send log message: {e}")
+
+    async def close(self):
+        """Send everything still queued, used when the cog unloads."""
+        for timer in list(self._timers.values()):
+            timer.cancel()
+        self._timers.clear()
+        for channel_id in list(self._queues):
+            await self._flush(channel_id)
@@ -2,9 +2,10 @@ from typing import Tuple, Dict
 from .errors import ApiError, MojangError
 from discord import Webhook
 from .constants import api_key
-import aiohttp
-import requests
+from .mojang import mojang_resolver
+from .http import HttpClient
 import os
+import ujson as json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,24 +29,8 @@ def handle_selection(selection):
     return selection.strip()
 
 
-async def fetch_mojang_api(session: aiohttp.ClientSession, username):
-    async def fetch_data(url):
-        async with session.get(url) as response:
-            try:
-                return await response.json(), response.status
-            except:
-                return {}, response.status
-
-    url = f"https://mowojang.matdoes.dev/{username.replace('-', '')}"
-    data, status = await fetch_data(url)
-    if status == 200:
-        return {
-            "name": data.get("name", "Invalid Username."),
-            "id": data.get("id", "Invalid Username.").replace("-", ""),
-        }, status
-
-    # If Mojang API request fails, return error
-    return {"id": "Invalid username.", "name": "Invalid username."}, status
+async def fetch_mojang_api(http: HttpClient, username):
+    return await mojang_resolver.resolve(http, username)
 
 def validate_uuid(uuid: str) -> bool:
     # should handle both with and without hyphens
@@ -58,7 +43,7 @@ def validate_uuid(uuid: str) -> bool:
     except ValueError:
         return False
     
-async def fetch_profile_data(session, uuid, bot, profile=None, allow_error_handler=True) -> Tuple[Dict, str]:
+async def fetch_profile_data(uuid, bot, profile=None, allow_error_handler=True, fresh=False) -> Tuple[Dict, str]:
 
     if not validate_uuid(uuid) and len(uuid) > 16:
         if allow_error_handler:
@@ -71,7 +56,7 @@ async def fetch_profile_data(session, uuid, bot, profile=None, allow_error_handl
         profile = profile.strip()
     
     if not len(uuid) > 16:
-        mojang_data = await fetch_mojang_api(session, uuid)
+        mojang_data = await fetch_mojang_api(bot.http_client, uuid)
         if mojang_data[1] != 200:
             if allow_error_handler:
                 raise MojangError("Invalid UUID or Username")
@@ -79,15 +64,25 @@ async def fetch_profile_data(session, uuid, bot, profile=None, allow_error_handl
                 return None, None
         uuid = mojang_data[0]["id"]
 
-    try:
-        await session.post(f"http://{PARENT_API_HOST}:{PARENT_API_PORT}/live/data-fetch", json={"uuid": uuid})
-    except Exception as e:
-        pass
+    selection = handle_selection(profile) or ''
+    url = f"http://{SKYBLOCK_API_HOST}:{SKYBLOCK_API_PORT}/v1/{word}/{uuid}/{selection}?key=API_KEY"
 
-    url = f"http://{SKYBLOCK_API_HOST}:{SKYBLOCK_API_PORT}/v1/{word}/{uuid}/{handle_selection(profile) or ''}?key=API_KEY"
-    async with session.get(url) as resp:
-        profile_data = await resp.json()
-        data = profile_data.get("data", {})
+    async def fetch_body():
+        try:
+            async with bot.http_client.post(f"http://{PARENT_API_HOST}:{PARENT_API_PORT}/live/data-fetch", json={"uuid": uuid}):
+                pass
+        except Exception as e:
+            pass
+
+        async with bot.http_client.get(url) as resp:
+            body = await resp.read()
+        # Only successful documents are cached, errors are retried on the next call
+        return body, json.loads(body).get("status") == 200
+
+    # fresh skips the cache for callers that must show current data, like a listing refresh
+    body = await bot.profile_cache.fetch((uuid.lower(), selection), fetch_body, fresh=fresh)
+    profile_data = json.loads(body)
+    data = profile_data.get("data", {})
 
     if profile_data.get("status") != 200:
         if allow_error_handler:
@@ -98,38 +93,32 @@ async def fetch_profile_data(session, uuid, bot, profile=None, allow_error_handl
     return data, data.get("name")
 
 async def fetch_raw_hypixel_stats(self, uuid):
-    async with aiohttp.ClientSession() as session:
-        cached_data = self.bot.get_cached_data(f"player:{uuid}")
-        if cached_data:
-            data = cached_data
-        else:
-            # Log the data fetch to the new endpoint with just the UUID
-            try:
-                await session.post(f"http://{PARENT_API_HOST}:{PARENT_API_PORT}/live/data-fetch", json={"uuid": uuid})
-            except Exception as e:
-                pass
-                
-            url = f"https://api.hypixel.net/v2/player?key={api_key}&uuid="+uuid
-            async with session.get(url) as r:
-                data: dict = await r.json()
-                self.bot.cache_data(f"player:{uuid}", data)
+    cached_data = self.bot.get_cached_data(f"player:{uuid}")
+    if cached_data:
+        return cached_data
+
+    # Log the data fetch to the new endpoint with just the UUID
+    try:
+        async with self.bot.http_client.post(f"http://{PARENT_API_HOST}:{PARENT_API_PORT}/live/data-fetch", json={"uuid": uuid}):
+            pass
+    except Exception as e:
+        pass
+
+    url = f"https://api.hypixel.net/v2/player?key={api_key}&uuid="+uuid
+    async with self.bot.http_client.get(url) as r:
+        data: dict = await r.json()
+        self.bot.cache_data(f"player:{uuid}", data)
 
     return data
 
 class MojangObject:
-    def __init__(self, _input):
-        try:
-            if len(_input) > 16:
-                url = f"https://sessionserver.mojang.com/session/minecraft/profile/{_input.replace('-', '')}"
-            else:
-                url = f"https://api.mojang.com/users/profiles/minecraft/{_input}"
-
-            api = requests.get(url)
-            data = api.json()
-            if api.status_code == 200:
-                self.name = data.get("name", "Invalid Username.")
-                self.uuid = data.get("id", "Invalid Username.").replace("-", "")
-            else:
-                raise MojangError("Invalid UUID or Username")
-        except:
-            raise MojangError("Invalid UUID or Username")
\ No newline at end of file
+    def __init__(self, name: str, uuid: str):
+        self.name = name
+        self.uuid = uuid
+
+    @classmethod
+    async def resolve(cls, http: HttpClient, _input: str) -> "MojangObject":
+        data, status = await mojang_resolver.resolve(http, _input)
+        if status != 200:
+            raise MojangError("Invalid UUID or Username")
+        return cls(data["name"], data["id"])
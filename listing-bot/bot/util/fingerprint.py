@@ -1,7 +1,21 @@
+import asyncio
 import ujson as json
 import logging
 from typing import Dict, List, Tuple, Optional
 
+# Weight different components by importance (canvas removed to save storage)
+SIMILARITY_WEIGHTS = {
+    'hardware': 0.30,  # hardware_concurrency, device_memory, screen resolution (increased from 0.25)
+    'canvas': 0.00,    # canvas fingerprints (disabled to save storage)
+    'webgl': 0.25,     # webgl vendor/renderer info (increased from 0.15)
+    'system': 0.15,    # platform, user_agent patterns (increased from 0.10)
+    'audio': 0.12,     # audio fingerprint (increased from 0.10)
+    'languages': 0.08, # language preferences
+    'fonts': 0.05,     # available fonts
+    'plugins': 0.04,   # browser plugins
+    'network': 0.01    # network characteristics (decreased from 0.03)
+}
+
 async def save_browser_fingerprint(bot, user_id: int, fingerprint_data: str) -> bool:
     """
     Save browser fingerprint data to the database using normalized tables.
@@ -43,19 +57,29 @@ async def save_browser_fingerprint(bot, user_id: int, fingerprint_data: str) ->
             logging.error(f"Data content sample: {str(data)[:200]}...")
             return False
         
-        await _delete_existing_fingerprint(bot, user_id)
-        
-        await _save_main_fingerprint(bot, user_id, data)
-        
-        await _save_fingerprint_languages(bot, user_id, data.get("languages", []))
-        await _save_fingerprint_fonts(bot, user_id, data.get("fonts", []))
-        await _save_fingerprint_plugins(bot, user_id, data.get("plugins", []))
-        await _save_fingerprint_webgl_extensions(bot, user_id, data.get("webgl", {}).get("extensions", []))
-        await _save_fingerprint_storage(bot, user_id, data.get("storage", {}))
-        await _save_fingerprint_protocols(bot, user_id, data.get("protocols", []))
-        
-        await _save_fingerprint_storage(bot, user_id, data.get("storage", {}))
-        await _save_fingerprint_protocols(bot, user_id, data.get("protocols", []))
+        # One transaction per fingerprint: a single commit instead of one per row
+        async with bot.db.transaction():
+            await _delete_existing_fingerprint(bot, user_id)
+            
+            fields = await _save_main_fingerprint(bot, user_id, data)
+            
+            await _save_fingerprint_languages(bot, user_id, data.get("languages", []))
+            await _save_fingerprint_fonts(bot, user_id, data.get("fonts", []))
+            await _save_fingerprint_plugins(bot, user_id, data.get("plugins", []))
+            await _save_fingerprint_webgl_extensions(bot, user_id, data.get("webgl", {}).get("extensions", []))
+            await _save_fingerprint_storage(bot, user_id, data.get("storage", {}))
+            await _save_fingerprint_protocols(bot, user_id, data.get("protocols", []))
+        
+        index = getattr(bot, "fingerprint_index", None)
+        if index is not None:
+            # Queued by the index if it is still loading
+            index.upsert(
+                user_id,
+                fields,
+                [lang for lang in data.get("languages", []) if lang],
+                [font for font in data.get("fonts", []) if font],
+                [plugin.get("name", "") for plugin in data.get("plugins", []) if isinstance(plugin, dict)]
+            )
         
         logging.info(f"Browser fingerprint saved for user {user_id}")
         return True
@@ -81,8 +105,8 @@ async def _delete_existing_fingerprint(bot, user_id: int):
     for table in tables:
         await bot.db.execute(f"DELETE FROM {table} WHERE user_id = ?", user_id)
 
-async def _save_main_fingerprint(bot, user_id: int, data: dict):
-    """Save main fingerprint data to browser_fingerprints table."""
+async def _save_main_fingerprint(bot, user_id: int, data: dict) -> dict:
+    """Save main fingerprint data to browser_fingerprints table and return the stored columns."""
     user_agent = data.get("userAgent", "")
     language = data.get("language", "")
     platform = data.get("platform", "")
@@ -150,63 +174,66 @@ async def _save_main_fingerprint(bot, user_id: int, data: dict):
         audio_fingerprint, network_downlink, network_effective_type, timestamp
     )
 
+    return {
+        "user_id": user_id,
+        "user_agent": user_agent,
+        "platform": platform,
+        "hardware_concurrency": hardware_concurrency,
+        "device_memory": device_memory,
+        "screen_width": screen_width,
+        "screen_height": screen_height,
+        "screen_color_depth": screen_color_depth,
+        "webgl_unmasked_vendor": webgl_unmasked_vendor,
+        "webgl_unmasked_renderer": webgl_unmasked_renderer,
+        "audio_fingerprint": audio_fingerprint,
+        "network_downlink": network_downlink,
+        "network_effective_type": network_effective_type
+    }
+
 async def _save_fingerprint_languages(bot, user_id: int, languages: list):
     """Save languages to normalized table."""
-    for lang in languages:
-        if lang:  # Skip empty strings
-            await bot.db.execute(
-                "INSERT INTO fingerprint_languages (user_id, language) VALUES (?, ?)",
-                user_id, lang
-            )
+    await bot.db.insert_many(
+        "fingerprint_languages", ("user_id", "language"),
+        [(user_id, lang) for lang in languages if lang]  # Skip empty strings
+    )
 
 async def _save_fingerprint_fonts(bot, user_id: int, fonts: list):
     """Save fonts to normalized table."""
-    for font in fonts:
-        if font:  # Skip empty strings
-            await bot.db.execute(
-                "INSERT INTO fingerprint_fonts (user_id, font_name) VALUES (?, ?)",
-                user_id, font
-            )
+    await bot.db.insert_many(
+        "fingerprint_fonts", ("user_id", "font_name"),
+        [(user_id, font) for font in fonts if font]  # Skip empty strings
+    )
 
 async def _save_fingerprint_plugins(bot, user_id: int, plugins: list):
     """Save plugins to normalized table."""
-    for plugin in plugins:
-        if isinstance(plugin, dict):
-            name = plugin.get("name", "")
-            filename = plugin.get("filename", "")
-            description = plugin.get("description", "")
-            
-            await bot.db.execute("""
-                INSERT INTO fingerprint_plugins (user_id, plugin_name, plugin_filename, plugin_description) 
-                VALUES (?, ?, ?, ?)
-            """, user_id, name, filename, description)
+    await bot.db.insert_many(
+        "fingerprint_plugins", ("user_id", "plugin_name", "plugin_filename", "plugin_description"),
+        [
+            (user_id, plugin.get("name", ""), plugin.get("filename", ""), plugin.get("description", ""))
+            for plugin in plugins if isinstance(plugin, dict)
+        ]
+    )
 
 async def _save_fingerprint_webgl_extensions(bot, user_id: int, extensions: list):
     """Save WebGL extensions to normalized table."""
-    for ext in extensions:
-        if ext:  # Skip empty strings
-            await bot.db.execute(
-                "INSERT INTO fingerprint_webgl_extensions (user_id, extension_name) VALUES (?, ?)",
-                user_id, ext
-            )
+    await bot.db.insert_many(
+        "fingerprint_webgl_extensions", ("user_id", "extension_name"),
+        [(user_id, ext) for ext in extensions if ext]  # Skip empty strings
+    )
 
 async def _save_fingerprint_storage(bot, user_id: int, storage: dict):
     """Save storage support to normalized table."""
-    for storage_type, supported in storage.items():
-        supported_int = 1 if supported else 0
-        await bot.db.execute("""
-            INSERT INTO fingerprint_storage (user_id, storage_type, supported) 
-            VALUES (?, ?, ?)
-        """, user_id, storage_type, supported_int)
+    await bot.db.insert_many(
+        "fingerprint_storage", ("user_id", "storage_type", "supported"),
+        [(user_id, storage_type, 1 if supported else 0) for storage_type, supported in storage.items()]
+    )
 
 async def _save_fingerprint_protocols(bot, user_id: int, protocols: list):
     """Save protocols to normalized table."""
-    for protocol in protocols:
-        if protocol:  # Skip empty strings
-            await bot.db.execute(
-                "INSERT INTO fingerprint_protocols (user_id, protocol) VALUES (?, ?)",
-                user_id, protocol
-            )
+    await bot.db.insert_many(
+        "fingerprint_protocols", ("user_id", "protocol"),
+        [(user_id, protocol) for protocol in protocols if protocol]  # Skip empty strings
+    )
 
 async def detect_alternate_accounts(bot, user_id: int) -> List[Tuple[int, float]]:
     """
@@ -220,6 +247,11 @@ async def detect_alternate_accounts(bot, user_id: int) -> List[Tuple[int, float]
         List of tuples containing (suspected_user_id, similarity_probability)
     """
     try:
+        index = getattr(bot, "fingerprint_index", None)
+        if index is not None and index.loaded:
+            # Only users sharing an LSH bucket get fully scored
+            return index.find_suspects(user_id, threshold=0.85)
+
         # Get the current user's fingerprint
         current_fingerprint = await bot.db.fetchone(
             "SELECT * FROM browser_fingerprints WHERE user_id = ?", user_id
@@ -254,6 +286,39 @@ async def detect_alternate_accounts(bot, user_id: int) -> List[Tuple[int, float]
         logging.error(f"Error detecting alternate accounts for user {user_id}: {e}")
         return []
 
+async def rescan_alternate_accounts(bot, threshold: float = 0.85) -> List[Tuple[int, int, float]]:
+    """
+    Rebuild the full alt suspect graph for every stored fingerprint and persist it.
+
+    Intended for periodic runs (e.g. after a weight change). Uses the LSH
+    blocking of the fingerprint index, so it runs in near-linear time.
+
+    Args:
+        bot: Bot instance with database connection and loaded fingerprint index
+        threshold: Minimum similarity for an edge
+
+    Returns:
+        List of (user_id, suspected_user_id, similarity) edges
+    """
+    index = getattr(bot, "fingerprint_index", None)
+    if index is None or not index.loaded:
+        return []
+
+    try:
+        # Scored in a worker on a copy, fingerprints saved meanwhile go to the live index
+        edges = await asyncio.to_thread(index.snapshot().suspect_graph, threshold)
+
+        async with bot.db.transaction():
+            await bot.db.execute("DELETE FROM fingerprint_suspects")
+            await bot.db.insert_many("fingerprint_suspects", ("user_id", "suspect_id", "similarity"), edges)
+
+        logging.info(f"Fingerprint rescan found {len(edges)} suspect pairs across {len(index)} users")
+        return edges
+
+    except Exception as e:
+        logging.error(f"Error rescanning alternate accounts: {e}")
+        return []
+
 async def _calculate_fingerprint_similarity_optimized(bot, user1_id: int, user2_id: int) -> float:
     """
     Calculate similarity between two browser fingerprints using optimized queries.
@@ -274,18 +339,7 @@ async def _calculate_fingerprint_similarity_optimized(bot, user1_id: int, user2_
         if not fp1 or not fp2:
             return 0.0
         
-        # Weight different components by importance (canvas removed to save storage)
-        weights = {
-            'hardware': 0.30,  # hardware_concurrency, device_memory, screen resolution (increased from 0.25)
-            'canvas': 0.00,    # canvas fingerprints (disabled to save storage)
-            'webgl': 0.25,     # webgl vendor/renderer info (increased from 0.15)
-            'system': 0.15,    # platform, user_agent patterns (increased from 0.10)
-            'audio': 0.12,     # audio fingerprint (increased from 0.10)
-            'languages': 0.08, # language preferences
-            'fonts': 0.05,     # available fonts
-            'plugins': 0.04,   # browser plugins
-            'network': 0.01    # network characteristics (decreased from 0.03)
-        }
+        weights = SIMILARITY_WEIGHTS
         
         scores = {}
         
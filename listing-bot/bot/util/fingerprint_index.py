@@ -0,0 +1,523 @@
+import asyncio
+import logging
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from bot.util.fingerprint import SIMILARITY_WEIGHTS, _extract_browser_pattern
+
+# Popcount lookup for a single byte, used to count bits of packed set bitmaps
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Columns compared with plain equality (None == None counts as a match, like the SQL path)
+EQUAL_COLUMNS = ("hardware_concurrency", "device_memory", "screen", "platform", "screen_color_depth")
+
+# Columns that only match when both values are equal *and* truthy
+TRUTHY_COLUMNS = ("webgl_unmasked_vendor", "webgl_unmasked_renderer", "audio_fingerprint", "network_effective_type", "browser_pattern")
+
+SET_COLUMNS = ("languages", "fonts", "plugins")
+
+# MinHash/LSH blocking parameters. A pair without a matching audio fingerprint
+# can still pass the alt threshold with a fairly low font overlap, so bands are
+# short: 12 bands of 2 rows catch pairs from roughly 0.3 Jaccard similarity
+MINHASH_BANDS = 12
+MINHASH_ROWS = 2
+# The lowest threshold the blocking above was tuned for. Below it pairs matching
+# on neither audio nor renderer can pass, so lookups score every user instead
+LSH_MIN_THRESHOLD = 0.85
+_minhash_random = np.random.default_rng(0x5EED)
+# Multiply-shift hash family: odd multipliers, results taken from the high 32 bits
+_MINHASH_A = _minhash_random.integers(0, 1 << 63, size=MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_MINHASH_B = _minhash_random.integers(0, 1 << 63, size=MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+
+# Columns selected from browser_fingerprints when loading the index
+FINGERPRINT_FIELDS = (
+    "user_id", "user_agent", "platform", "hardware_concurrency", "device_memory",
+    "screen_width", "screen_height", "screen_color_depth", "webgl_unmasked_vendor",
+    "webgl_unmasked_renderer", "audio_fingerprint", "network_downlink", "network_effective_type"
+)
+
+
+def minhash_signature(tokens: Iterable[str]) -> Optional[np.ndarray]:
+    """
+    Compute a MinHash signature for a set of string tokens.
+
+    Returns:
+        uint64 array of MINHASH_BANDS * MINHASH_ROWS values, or None for an empty set
+    """
+    hashes = np.fromiter(
+        {int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little") for token in tokens},
+        dtype=np.uint64
+    )
+    if hashes.size == 0:
+        return None
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _MINHASH_A + _MINHASH_B) >> np.uint64(32)
+    return permuted.min(axis=0)
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return str(value)
+
+
+class _SetColumn:
+    """Packed bitmap storage for one set-valued fingerprint attribute (fonts, plugins, ...)."""
+
+    def __init__(self, capacity: int):
+        self.vocabulary: Dict[str, int] = {}
+        self.bits = np.zeros((capacity, 8), dtype=np.uint8)
+        self.sizes = np.zeros(capacity, dtype=np.int32)
+
+    def grow_rows(self, capacity: int):
+        bits = np.zeros((capacity, self.bits.shape[1]), dtype=np.uint8)
+        bits[:self.bits.shape[0]] = self.bits
+        sizes = np.zeros(capacity, dtype=np.int32)
+        sizes[:self.sizes.shape[0]] = self.sizes
+        self.bits, self.sizes = bits, sizes
+
+    def _grow_width(self, needed_bits: int):
+        width = self.bits.shape[1]
+        while width * 8 < needed_bits:
+            width *= 2
+        if width != self.bits.shape[1]:
+            bits = np.zeros((self.bits.shape[0], width), dtype=np.uint8)
+            bits[:, :self.bits.shape[1]] = self.bits
+            self.bits = bits
+
+    def encode(self, values: Iterable) -> List[int]:
+        ids = set()
+        for value in values:
+            value = _hashable(value)
+            if value not in self.vocabulary:
+                self.vocabulary[value] = len(self.vocabulary)
+            ids.add(self.vocabulary[value])
+        self._grow_width(len(self.vocabulary))
+        return sorted(ids)
+
+    def set_row(self, row: int, values: Iterable):
+        ids = self.encode(values)
+        self.bits[row] = 0
+        for bit in ids:
+            self.bits[row, bit >> 3] |= np.uint8(1 << (bit & 7))
+        self.sizes[row] = len(ids)
+
+    def copy(self) -> "_SetColumn":
+        column = _SetColumn.__new__(_SetColumn)
+        # The vocabulary only grows, sharing it is fine for a read-only copy
+        column.vocabulary = self.vocabulary
+        column.bits = self.bits.copy()
+        column.sizes = self.sizes.copy()
+        return column
+
+    def copy_row(self, source: int, target: int):
+        self.bits[target] = self.bits[source]
+        self.sizes[target] = self.sizes[source]
+
+    def jaccard(self, row: int, rows) -> np.ndarray:
+        mine = self.sizes[row]
+        if mine == 0:
+            return np.zeros(len(self.sizes[rows]), dtype=np.float64)
+
+        intersection = _POPCOUNT[self.bits[rows] & self.bits[row]].sum(axis=1, dtype=np.int32)
+        union = self.sizes[rows] + mine - intersection
+        return intersection / np.maximum(union, 1)
+
+
+class FingerprintIndex:
+    """
+    Resident, columnar copy of the browser fingerprint tables.
+
+    Scalar attributes are interned into integer codes so a single user can be
+    scored against every other stored fingerprint with a handful of vectorized
+    comparisons, instead of several SQLite round-trips per pair.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = capacity
+        self._count = 0
+        self._rows: Dict[int, int] = {}
+        self.user_ids = np.zeros(capacity, dtype=np.int64)
+
+        self._interned: Dict[str, Dict] = {column: {} for column in EQUAL_COLUMNS + TRUTHY_COLUMNS}
+        self._codes: Dict[str, np.ndarray] = {
+            column: np.zeros(capacity, dtype=np.int32) for column in EQUAL_COLUMNS + TRUTHY_COLUMNS
+        }
+        self._downlink = np.full(capacity, np.nan, dtype=np.float64)
+        self._sets: Dict[str, _SetColumn] = {column: _SetColumn(capacity) for column in SET_COLUMNS}
+
+        # Blocking layer: bucket key -> user ids, and user id -> its bucket keys
+        self._buckets: Dict[tuple, Set[int]] = {}
+        self._bucket_keys: Dict[int, List[tuple]] = {}
+
+        self.loaded = False
+        # Changes made while `load` runs, applied once the build finishes
+        self._loading = False
+        self._pending: List[Tuple[str, tuple]] = []
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, user_id: int):
+        return int(user_id) in self._rows
+
+    async def load(self, db):
+        """
+        Build the index from the database. Called once at startup.
+
+        Rows are read on the event loop, the interning, bitmaps and MinHash
+        signatures are built in a worker thread. Upserts and removals made in
+        the meantime (e.g. a fingerprint saved after the rows were read) are
+        queued and replayed on top of the build.
+
+        Args:
+            db: Connected Database instance
+        """
+        self._loading = True
+        try:
+            rows = await db.fetchall(f"SELECT {', '.join(FINGERPRINT_FIELDS)} FROM browser_fingerprints")
+            set_rows = {
+                column: await db.fetchall(query)
+                for column, query in (
+                    ("languages", "SELECT user_id, language FROM fingerprint_languages"),
+                    ("fonts", "SELECT user_id, font_name FROM fingerprint_fonts"),
+                    ("plugins", "SELECT user_id, plugin_name FROM fingerprint_plugins"),
+                )
+            }
+
+            await asyncio.to_thread(self.build, rows, set_rows)
+        finally:
+            self._loading = False
+
+        pending, self._pending = self._pending, []
+        for operation, args in pending:
+            getattr(self, operation)(*args)
+
+        self.loaded = True
+        logging.info(f"Fingerprint index loaded with {self._count} fingerprints, {len(pending)} changes replayed")
+
+    def build(self, rows: Iterable[tuple], set_rows: Dict[str, Iterable[tuple]]):
+        """
+        Fill the index from raw rows, blocking; see `load`.
+
+        Args:
+            rows: browser_fingerprints rows with the FINGERPRINT_FIELDS columns
+            set_rows: (user_id, value) rows per set column
+        """
+        sets: Dict[str, Dict[int, list]] = {column: {} for column in SET_COLUMNS}
+        for column, values in set_rows.items():
+            for user_id, value in values or []:
+                sets[column].setdefault(int(user_id), []).append(value)
+
+        for row in rows or []:
+            fields = dict(zip(FINGERPRINT_FIELDS, row))
+            user_id = int(fields["user_id"])
+            self._upsert(
+                user_id,
+                fields,
+                sets["languages"].get(user_id, []),
+                sets["fonts"].get(user_id, []),
+                sets["plugins"].get(user_id, [])
+            )
+
+    def snapshot(self) -> "FingerprintIndex":
+        """
+        Read-only copy of the index that later upserts and removals don't
+        touch, so a worker thread can score it while the live index keeps changing.
+        """
+        index = FingerprintIndex.__new__(FingerprintIndex)
+        index._capacity = self._capacity
+        index._count = self._count
+        index._rows = dict(self._rows)
+        index.user_ids = self.user_ids.copy()
+        index._interned = {column: dict(values) for column, values in self._interned.items()}
+        index._codes = {column: codes.copy() for column, codes in self._codes.items()}
+        index._downlink = self._downlink.copy()
+        index._sets = {column: set_column.copy() for column, set_column in self._sets.items()}
+        # Key lists are replaced on upsert, never mutated in place. Copying the
+        # buckets is the slow part, the copy rebuilds them when first used
+        index._bucket_keys = dict(self._bucket_keys)
+        index._buckets = None
+        index.loaded = self.loaded
+        index._loading = False
+        index._pending = []
+        return index
+
+    def _ensure_capacity(self):
+        if self._count < self._capacity:
+            return
+
+        capacity = self._capacity * 2
+        user_ids = np.zeros(capacity, dtype=np.int64)
+        user_ids[:self._capacity] = self.user_ids
+        self.user_ids = user_ids
+
+        for column, codes in self._codes.items():
+            grown = np.zeros(capacity, dtype=np.int32)
+            grown[:self._capacity] = codes
+            self._codes[column] = grown
+
+        downlink = np.full(capacity, np.nan, dtype=np.float64)
+        downlink[:self._capacity] = self._downlink
+        self._downlink = downlink
+
+        for set_column in self._sets.values():
+            set_column.grow_rows(capacity)
+
+        self._capacity = capacity
+
+    def _intern(self, column: str, value) -> int:
+        if column in TRUTHY_COLUMNS and not value:
+            return -1
+
+        value = _hashable(value)
+        interned = self._interned[column]
+        if value not in interned:
+            interned[value] = len(interned)
+        return interned[value]
+
+    def upsert(self, user_id: int, fields: dict, languages: Iterable = (), fonts: Iterable = (), plugins: Iterable = ()):
+        """
+        Insert or replace the fingerprint of a user. While the index is
+        loading the change is queued instead.
+
+        Args:
+            user_id: Discord user ID
+            fields: browser_fingerprints column values keyed by column name
+            languages: Language codes
+            fonts: Font names
+            plugins: Plugin names
+        """
+        if self._loading:
+            self._pending.append(("_upsert", (user_id, fields, list(languages), list(fonts), list(plugins))))
+            return
+        self._upsert(user_id, fields, languages, fonts, plugins)
+
+    def _upsert(self, user_id: int, fields: dict, languages: Iterable, fonts: Iterable, plugins: Iterable):
+        user_id = int(user_id)
+        row = self._rows.get(user_id)
+        if row is None:
+            self._ensure_capacity()
+            row = self._count
+            self._count += 1
+            self._rows[user_id] = row
+            self.user_ids[row] = user_id
+
+        user_agent = fields.get("user_agent")
+        values = {
+            "hardware_concurrency": fields.get("hardware_concurrency"),
+            "device_memory": fields.get("device_memory"),
+            "screen": (fields.get("screen_width"), fields.get("screen_height")),
+            "platform": fields.get("platform"),
+            "screen_color_depth": fields.get("screen_color_depth"),
+            "webgl_unmasked_vendor": fields.get("webgl_unmasked_vendor"),
+            "webgl_unmasked_renderer": fields.get("webgl_unmasked_renderer"),
+            "audio_fingerprint": fields.get("audio_fingerprint"),
+            "network_effective_type": fields.get("network_effective_type"),
+            "browser_pattern": _extract_browser_pattern(user_agent) if user_agent else None,
+        }
+        for column, value in values.items():
+            self._codes[column][row] = self._intern(column, value)
+
+        downlink = fields.get("network_downlink")
+        self._downlink[row] = float(downlink) if downlink else np.nan
+
+        languages, fonts, plugins = list(languages), list(fonts), list(plugins)
+        self._sets["languages"].set_row(row, languages)
+        self._sets["fonts"].set_row(row, fonts)
+        self._sets["plugins"].set_row(row, plugins)
+
+        self._unblock(user_id)
+        self._block(user_id, values, languages, fonts, plugins)
+
+    def _block(self, user_id: int, values: dict, languages: list, fonts: list, plugins: list):
+        """
+        Register a user in its LSH buckets.
+
+        A score above the alt threshold is only reachable when the audio
+        fingerprint or the unmasked WebGL renderer match, so every bucket is
+        anchored on one of them. Audio fingerprints are selective enough to be
+        a bucket on their own; renderers are shared widely, so they are split
+        further by the MinHash bands of the fonts/plugins/languages set.
+        """
+        keys = []
+
+        audio = values["audio_fingerprint"]
+        if audio:
+            keys.append(("audio", _hashable(audio)))
+
+        renderer = values["webgl_unmasked_renderer"]
+        if renderer:
+            renderer = _hashable(renderer)
+            tokens = [f"l:{lang}" for lang in languages] + [f"f:{font}" for font in fonts] + [f"p:{plugin}" for plugin in plugins]
+            signature = minhash_signature(tokens)
+            if signature is None:
+                keys.append(("webgl", renderer, None))
+            else:
+                for band in range(MINHASH_BANDS):
+                    rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+                    keys.append(("webgl", renderer, band, tuple(rows.tolist())))
+
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(user_id)
+        self._bucket_keys[user_id] = keys
+
+    def _unblock(self, user_id: int):
+        for key in self._bucket_keys.pop(user_id, []):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            bucket.discard(user_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def _rebuild_buckets(self):
+        self._buckets = {}
+        for user_id, keys in self._bucket_keys.items():
+            for key in keys:
+                self._buckets.setdefault(key, set()).add(user_id)
+
+    def candidates(self, user_id: int) -> np.ndarray:
+        """
+        Rows of users sharing at least one LSH bucket with the given user.
+
+        Returns:
+            Row indices (excluding the user itself) to run full scoring on
+        """
+        if self._buckets is None:
+            self._rebuild_buckets()
+
+        user_id = int(user_id)
+        candidate_ids = set()
+        for key in self._bucket_keys.get(user_id, []):
+            candidate_ids.update(self._buckets.get(key, ()))
+        candidate_ids.discard(user_id)
+        return np.fromiter(map(self._rows.__getitem__, candidate_ids), dtype=np.int64, count=len(candidate_ids))
+
+    def remove(self, user_id: int):
+        """Drop a user from the index by moving the last row into its slot."""
+        if self._loading:
+            self._pending.append(("_remove", (user_id,)))
+            return
+        self._remove(user_id)
+
+    def _remove(self, user_id: int):
+        row = self._rows.pop(int(user_id), None)
+        if row is None:
+            return
+
+        self._unblock(int(user_id))
+
+        last = self._count - 1
+        if row != last:
+            moved_user = int(self.user_ids[last])
+            self.user_ids[row] = moved_user
+            for codes in self._codes.values():
+                codes[row] = codes[last]
+            self._downlink[row] = self._downlink[last]
+            for set_column in self._sets.values():
+                set_column.copy_row(last, row)
+            self._rows[moved_user] = row
+
+        self._count = last
+
+    def score(self, user_id: int, rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a user against other stored fingerprints in one vectorized pass.
+
+        Args:
+            user_id: Discord user ID to score
+            rows: Optional row indices to restrict scoring to, defaults to every row
+
+        Returns:
+            Tuple of (user_ids, similarities) arrays, excluding the user itself
+        """
+        row = self._rows.get(int(user_id))
+        if row is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+        if rows is None:
+            rows = np.arange(self._count)
+        rows = rows[rows != row]
+
+        codes = self._codes
+
+        def equal(column):
+            return codes[column][rows] == codes[column][row]
+
+        def truthy_equal(column):
+            mine = codes[column][row]
+            if mine == -1:
+                return np.zeros(len(rows), dtype=bool)
+            return codes[column][rows] == mine
+
+        hardware = 0.4 * equal("hardware_concurrency") + 0.3 * equal("device_memory") + 0.3 * equal("screen")
+        webgl = 0.5 * truthy_equal("webgl_unmasked_vendor") + 0.5 * truthy_equal("webgl_unmasked_renderer")
+        system = 0.4 * equal("platform") + 0.3 * equal("screen_color_depth") + 0.3 * truthy_equal("browser_pattern")
+        audio = truthy_equal("audio_fingerprint").astype(np.float64)
+        with np.errstate(invalid="ignore"):
+            close_downlink = np.abs(self._downlink[rows] - self._downlink[row]) < 1.0
+        network = 0.5 * truthy_equal("network_effective_type") + 0.5 * close_downlink
+
+        total = (
+            SIMILARITY_WEIGHTS["hardware"] * hardware
+            + SIMILARITY_WEIGHTS["webgl"] * webgl
+            + SIMILARITY_WEIGHTS["system"] * system
+            + SIMILARITY_WEIGHTS["audio"] * audio
+            + SIMILARITY_WEIGHTS["languages"] * self._sets["languages"].jaccard(row, rows)
+            + SIMILARITY_WEIGHTS["fonts"] * self._sets["fonts"].jaccard(row, rows)
+            + SIMILARITY_WEIGHTS["plugins"] * self._sets["plugins"].jaccard(row, rows)
+            + SIMILARITY_WEIGHTS["network"] * network
+        )
+
+        return self.user_ids[rows], np.minimum(total, 1.0)
+
+    def find_suspects(self, user_id: int, threshold: float = 0.85, use_blocking: bool = True) -> List[Tuple[int, float]]:
+        """
+        Find stored users whose fingerprint similarity exceeds the threshold.
+
+        Args:
+            user_id: Discord user ID to check
+            threshold: Minimum similarity to report
+            use_blocking: Only score users sharing an LSH bucket, instead of every stored user.
+                Ignored below LSH_MIN_THRESHOLD, where blocking would miss matches
+
+        Returns:
+            List of (suspected_user_id, similarity) sorted by similarity descending
+        """
+        rows = self.candidates(user_id) if use_blocking and threshold >= LSH_MIN_THRESHOLD else None
+        user_ids, scores = self.score(user_id, rows)
+        matches = np.flatnonzero(scores > threshold)
+        order = matches[np.argsort(-scores[matches], kind="stable")]
+        return [(int(user_ids[i]), float(scores[i])) for i in order]
+
+    def suspect_graph(self, threshold: float = 0.85) -> List[Tuple[int, int, float]]:
+        """
+        Rescan every stored user and build the full alt suspect graph.
+
+        Each user is only scored against its LSH candidates, so the total work
+        is proportional to the bucket sizes rather than quadratic in users.
+        Below LSH_MIN_THRESHOLD every pair is scored instead.
+
+        Returns:
+            List of (user_id, suspected_user_id, similarity) edges, each pair once
+        """
+        use_blocking = threshold >= LSH_MIN_THRESHOLD
+        edges = []
+        for user_id, row in list(self._rows.items()):
+            rows = self.candidates(user_id) if use_blocking else np.arange(self._count)
+            # Only score each unordered pair once
+            rows = rows[rows > row]
+            if rows.size == 0:
+                continue
+
+            user_ids, scores = self.score(user_id, rows)
+            for i in np.flatnonzero(scores > threshold):
+                edges.append((user_id, int(user_ids[i]), float(scores[i])))
+
+        edges.sort(key=lambda edge: edge[2], reverse=True)
+        return edges
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import os
+
+import discord
+
+SNAPSHOT_PATH = "./data/server_data.json"
+DELTA_LOG_PATH = "./data/server_data.log"
+
+# Yield to the event loop this often while walking a guild's member list
+SYNC_YIELD_EVERY = 1000
+
+
+def member_entry(member: discord.Member) -> dict:
+    return {
+        "id": member.id,
+        "bot": member.bot,
+        "roles": [role.id for role in member.roles]
+    }
+
+def channel_entry(channel: discord.abc.GuildChannel) -> dict:
+    return {
+        channel.name: {
+            "type": str(channel.type),
+            "id": channel.id,
+            "position": channel.position,
+            "category": channel.category.name if channel.category else None,
+            "overwrites": {
+                overwrite.name: [value.value for value in channel.overwrites[overwrite].pair()]
+                for overwrite in channel.overwrites
+            }
+        }
+    }
+
+def role_entry(role: discord.Role) -> dict:
+    return {
+        role.name: {
+            "id": role.id,
+            "color": role.color.value,
+            "position": role.position,
+            "permissions": role.permissions.value,
+            "mentionable": role.mentionable,
+            "hoist": role.hoist,
+            "managed": role.managed,
+            "is_bot_managed": role.is_bot_managed(),
+            "is_premium_subscriber": role.is_premium_subscriber()
+        }
+    }
+
+def _entry_id(entry: dict) -> str:
+    return str(next(iter(entry.values()))["id"])
+
+
+class GuildSnapshot:
+    """
+    In-memory copy of every guild's members, channels and roles, kept current from
+    gateway events instead of re-walking each guild on a timer.
+
+    Changes are appended to a delta log; ``compact`` folds the log into
+    server_data.json. All file work runs in a worker thread. Members are never
+    removed so that departed members can still be restored, matching the old
+    behaviour of the periodic dump.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_PATH, log_path: str = DELTA_LOG_PATH):
+        self.path = path
+        self.log_path = log_path
+        self.guilds: dict[str, dict] = {}
+        self._pending: list[list] = []
+        self._file_lock = asyncio.Lock()
+
+    @staticmethod
+    def _empty_guild() -> dict:
+        return {"name": None, "members": {}, "channels": {}, "roles": {}}
+
+    @classmethod
+    def _apply(cls, guilds: dict, op: str, guild_id: str, key, value):
+        guild = guilds.setdefault(guild_id, cls._empty_guild())
+        if op == "guild":
+            guild["name"] = value["name"]
+            guild["members"].update(value["members"])
+            guild["channels"] = dict(value["channels"])
+            guild["roles"] = dict(value["roles"])
+        elif op == "name":
+            guild["name"] = value
+        else:
+            section = guild[f"{op}s"]
+            if value is None:
+                section.pop(key, None)
+            else:
+                section[key] = value
+
+    def _record(self, op: str, guild_id: int, key: str = None, value=None):
+        self._apply(self.guilds, op, str(guild_id), key, value)
+        self._pending.append([op, str(guild_id), key, value])
+
+    # Reading and writing the files. These only run in worker threads.
+
+    def _read_state(self) -> dict:
+        guilds = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+
+        for guild_id, guild_data in data.items():
+            guilds[guild_id] = {
+                "name": guild_data.get("name"),
+                "members": {str(member["id"]): member for member in guild_data.get("members", [])},
+                "channels": {_entry_id(entry): entry for entry in guild_data.get("channels", [])},
+                "roles": {_entry_id(entry): entry for entry in guild_data.get("roles", [])}
+            }
+
+        try:
+            with open(self.log_path, "r") as f:
+                for line in f:
+                    try:
+                        op, guild_id, key, value = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue  # A torn final line from a crash mid-append
+                    self._apply(guilds, op, guild_id, key, value)
+        except FileNotFoundError:
+            pass
+
+        return guilds
+
+    def _append_log(self, records: list):
+        with open(self.log_path, "a") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+
+    def _compact_files(self):
+        guilds = self._read_state()
+        data = {
+            guild_id: {
+                "name": guild["name"],
+                "members": list(guild["members"].values()),
+                "channels": list(guild["channels"].values()),
+                "roles": list(guild["roles"].values())
+            }
+            for guild_id, guild in guilds.items()
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        open(self.log_path, "w").close()
+
+    async def load(self):
+        async with self._file_lock:
+            self.guilds = await asyncio.to_thread(self._read_state)
+
+    async def flush(self):
+        """Append pending changes to the delta log."""
+        async with self._file_lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self):
+        if not self._pending:
+            return
+        records, self._pending = self._pending, []
+        await asyncio.to_thread(self._append_log, records)
+
+    async def compact(self):
+        """Fold the delta log into server_data.json and truncate the log."""
+        async with self._file_lock:
+            await self._flush_locked()
+            await asyncio.to_thread(self._compact_files)
+
+    # Updates from discord objects
+
+    async def sync_guild(self, guild: discord.Guild):
+        """Record a guild in full, used on startup and when joining a guild."""
+        members = {}
+        for i, member in enumerate(guild.members, 1):
+            members[str(member.id)] = member_entry(member)
+            if i % SYNC_YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+        self._record("guild", guild.id, value={
+            "name": guild.name,
+            "members": members,
+            "channels": {str(channel.id): channel_entry(channel) for channel in guild.channels},
+            "roles": {str(role.id): role_entry(role) for role in guild.roles}
+        })
+
+    def rename_guild(self, guild: discord.Guild):
+        self._record("name", guild.id, value=guild.name)
+
+    def update_member(self, member: discord.Member):
+        self._record("member", member.guild.id, str(member.id), member_entry(member))
+
+    def update_channel(self, channel: discord.abc.GuildChannel):
+        self._record("channel", channel.guild.id, str(channel.id), channel_entry(channel))
+        # Children store their category by name
+        if isinstance(channel, discord.CategoryChannel):
+            for child in channel.channels:
+                self._record("channel", child.guild.id, str(child.id), channel_entry(child))
+
+    def remove_channel(self, channel: discord.abc.GuildChannel):
+        self._record("channel", channel.guild.id, str(channel.id))
+
+    def update_role(self, role: discord.Role):
+        self._record("role", role.guild.id, str(role.id), role_entry(role))
+
+    def remove_role(self, role: discord.Role):
+        self._record("role", role.guild.id, str(role.id))
+
+    def view(self, guild_id: int) -> dict:
+        """The guild in the server_data.json layout, or an empty dict if unknown."""
+        guild = self.guilds.get(str(guild_id))
+        if not guild:
+            return {}
+        return {
+            "name": guild["name"],
+            "members": list(guild["members"].values()),
+            "channels": list(guild["channels"].values()),
+            "roles": list(guild["roles"].values())
+        }
@@ -0,0 +1,211 @@
+import asyncio
+import random
+from collections import deque
+from contextlib import asynccontextmanager
+
+import aiohttp
+from yarl import URL
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """How often and how patiently to retry requests to one upstream."""
+
+    def __init__(self, attempts: int = 1, backoff: float = 0.5, max_backoff: float = 8.0,
+                 statuses: frozenset = RETRY_STATUSES, methods: frozenset = IDEMPOTENT_METHODS,
+                 timeout: aiohttp.ClientTimeout = None):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.methods = methods
+        # Per-attempt timeout, None leaves the session's default
+        self.timeout = timeout
+
+    def delay(self, attempt: int, response: aiohttp.ClientResponse = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except (TypeError, ValueError):
+                pass
+        # Exponential backoff with jitter so parallel retries don't line up
+        return min(self.backoff * 2 ** (attempt - 1), self.max_backoff) * random.uniform(0.5, 1.0)
+
+
+class UpstreamStats:
+    def __init__(self, samples: int = 256):
+        self.requests = 0
+        self.errors = 0
+        self.server_errors = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_error = None
+        self._latencies = deque(maxlen=samples)
+
+    def record(self, elapsed_ms: float, status: int = None, error: BaseException = None):
+        self.requests += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self._latencies.append(elapsed_ms)
+
+        if error is not None:
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+        elif status == 429:
+            self.rate_limited += 1
+        elif status is not None and status >= 500:
+            self.server_errors += 1
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 1)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "server_errors": self.server_errors,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "avg_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "last_error": self.last_error
+        }
+
+
+def upstream_of(url) -> str:
+    """The name requests to `url` are grouped under, host plus any non-default port."""
+    url = URL(str(url))
+    if url.port is None or url.is_default_port():
+        return url.host or ""
+    return f"{url.host}:{url.port}"
+
+
+class HttpClient:
+    """
+    One pooled aiohttp session for all of the bot's outbound HTTP.
+
+    The connector keeps connections alive and caches DNS, so repeated calls to
+    the same upstream skip the handshake. Every request made through the
+    session, including plain ``session.get`` calls, is timed per upstream;
+    ``request`` additionally retries and applies the timeout of the
+    upstream's RetryPolicy. The session itself keeps aiohttp's default timeout.
+    """
+
+    def __init__(self, policies: dict[str, RetryPolicy] = None, limit: int = 100, limit_per_host: int = 20,
+                 dns_ttl: int = 300, keepalive: float = 30, timeout: aiohttp.ClientTimeout = None):
+        self.policies = policies or {}
+        self.default_policy = RetryPolicy()
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.upstreams: dict[str, UpstreamStats] = {}
+        self._session: aiohttp.ClientSession = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use inside the running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive
+            )
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_request_end.append(self._on_request_end)
+            trace.on_request_exception.append(self._on_request_exception)
+            options = {"timeout": self.timeout} if self.timeout is not None else {}
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace], **options)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def stats_for(self, upstream: str) -> UpstreamStats:
+        stats = self.upstreams.get(upstream)
+        if stats is None:
+            stats = self.upstreams[upstream] = UpstreamStats()
+        return stats
+
+    def policy_for(self, url) -> RetryPolicy:
+        return self.policies.get(upstream_of(url), self.default_policy)
+
+    def stats(self) -> dict:
+        return {upstream: stats.as_dict() for upstream, stats in sorted(self.upstreams.items())}
+
+    # Trace hooks, these see every request made through the session
+
+    async def _on_request_start(self, session, ctx, params: aiohttp.TraceRequestStartParams):
+        ctx.started_at = asyncio.get_running_loop().time()
+
+    def _elapsed_ms(self, ctx) -> float:
+        return (asyncio.get_running_loop().time() - ctx.started_at) * 1000
+
+    async def _on_request_end(self, session, ctx, params: aiohttp.TraceRequestEndParams):
+        self.stats_for(upstream_of(params.url)).record(self._elapsed_ms(ctx), status=params.response.status)
+
+    async def _on_request_exception(self, session, ctx, params: aiohttp.TraceRequestExceptionParams):
+        self.stats_for(upstream_of(params.url)).record(self._elapsed_ms(ctx), error=params.exception)
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        """
+        Drop-in for ``session.request`` used as a context manager. Connection
+        errors, timeouts and retryable statuses are retried with backoff when
+        the upstream's policy allows it for this method.
+        """
+        method = method.upper()
+        policy = self.policy_for(url)
+        attempts = policy.attempts if method in policy.methods else 1
+        if policy.timeout is not None:
+            kwargs.setdefault("timeout", policy.timeout)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == attempts:
+                    raise
+                self.stats_for(upstream_of(url)).retries += 1
+                await asyncio.sleep(policy.delay(attempt))
+                continue
+
+            if response.status in policy.statuses and attempt < attempts:
+                delay = policy.delay(attempt, response)
+                response.release()
+                self.stats_for(upstream_of(url)).retries += 1
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                yield response
+            finally:
+                response.release()
+            return
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
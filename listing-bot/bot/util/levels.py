@@ -0,0 +1,130 @@
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
+# Cumulative XP needed to reach each level, indexed by level
+
+CATACOMBS_XP = array("q", [
+    0, 50, 125, 235, 395, 625, 955, 1425, 2095, 3045,
+    4385, 6275, 8940, 12700, 17960, 25340, 35640, 50040, 70040, 97640,
+    135640, 188140, 259640, 356640, 488640, 668640, 911640, 1239640, 1684640, 2284640,
+    3084640, 4149640, 5559640, 7459640, 9959640, 13259640, 17559640, 23159640, 30359640, 39559640,
+    51559640, 66559640, 85559640, 109559640, 139559640, 177559640, 225559640, 285559640, 360559640, 453559640,
+    569809640
+])
+
+SKILL_XP = array("q", [
+    0, 50, 175, 375, 675, 1175, 1925, 2925, 4425, 6425,
+    9925, 14925, 22425, 32425, 47425, 67425, 97425, 147425, 222425, 322425,
+    522425, 822425, 1222425, 1722425, 2322425, 3022425, 3822425, 4722425, 5722425, 6822425,
+    8022425, 9322425, 10722425, 12222425, 13822425, 15522425, 17322425, 19222425, 21222425, 23322425,
+    25522425, 27822425, 30222425, 32722425, 35322425, 38072425, 40972425, 44072425, 47472425, 51172425,
+    55172425, 59472425, 64072425, 68972425, 74172425, 79672425, 85472425, 91572425, 97972425, 104672425,
+    111672425
+])
+
+SLAYER_XP = {
+    "zombie": array("q", [0, 5, 15, 200, 1000, 5000, 20000, 100000, 400000, 1000000]),
+    "spider": array("q", [0, 5, 15, 200, 1000, 5000, 20000, 100000, 400000, 1000000]),
+    "wolf": array("q", [0, 10, 30, 250, 1500, 5000, 20000, 100000, 400000, 1000000]),
+    "enderman": array("q", [0, 10, 30, 250, 1500, 5000, 20000, 100000, 400000, 1000000]),
+    "blaze": array("q", [0, 10, 30, 250, 1500, 5000, 20000, 100000, 400000, 1000000])
+}
+
+SLAYER_ALIASES = {
+    "revenant": "zombie",
+    "tarantula": "spider",
+    "sven": "wolf",
+    "voidgloom": "enderman",
+    "demonlord": "blaze"
+}
+
+# Heart of the Mountain starts at tier 1, so level 0 shares its threshold
+HOTM_XP = array("q", [0, 0, 3000, 12000, 37000, 97000, 197000, 347000, 557000, 847000, 1247000])
+
+SKILL_MAX_LEVELS = {
+    "mining": {
+        "maxLevel": 60,
+    },
+
+    "foraging": {
+        "maxLevel": 50,
+    },
+
+    "enchanting": {
+        "maxLevel": 60,
+    },
+
+    "farming": {
+        "maxLevel": 60,
+    },
+
+    "combat": {
+        "maxLevel": 60,
+    },
+
+    "fishing": {
+        "maxLevel": 50,
+    },
+
+    "alchemy": {
+        "maxLevel": 50,
+    },
+
+    "taming": {
+        "maxLevel": 50,
+    }
+}
+
+_SKILL_XP_ARRAY = np.asarray(SKILL_XP, dtype=np.float64)
+
+
+def level_from_xp(table: array, xp: float, max_level: int = None) -> float:
+    """
+    Fractional level for `xp` on a cumulative XP table, e.g. 24.5 is halfway
+    from 24 to 25. XP at or past `max_level` (default: the end of the table)
+    returns the level as an int.
+    """
+    if max_level is None:
+        max_level = len(table) - 1
+    if xp >= table[max_level]:
+        return max_level
+
+    level = bisect_right(table, xp)
+    low = table[level - 1]
+    return (level - 1) + (xp - low) / (table[level] - low)
+
+def catacombs_level(xp: float) -> float:
+    return level_from_xp(CATACOMBS_XP, xp)
+
+def skill_level(skill_type: str, xp: float) -> float:
+    return level_from_xp(SKILL_XP, xp, SKILL_MAX_LEVELS[skill_type]["maxLevel"])
+
+def slayer_level(slayer_type: str, xp: float) -> float:
+    return level_from_xp(SLAYER_XP[SLAYER_ALIASES.get(slayer_type, slayer_type)], xp)
+
+def hotm_level(xp: float) -> float:
+    return level_from_xp(HOTM_XP, xp)
+
+def skill_levels(skills: dict[str, float]) -> dict[str, float]:
+    """
+    Levels of every skill in {skill: xp} at once, with one searchsorted over
+    the skill table instead of a lookup per skill.
+    """
+    names = [skill for skill in skills if skill in SKILL_MAX_LEVELS]
+    if not names:
+        return {}
+
+    xp = np.array([skills[skill] for skill in names], dtype=np.float64)
+    caps = np.array([SKILL_MAX_LEVELS[skill]["maxLevel"] for skill in names])
+
+    level = np.clip(np.searchsorted(_SKILL_XP_ARRAY, xp, side="right"), 1, len(SKILL_XP) - 1)
+    low = _SKILL_XP_ARRAY[level - 1]
+    fractional = (level - 1) + (xp - low) / (_SKILL_XP_ARRAY[level] - low)
+    maxed = xp >= _SKILL_XP_ARRAY[caps]
+
+    return {
+        skill: int(cap) if is_maxed else value
+        for skill, cap, is_maxed, value in zip(names, caps.tolist(), maxed.tolist(), fractional.tolist())
+    }
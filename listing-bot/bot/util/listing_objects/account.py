@@ -134,7 +134,7 @@ class Account(View):
         account = AccountObject(*account)
         await interaction.response.defer(ephemeral=True)
 
-        profile_data, profile = await fetch_profile_data(self.bot.session, account.uuid, self.bot, account.profile)
+        profile_data, profile = await fetch_profile_data(account.uuid, self.bot, account.profile)
         embed = create_embed_account_listing(profile_data, profile, account.uuid, account.username, account.price, account.additional_info, convert_payment_methods(self.bot, account.payment_methods), interaction, self.bot, f"<@{account.listed_by}>")
         await interaction.message.edit(embed=embed)
 
@@ -13,7 +13,6 @@ from bot.util.constants import (
 )
 from bot.util.helper.kuudra import Kuudra
 from bot.util.networth import generate_embed_networth_field, process_items
-import aiohttp
 import asyncio
 
 from bot.bot import Bot
@@ -83,16 +82,15 @@ class Dropdown(Select):
             case _:
                 raise ValueError("Invalid account type")
             
-        async with aiohttp.ClientSession() as session:
-            try:
-                profile_data, profile = await fetch_profile_data(session, account.uuid, self.bot, account.profile, False)
-            except asyncio.TimeoutError:
-                await interaction.respond("The request to Hypixel's API timed out, please try again later.", ephemeral=True)
-                return
-            if not profile_data:
-                await interaction.respond("Failed to fetch profile data, please try again later.", ephemeral=True)
-                return
-            
+        try:
+            profile_data, profile = await fetch_profile_data(account.uuid, self.bot, account.profile, False)
+        except asyncio.TimeoutError:
+            await interaction.respond("The request to Hypixel's API timed out, please try again later.", ephemeral=True)
+            return
+        if not profile_data:
+            await interaction.respond("Failed to fetch profile data, please try again later.", ephemeral=True)
+            return
+        
         embed = self.base(profile, self.values[0])
         match self.values[0]:
             case "Dungeons":
@@ -220,7 +220,7 @@ class Profile(View):
         account = ProfileObject(*account)
         await interaction.response.defer(ephemeral=True)
 
-        profile_data, profile = await fetch_profile_data(self.bot.session, account.uuid, self.bot, account.profile)
+        profile_data, profile = await fetch_profile_data(account.uuid, self.bot, account.profile)
         embed = create_embed_profile_listing(profile_data, profile, account.price, convert_payment_methods(self.bot, account.payment_methods), self.bot, f"<@{account.listed_by}>")
         await interaction.message.edit(embed=embed)
 
@@ -2,10 +2,8 @@ import discord
 from discord.ui import View, button
 from bot.bot import Bot
 
-from chat_exporter.construct.transcript import Transcript
-from bot.util.attachment_handler import CustomHandler
+from bot.util.transcript import save_transcript
 from bot.util.get_default_overwrites import get_role_config_name
-import os
 
 class Ticket:
     def __init__(self, opened_by, channel_id, initial_message_id, role_id, is_open=True, claimed:int=None, ticket_type:str=None):
@@ -169,26 +167,13 @@ class OpenedTicket(View):
                 )
                 return await interaction.respond(embed=embed, ephemeral=True)
 
-        transcript = (
-            await Transcript(
-                channel=interaction.channel, limit=None,
-                messages=None, pytz_timezone="UTC",
-                military_time=True, fancy_times=True,
-                before=None, after=None, support_dev=True,
-                bot=self.bot, attachment_handler=CustomHandler()
-            ).export()
-        ).html
-
         ticket = await self.bot.db.fetchone("SELECT * FROM tickets WHERE channel_id = ?", interaction.channel.id)
         if not ticket:
             return await interaction.response.send_message("An error occurred while fetching the ticket information. (You should manually delete it.)", ephemeral=True)
         
         ticket = Ticket(*ticket)
         await interaction.channel.send("Generating Transcript...")
-        os.makedirs("./templates", exist_ok=True)
-
-        with open(f"./templates/{self.bot.bot_name}-{interaction.channel.id}-{ticket.opened_by}.html", "wb") as f:
-            f.write(transcript.encode())
+        await save_transcript(self.bot, interaction.channel, ticket.opened_by)
 
         transcript_url = f"https://{await self.bot.get_domain()}/transcript/{self.bot.bot_name}/{interaction.channel.id}-{ticket.opened_by}"
         transcript_embed = discord.Embed(
@@ -1,4 +1,3 @@
-import aiohttp
 import discord
 
 import discord.ext
@@ -193,31 +192,29 @@ async def old_lowball(ctx, bot, username: str, profile: str=None, uuid: str=None
     if isinstance(ctx, discord.ApplicationContext) and not just_embed:
         await ctx.defer(ephemeral=True)
 
-    async with aiohttp.ClientSession() as session:
-        if not uuid:
-            mojang_api, status = await fetch_mojang_api(session, username)
-        else:
-            mojang_api = {"id": uuid, "name": username}
-
-        if mojang_api.get("id") is None:
-            if not just_embed:
-                embed = discord.Embed(
-                    title="Error",
-                    description="This username doesn't exist",
-                    color=discord.Color.red()
-                )
-                return await ctx.respond(embed=embed, ephemeral=True)
-            
-            return None, None
-    
-        profile_data, cute_name = await fetch_profile_data(session, mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
+    if not uuid:
+        mojang_api, status = await fetch_mojang_api(bot.http_client, username)
+    else:
+        mojang_api = {"id": uuid, "name": username}
+
+    if mojang_api.get("id") is None:
+        if not just_embed:
+            embed = discord.Embed(
+                title="Error",
+                description="This username doesn't exist",
+                color=discord.Color.red()
+            )
+            return await ctx.respond(embed=embed, ephemeral=True)
+        
+        return None, None
+
+    profile_data, cute_name = await fetch_profile_data(mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
 
     if not profile_data:
         return None, None
 
     # Get both value types
-    standard_values = gather_value(profile_data)  # Get standard values first
-    lowball_values = gather_lowball_value(profile_data)  # Get lowball values
+    standard_values, lowball_values = gather_values(profile_data)
 
     embed, view = create_embed(
         value_type="Lowball",
@@ -245,21 +242,19 @@ async def old_value(ctx, bot, username: str, profile: str=None, just_embed: bool
     if isinstance(ctx, discord.ApplicationContext) and not just_embed:
         await ctx.defer(ephemeral=True)
 
-    async with aiohttp.ClientSession() as session:
+    mojang_api, status = await fetch_mojang_api(bot.http_client, username)
+    if mojang_api.get("id") is None:
+        if not just_embed:
+            embed = discord.Embed(
+                title="Error",
+                description="This username doesn't exist",
+                color=discord.Color.red()
+            )
+            return await ctx.respond(embed=embed, ephemeral=True)
         
-        mojang_api, status = await fetch_mojang_api(session, username)
-        if mojang_api.get("id") is None:
-            if not just_embed:
-                embed = discord.Embed(
-                    title="Error",
-                    description="This username doesn't exist",
-                    color=discord.Color.red()
-                )
-                return await ctx.respond(embed=embed, ephemeral=True)
-            
-            return None, None
-    
-        profile_data, cute_name  = await fetch_profile_data(session, mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
+        return None, None
+
+    profile_data, cute_name  = await fetch_profile_data(mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
 
     if not profile_data:
         return None, None
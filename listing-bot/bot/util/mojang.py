@@ -0,0 +1,199 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from .http import HttpClient
+from .ratelimit import TokenBucket
+
+MOJANG_URL = "https://mowojang.matdoes.dev"
+# Mojang's own bulk endpoint, resolves up to MOJANG_BULK_SIZE names per request
+MOJANG_BULK_URL = "https://api.minecraftservices.com/minecraft/profile/lookup/bulk/byname"
+MOJANG_BULK_SIZE = 10
+
+INVALID_PROFILE = {"id": "Invalid username.", "name": "Invalid username."}
+
+
+class MojangResolver:
+    """
+    Resolves usernames and UUIDs to {"name", "id"} through an in-memory LRU,
+    the mojang_cache table and finally the Mojang proxy. Concurrent lookups of
+    the same key share one request, and names that don't exist are remembered
+    for a short while so they aren't looked up again on every retry.
+    """
+
+    def __init__(self, maxsize: int = 5000, ttl: int = 24 * 3600, negative_ttl: int = 600):
+        self.db = None
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.limiter = TokenBucket(rate=10)
+        self._entries: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def attach(self, db):
+        """Enable the persistent tier, called once the database is connected."""
+        self.db = db
+
+    @staticmethod
+    def _key(query: str) -> str:
+        query = query.replace("-", "")
+        return query.lower()
+
+    def _cached(self, key: str) -> tuple[bool, dict | None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, profile = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, profile
+
+    def _remember(self, key: str, profile: dict | None, ttl: float):
+        expires_at = time.monotonic() + ttl
+        if profile is None:
+            self._entries[key] = (expires_at, None)
+            self._entries.move_to_end(key)
+        else:
+            # Reachable by both name and UUID
+            for alias in (profile["name"].lower(), profile["id"].lower()):
+                self._entries[alias] = (expires_at, profile)
+                self._entries.move_to_end(alias)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key: str) -> dict | None:
+        if self.db is None:
+            return None
+        if len(key) > 16:
+            row = await self.db.fetchone("SELECT uuid, name, fetched_at FROM mojang_cache WHERE uuid = ?", key)
+        else:
+            row = await self.db.fetchone(
+                "SELECT uuid, name, fetched_at FROM mojang_cache WHERE name_lower = ? ORDER BY fetched_at DESC LIMIT 1",
+                key
+            )
+        if not row:
+            return None
+
+        uuid, name, fetched_at = row
+        remaining = fetched_at + self.ttl - time.time()
+        if remaining <= 0:
+            return None
+
+        profile = {"name": name, "id": uuid}
+        self._remember(key, profile, remaining)
+        return profile
+
+    async def _store(self, profile: dict):
+        self._remember(profile["id"], profile, self.ttl)
+        if self.db is None:
+            return
+        async with self.db.transaction():
+            # A name can move to another account, drop whoever held it before
+            await self.db.execute(
+                "DELETE FROM mojang_cache WHERE name_lower = ? AND uuid != ?",
+                profile["name"].lower(), profile["id"]
+            )
+            await self.db.execute(
+                """
+                INSERT INTO mojang_cache (uuid, name, name_lower, fetched_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (uuid) DO UPDATE SET
+                    name = excluded.name, name_lower = excluded.name_lower, fetched_at = excluded.fetched_at
+                """,
+                profile["id"], profile["name"], profile["name"].lower(), int(time.time())
+            )
+
+    async def _fetch(self, http: HttpClient, key: str) -> tuple[dict | None, int]:
+        await self.limiter.acquire()
+        async with http.get(f"{MOJANG_URL}/{key}") as response:
+            status = response.status
+            try:
+                data = await response.json()
+            except Exception:
+                data = {}
+
+        if status == 200 and data.get("id"):
+            profile = {"name": data.get("name", "Invalid Username."), "id": data["id"].replace("-", "")}
+            await self._store(profile)
+            return profile, status
+
+        # Only a definite "no such player" is cached; rate limits and outages are retried next time
+        if status in (204, 400, 404):
+            self._remember(key, None, self.negative_ttl)
+        return None, status
+
+    async def resolve(self, http: HttpClient, query: str) -> tuple[dict, int]:
+        """
+        Same contract as the old fetch_mojang_api: ({"name", "id"}, 200) on success,
+        otherwise the invalid placeholder and the upstream status.
+        """
+        key = self._key(query)
+
+        found, profile = self._cached(key)
+        if not found:
+            profile = await self._load(key)
+            found = profile is not None
+
+        if found:
+            if profile is None:
+                return dict(INVALID_PROFILE), 404
+            return dict(profile), 200
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(http, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        profile, status = await asyncio.shield(task)
+        if profile is None:
+            return dict(INVALID_PROFILE), status
+        return dict(profile), status
+
+    async def resolve_many(self, http: HttpClient, names: list[str]) -> dict[str, dict | None]:
+        """
+        Resolve many usernames at once, keyed by lowercased name. Names that miss
+        both cache tiers are sent to Mojang's bulk endpoint in chunks, falling
+        back to single lookups if a chunk fails.
+        """
+        results = {}
+        missing = []
+        for name in dict.fromkeys(self._key(name) for name in names):
+            found, profile = self._cached(name)
+            if not found:
+                profile = await self._load(name)
+                found = profile is not None
+            if found:
+                results[name] = profile
+            else:
+                missing.append(name)
+
+        for i in range(0, len(missing), MOJANG_BULK_SIZE):
+            chunk = missing[i:i + MOJANG_BULK_SIZE]
+            await self.limiter.acquire()
+            try:
+                async with http.post(MOJANG_BULK_URL, json=chunk) as response:
+                    data = await response.json() if response.status == 200 else None
+            except Exception:
+                data = None
+
+            if data is None:
+                fallback = await asyncio.gather(*(self.resolve(http, name) for name in chunk), return_exceptions=True)
+                for name, result in zip(chunk, fallback):
+                    results[name] = result[0] if not isinstance(result, Exception) and result[1] == 200 else None
+                continue
+
+            for entry in data:
+                profile = {"name": entry["name"], "id": entry["id"].replace("-", "")}
+                await self._store(profile)
+                results[profile["name"].lower()] = profile
+            for name in chunk:
+                if name not in results:
+                    self._remember(name, None, self.negative_ttl)
+                    results[name] = None
+
+        return results
+
+
+mojang_resolver = MojangResolver()
@@ -1,8 +1,8 @@
-import aiohttp
 from typing import Optional
 import json
 import os
 from api.auth_utils import API_KEY
+from bot.util.http import HttpClient
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,8 +16,8 @@ ports = {
 }
 
 class APIProxyManager:
-    def __init__(self, session: aiohttp.ClientSession):
-        self.session = session
+    def __init__(self, http: HttpClient):
+        self.http = http
 
         self.base_url = f"http://{PARENT_API_HOST}:{PARENT_API_PORT}"
 
@@ -25,42 +25,42 @@ class APIProxyManager:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.session.close()
+        pass  # The client is shared, the bot closes it
 
     async def get(self, endpoint: str, params: dict = None):
         url = f"{self.base_url}/{endpoint}"
-        async with self.session.get(url, params=params) as response:
+        async with self.http.get(url, params=params) as response:
             response.raise_for_status()
             return await response.json()
         
     async def post(self, endpoint: str, data: dict = None):
         url = f"{self.base_url}/{endpoint}"
-        async with self.session.post(url, json=data) as response:
+        async with self.http.post(url, json=data) as response:
             response.raise_for_status()
             return await response.json()
         
     async def put(self, endpoint: str, data: dict = None):
         url = f"{self.base_url}/{endpoint}"
-        async with self.session.put(url, json=data) as response:
+        async with self.http.put(url, json=data) as response:
             response.raise_for_status()
             return await response.json()
         
     async def delete(self, endpoint: str):
         url = f"{self.base_url}/{endpoint}"
-        async with self.session.delete(url) as response:
+        async with self.http.delete(url) as response:
             response.raise_for_status()
             return await response.json()
 
         
 class BotCommunicator:
-    def __init__(self, session: aiohttp.ClientSession):
-        self.session = session
+    def __init__(self, http: HttpClient):
+        self.http = http
 
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.session.close()
+        pass  # The client is shared, the bot closes it
 
     def fetch_ports(self) -> dict:
         if os.path.exists("../parent_api/ports.json"):
@@ -77,18 +77,18 @@ class BotCommunicator:
             url = f"http://{BOT_SERVICE_HOST}:{port}/{endpoint}?api_key={API_KEY}"
 
             if request_type == "GET":
-                async with self.session.get(url, **kwargs) as response:
+                async with self.http.get(url, **kwargs) as response:
                     response.raise_for_status()
                     return await response.json()
             elif request_type == "POST":
-                async with self.session.post(url, json=data, **kwargs) as response:
+                async with self.http.post(url, json=data, **kwargs) as response:
                     response.raise_for_status()
                     return await response.json()
             elif request_type == "PUT":
-                async with self.session.put(url, json=data, **kwargs) as response:
+                async with self.http.put(url, json=data, **kwargs) as response:
                     response.raise_for_status()
                     return await response.json()
             elif request_type == "DELETE":
-                async with self.session.delete(url, **kwargs) as response:
+                async with self.http.delete(url, **kwargs) as response:
                     response.raise_for_status()
                     return await response.json()
@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import time
+from typing import Awaitable, Callable
+
+import discord
+import ujson as json
+
+from .convert_payment_methods import convert_payment_methods
+from .fetch import fetch_profile_data
+from .ratelimit import TokenBucket
+from .helper.account import AccountObject, create_embed_account_listing
+from .helper.profile import ProfileObject, create_embed_profile_listing
+from .helper.macro_alt import AltObject, create_embed_alt_listing
+
+# Profiles fetched at once, the SkyBlock API is local but not unlimited
+FETCH_CONCURRENCY = 6
+
+# Discord allows 5 message edits per 5 seconds in one channel and 50 requests
+# per second overall, stay under both instead of leaning on 429s
+CHANNEL_EDIT_RATE = 1.0
+CHANNEL_EDIT_BURST = 5
+GLOBAL_EDIT_RATE = 20.0
+
+PROGRESS_INTERVAL = 2.0
+
+
+def _render_account(bot, listing: AccountObject, profile_data, profile, channel) -> list[discord.Embed]:
+    # The builder only reads ctx.guild, which the listing channel provides
+    return [create_embed_account_listing(profile_data, profile, listing.uuid, listing.username, listing.price, listing.additional_info, convert_payment_methods(bot, listing.payment_methods), channel, bot, f"<@{listing.listed_by}>")]
+
+def _render_profile(bot, listing: ProfileObject, profile_data, profile, channel) -> list[discord.Embed]:
+    return [create_embed_profile_listing(profile_data, profile, listing.price, convert_payment_methods(bot, listing.payment_methods), bot, f"<@{listing.listed_by}>")]
+
+def _render_alt(bot, listing: AltObject, profile_data, profile, channel) -> list[discord.Embed]:
+    return create_embed_alt_listing(profile_data, profile, listing.price, convert_payment_methods(bot, listing.payment_methods), bot, f"<@{listing.listed_by}>", listing.mining, listing.farming)
+
+
+class ListingKind:
+    def __init__(self, table: str, listing_class: type, render: Callable):
+        self.table = table
+        self.listing_class = listing_class
+        self.render = render
+
+
+LISTING_KINDS = {
+    "accounts": ListingKind("accounts", AccountObject, _render_account),
+    "profiles": ListingKind("profiles", ProfileObject, _render_profile),
+    "alts": ListingKind("alts", AltObject, _render_alt)
+}
+
+
+def embed_digest(embeds: list[discord.Embed]) -> str:
+    payload = json.dumps([embed.to_dict() for embed in embeds], sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class RefreshResult:
+    def __init__(self, total: int):
+        self.total = total
+        self.updated = 0
+        self.unchanged = 0
+        self.missing = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def done(self) -> int:
+        return self.updated + self.unchanged + self.missing + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def __str__(self) -> str:
+        return (f"{self.done}/{self.total} in {self.elapsed:.1f}s: {self.updated} updated, "
+                f"{self.unchanged} unchanged, {self.missing} missing, {self.failed} failed")
+
+
+class ListingRefresher:
+    """
+    Re-renders listing messages from fresh profile data.
+
+    Profiles are fetched a few at a time, each embed is built as soon as its
+    profile arrives, and edits go out through a per-channel and a global
+    token bucket. A digest of the last embeds written to every message is kept
+    (in memory and in listing_renders), so listings whose stats didn't change
+    aren't edited at all.
+    """
+
+    def __init__(self, bot, fetch_concurrency: int = FETCH_CONCURRENCY):
+        self.bot = bot
+        self.fetch_concurrency = fetch_concurrency
+        self.digests: dict[int, str] = None
+        self._global_bucket = TokenBucket(rate=GLOBAL_EDIT_RATE)
+        self._channel_buckets: dict[int, TokenBucket] = {}
+        self._locks = {kind: asyncio.Lock() for kind in LISTING_KINDS}
+
+    async def _load_digests(self):
+        if self.digests is None:
+            rows = await self.bot.db.fetchall("SELECT message_id, digest FROM listing_renders")
+            self.digests = {message_id: digest for message_id, digest in rows}
+
+    async def listings(self, kind: str, number: int = None) -> list:
+        table = LISTING_KINDS[kind].table
+        query = f"SELECT * FROM {table}" + (" WHERE number=?" if number else "")
+        params = (number,) if number else ()
+        return await self.bot.db.fetchall(query, *params)
+
+    async def _edit(self, channel: discord.TextChannel, message_id: int, embeds: list[discord.Embed]):
+        bucket = self._channel_buckets.get(channel.id)
+        if bucket is None:
+            bucket = self._channel_buckets[channel.id] = TokenBucket(rate=CHANNEL_EDIT_RATE, capacity=CHANNEL_EDIT_BURST)
+        await bucket.acquire()
+        await self._global_bucket.acquire()
+        # A partial message skips the fetch_message round trip
+        await channel.get_partial_message(message_id).edit(embeds=embeds)
+
+    async def _refresh_one(self, kind: ListingKind, listing, fetch_slots: asyncio.Semaphore, result: RefreshResult, written: dict):
+        channel = self.bot.get_channel(listing.channel_id)
+        if channel is None or not listing.message_id:
+            result.missing += 1
+            return
+
+        async with fetch_slots:
+            profile_data, profile = await fetch_profile_data(listing.uuid, self.bot, listing.profile, allow_error_handler=False, fresh=True)
+        if profile_data is None:
+            result.failed += 1
+            return
+
+        embeds = kind.render(self.bot, listing, profile_data, profile, channel)
+        digest = embed_digest(embeds)
+        if self.digests.get(listing.message_id) == digest:
+            result.unchanged += 1
+            return
+
+        try:
+            await self._edit(channel, listing.message_id, embeds)
+        except discord.NotFound:
+            result.missing += 1
+            return
+        self.digests[listing.message_id] = digest
+        written[listing.message_id] = digest
+        result.updated += 1
+
+    async def refresh(self, kind: str, rows: list, on_progress: Callable[[RefreshResult], Awaitable] = None,
+                      progress_interval: float = PROGRESS_INTERVAL) -> RefreshResult:
+        """
+        Refresh every listing in `rows` (raw rows of the kind's table).
+        `on_progress` is called at most once per `progress_interval` while
+        the refresh runs, the caller reports the final result itself.
+        """
+        listing_kind = LISTING_KINDS[kind]
+        result = RefreshResult(len(rows))
+
+        async with self._locks[kind]:
+            await self._load_digests()
+            fetch_slots = asyncio.Semaphore(self.fetch_concurrency)
+            written: dict[int, str] = {}
+            progress_task: asyncio.Task = None
+            last_progress = time.monotonic()
+
+            async def run(row):
+                nonlocal progress_task, last_progress
+                listing = listing_kind.listing_class(*row)
+                try:
+                    await self._refresh_one(listing_kind, listing, fetch_slots, result, written)
+                except Exception as e:
+                    result.failed += 1
+                    print(f"Failed to refresh {kind} listing #{listing.number}: {e}")
+
+                now = time.monotonic()
+                if on_progress and now - last_progress >= progress_interval and (progress_task is None or progress_task.done()):
+                    last_progress = now
+                    # Reported in the background so a slow progress edit never stalls the pipeline
+                    progress_task = asyncio.create_task(on_progress(result))
+
+            await asyncio.gather(*(run(row) for row in rows))
+            if progress_task is not None:
+                await asyncio.gather(progress_task, return_exceptions=True)
+
+            if written:
+                await self.bot.db.executemany(
+                    """
+                    INSERT INTO listing_renders (message_id, digest) VALUES (?, ?)
+                    ON CONFLICT(message_id) DO UPDATE SET digest = excluded.digest
+                    """,
+                    written.items()
+                )
+
+        return result
+
+    async def refresh_all(self) -> dict[str, RefreshResult]:
+        """Refresh every listing of every kind, used by the scheduled refresh."""
+        results = {}
+        for kind in LISTING_KINDS:
+            results[kind] = await self.refresh(kind, await self.listings(kind))
+
+        # Forget digests of messages that are no longer listed. A manual refresh
+        # may be running without our lock by now, so the dict is pruned in place
+        listed = await self.bot.db.fetchall(
+            """
+            SELECT message_id FROM accounts WHERE message_id IS NOT NULL
+            UNION SELECT message_id FROM profiles WHERE message_id IS NOT NULL
+            UNION SELECT message_id FROM alts WHERE message_id IS NOT NULL
+            """
+        )
+        listed = {message_id for message_id, in listed}
+        stale = [(message_id,) for message_id in self.digests if message_id not in listed]
+        for message_id, in stale:
+            self.digests.pop(message_id, None)
+        if stale:
+            await self.bot.db.executemany("DELETE FROM listing_renders WHERE message_id = ?", stale)
+        return results
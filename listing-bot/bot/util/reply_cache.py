@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+import numpy as np
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+
+_rng = np.random.default_rng(0x5EED)
+# Multipliers stay below 2**29 so a * crc32 + b never overflows 64 bits
+_PERM_A = _rng.integers(1, 1 << 29, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+_MENTION = re.compile(r"<[@#][!&]?\d+>")
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACE = re.compile(r"\s+")
+
+CONTEXT_SEP = "\x00"
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop mentions and punctuation, collapse whitespace."""
+    text = _MENTION.sub(" ", text.lower())
+    text = _NON_WORD.sub(" ", text)
+    return _SPACE.sub(" ", text).strip()
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of the text's character shingles."""
+    padded = f" {text} "
+    shingles = {padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+    hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    # (a * h + b) mod p for every permutation at once
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % np.uint64(MERSENNE_PRIME)
+    return permuted.min(axis=1)
+
+
+class ReplyCache:
+    """
+    Remembers AI auto-replies so repeated questions don't cost a credit.
+
+    Lookups try the normalized question first, then near-duplicates found
+    through a MinHash LSH index over character shingles. Entries belong to
+    one ai_info version and are dropped as soon as it changes. Concurrent
+    identical questions share a single request.
+    """
+
+    def __init__(self, ttl: float = 6 * 3600, max_entries: int = 1000, threshold: float = 0.9, min_length: int = 12):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.min_length = min_length
+        self.scope = None
+        self._entries: OrderedDict[str, tuple[float, str, np.ndarray]] = OrderedDict()
+        self._buckets: dict[tuple, set[str]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    @staticmethod
+    def _bands(signature: np.ndarray) -> list[tuple]:
+        return [(band, signature[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+    def _use_scope(self, ai_info: str):
+        scope = hashlib.blake2b(ai_info.encode(), digest_size=16).hexdigest()
+        if scope != self.scope:
+            self.clear()
+            self.scope = scope
+
+    def clear(self):
+        self._entries.clear()
+        self._buckets.clear()
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[2] is None:
+            return
+        for band in self._bands(entry[2]):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def _fresh(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _similar(self, key: str, signature: np.ndarray) -> str | None:
+        candidates = set()
+        for band in self._bands(signature):
+            candidates |= self._buckets.get(band, set())
+        candidates.discard(key)
+        context = key.partition(CONTEXT_SEP)[0]
+
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            entry = self._entries.get(candidate)
+            # Only replies to questions asked in the same place are reused
+            if entry is None or candidate.partition(CONTEXT_SEP)[0] != context:
+                continue
+            score = float(np.mean(entry[2] == signature))
+            if score >= best_score:
+                best, best_score = candidate, score
+        return self._fresh(best) if best is not None else None
+
+    def put(self, key: str, reply: str, signature: np.ndarray = None):
+        self._remove(key)
+        self._entries[key] = (time.monotonic(), reply, signature)
+        if signature is not None:
+            for band in self._bands(signature):
+                self._buckets.setdefault(band, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def fetch(self, ai_info: str, question: str, fetcher: Callable[[], Awaitable[tuple[str, bool]]], context: str = "") -> str:
+        """
+        Return a reply to `question`, calling `fetcher` only when nothing close
+        enough is cached. The fetcher returns (reply, cacheable). `context` is
+        whatever else the prompt contains (e.g. the channel), replies are only
+        shared between questions with the same context.
+        """
+        self._use_scope(ai_info)
+        normalized = normalize(question)
+        key = f"{context}{CONTEXT_SEP}{normalized}"
+
+        reply = self._fresh(key)
+        if reply is not None:
+            self.exact_hits += 1
+            return reply
+
+        signature = minhash(normalized) if len(normalized) >= self.min_length else None
+        if signature is not None:
+            reply = self._similar(key, signature)
+            if reply is not None:
+                self.similar_hits += 1
+                return reply
+
+        task = self._inflight.get(key)
+        if task is not None:
+            reply, cacheable = await asyncio.shield(task)
+            if cacheable:
+                self.coalesced += 1
+                return reply
+            # Uncacheable replies (bans, empty answers) are about the first
+            # asker, everyone else waiting on them asks for themselves
+            self.misses += 1
+            reply, _ = await fetcher()
+            return reply
+
+        self.misses += 1
+        scope = self.scope
+
+        async def run():
+            reply, cacheable = await fetcher()
+            if cacheable and self.scope == scope:
+                self.put(key, reply, signature)
+            return reply, cacheable
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        reply, _ = await asyncio.shield(task)
+        return reply
+
+    def stats(self) -> dict:
+        saved = self.exact_hits + self.similar_hits + self.coalesced
+        lookups = saved + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "credits_saved": saved,
+            "hit_rate": round(saved / lookups, 4) if lookups else 0.0
+        }
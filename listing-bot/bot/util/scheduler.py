@@ -0,0 +1,202 @@
+import asyncio
+import heapq
+import time
+import uuid
+from typing import Awaitable, Callable
+
+import ujson as json
+
+# Jobs taken off the heap per wake-up, and how many handlers run at once
+MAX_BATCH = 100
+JOB_CONCURRENCY = 20
+
+# Failed jobs are retried with exponential backoff, then dropped
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF = 30
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class Job:
+    __slots__ = ("key", "kind", "due_at", "payload", "attempts")
+
+    def __init__(self, key: str, kind: str, due_at: float, payload: dict, attempts: int = 0):
+        self.key = key
+        self.kind = kind
+        self.due_at = due_at
+        self.payload = payload
+        self.attempts = attempts
+
+
+class Scheduler:
+    """
+    Durable delayed jobs, stored in scheduled_jobs and fired by one dispatcher
+    task instead of a sleeping coroutine per job.
+
+    Every job has a unique key; scheduling an existing key replaces the job and
+    cancelling it is a dict pop plus an indexed delete. Pending jobs live in a
+    heap ordered by due time, cancelled or replaced entries are skipped when
+    they surface. Every due job runs as its own task under a scheduler-wide
+    limit, so a slow handler never holds up the others. Jobs that came due
+    while the bot was offline run right after `start`.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.handlers: dict[str, Handler] = {}
+        self._jobs: dict[str, Job] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task = None
+        self._slots = asyncio.Semaphore(JOB_CONCURRENCY)
+        self._running: set[asyncio.Task] = set()
+
+        self.fired = 0
+        self.failed = 0
+
+    def register(self, kind: str, handler: Handler):
+        """Set the coroutine that runs jobs of this kind, it gets the job's payload."""
+        self.handlers[kind] = handler
+
+    async def start(self):
+        """Load persisted jobs and start dispatching, safe to call on every ready."""
+        if self._task is not None and not self._task.done():
+            return
+
+        rows = await self.db.fetchall("SELECT key, kind, due_at, payload, attempts FROM scheduled_jobs")
+        for key, kind, due_at, payload, attempts in rows:
+            if key not in self._jobs:
+                self._push(Job(key, kind, due_at, json.loads(payload or "{}"), attempts or 0))
+
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop dispatching, interrupted jobs stay stored and run again after the next start."""
+        tasks = list(self._running)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _push(self, job: Job):
+        self._jobs[job.key] = job
+        heapq.heappush(self._heap, (job.due_at, job.key))
+        self._wake.set()
+
+    async def schedule(self, kind: str, delay: float = 0, payload: dict = None, key: str = None, at: float = None) -> str:
+        """
+        Run `kind` after `delay` seconds, or at the unix timestamp `at`.
+        Returns the job's key, which replaces any job already using it.
+        """
+        key = key or uuid.uuid4().hex
+        job = Job(key, kind, at if at is not None else time.time() + delay, payload or {})
+
+        await self.db.execute(
+            """
+            INSERT INTO scheduled_jobs (key, kind, due_at, payload, attempts) VALUES (?, ?, ?, ?, 0)
+            ON CONFLICT(key) DO UPDATE SET
+                kind = excluded.kind, due_at = excluded.due_at, payload = excluded.payload, attempts = 0
+            """,
+            key, kind, job.due_at, json.dumps(job.payload)
+        )
+        self._push(job)
+        return key
+
+    async def cancel(self, key: str) -> bool:
+        """Drop a pending job, returns whether there was one."""
+        if self._jobs.pop(key, None) is None:
+            return False
+        await self.db.execute("DELETE FROM scheduled_jobs WHERE key = ?", key)
+        return True
+
+    def pending(self, key: str) -> bool:
+        return key in self._jobs
+
+    def _pop_due(self, now: float) -> list[Job]:
+        batch = []
+        while self._heap and self._heap[0][0] <= now and len(batch) < MAX_BATCH:
+            due_at, key = heapq.heappop(self._heap)
+            job = self._jobs.get(key)
+            # Cancelled, or replaced by a job with a different due time
+            if job is None or job.due_at != due_at:
+                continue
+            del self._jobs[key]
+            batch.append(job)
+        return batch
+
+    def _next_delay(self, now: float) -> float | None:
+        while self._heap:
+            due_at, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is not None and job.due_at == due_at:
+                return max(0.0, due_at - now)
+            heapq.heappop(self._heap)
+        return None
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            delay = self._next_delay(time.time())
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for job in self._pop_due(time.time()):
+                task = asyncio.create_task(self._run_job(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            # Let the jobs start before taking the next batch off the heap
+            await asyncio.sleep(0)
+
+    async def _call_handler(self, job: Job) -> bool:
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            print(f"No handler registered for scheduled job kind {job.kind}")
+            return False
+        async with self._slots:
+            try:
+                await handler(job.payload)
+                return True
+            except Exception as e:
+                print(f"Scheduled job {job.kind} ({job.key}) failed: {e}")
+                return False
+
+    async def _run_job(self, job: Job):
+        ok = await self._call_handler(job)
+        try:
+            await self._finish(job, ok)
+        except Exception as e:
+            print(f"Error updating scheduled job {job.kind} ({job.key}): {e}")
+
+    async def _finish(self, job: Job, ok: bool):
+        # The handler (or anyone else) scheduled the same key again, that row is the new job
+        if job.key in self._jobs:
+            return
+        if ok:
+            self.fired += 1
+            await self.db.execute("DELETE FROM scheduled_jobs WHERE key = ?", job.key)
+            return
+
+        self.failed += 1
+        job.attempts += 1
+        if job.attempts >= MAX_ATTEMPTS:
+            print(f"Dropping scheduled job {job.kind} ({job.key}) after {job.attempts} attempts")
+            await self.db.execute("DELETE FROM scheduled_jobs WHERE key = ?", job.key)
+            return
+
+        job.due_at = time.time() + RETRY_BACKOFF * 2 ** (job.attempts - 1)
+        self._push(job)
+        await self.db.execute("UPDATE scheduled_jobs SET due_at = ?, attempts = ? WHERE key = ?", job.due_at, job.attempts, job.key)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._jobs),
+            "running": len(self._running),
+            "fired": self.fired,
+            "failed": self.failed
+        }
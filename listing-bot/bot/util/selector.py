@@ -1,5 +1,4 @@
 import discord
-import aiohttp
 
 from .gamemode import gamemode_to_string
 from .constants import api_key
@@ -20,55 +19,55 @@ async def profile_selector(ctx: discord.AutocompleteContext):
     if not username:
         return []
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            uuid_result, status = await fetch_mojang_api(session, username)
-        except Exception:
-            return ["Something went wrong."]
+    http = ctx.bot.http_client
+    try:
+        uuid_result, status = await fetch_mojang_api(http, username)
+    except Exception:
+        return ["Something went wrong."]
 
-        uuid = None
-        if isinstance(uuid_result, dict):
-            uuid = uuid_result.get("id")
-        elif isinstance(uuid_result, str):
-            if uuid_result == "Invalid username.":
-                return ["Invalid username."]
-            uuid = uuid_result
-
-        if not uuid:
+    uuid = None
+    if isinstance(uuid_result, dict):
+        uuid = uuid_result.get("id")
+    elif isinstance(uuid_result, str):
+        if uuid_result == "Invalid username.":
             return ["Invalid username."]
+        uuid = uuid_result
 
-        try:
-            async with session.get(f"https://api.hypixel.net/v2/skyblock/profiles?key={api_key}&uuid={uuid}") as resp:
-                data = await resp.json()
-        except Exception:
-            return ["Something went wrong."]
+    if not uuid:
+        return ["Invalid username."]
+
+    try:
+        async with http.get(f"https://api.hypixel.net/v2/skyblock/profiles?key={api_key}&uuid={uuid}") as resp:
+            data = await resp.json()
+    except Exception:
+        return ["Something went wrong."]
 
-        if not data or data.get("success") is False:
-            return ["Something went wrong."]
+    if not data or data.get("success") is False:
+        return ["Something went wrong."]
 
-        profiles = data.get("profiles")
-        if not profiles:
-            return ["No profiles found."]
+    profiles = data.get("profiles")
+    if not profiles:
+        return ["No profiles found."]
 
-        strings = []
-        for profile in profiles:
-            cute = profile.get("cute_name", "Unknown")
-            gm = gamemode_to_string(profile.get("game_mode"))
-            string = f"{cute} {gm}"
-            if profile.get("selected", False):
-                strings.insert(0, string)
-            else:
-                strings.append(string)
+    strings = []
+    for profile in profiles:
+        cute = profile.get("cute_name", "Unknown")
+        gm = gamemode_to_string(profile.get("game_mode"))
+        string = f"{cute} {gm}"
+        if profile.get("selected", False):
+            strings.insert(0, string)
+        else:
+            strings.append(string)
 
-        choices = []
-        for s in strings[:25]:
-            try:
-                choices.append(OptionChoice(name=s, value=handle_selection(s)))
-            except Exception:
-                choices.append(handle_selection(s))
+    choices = []
+    for s in strings[:25]:
+        try:
+            choices.append(OptionChoice(name=s, value=handle_selection(s)))
+        except Exception:
+            choices.append(handle_selection(s))
 
-        return choices
-            
+    return choices
+        
 def handle_selection(selection: str):
     """
     Returns the cute name of the selected profile.
@@ -1,13 +1,11 @@
 from bot.bot import Bot
 import discord
-import aiohttp
 import os
 from bot.util.listing_objects.ticket import OpenedTicket
 from bot.util.fetch import fetch_mojang_api
 from bot.util.calcs import calculate_coin_price
 from bot.util.transform import unabbreviate
 from bot.util.get_default_overwrites import get_default_overwrites, get_role_config_name
-import aiohttp
 from dotenv import load_dotenv
 
 from bot.util.constants import port
@@ -37,13 +35,12 @@ class LowballView(discord.ui.View):
             if interaction.user.id in self.bot.owner_ids:
                 return True
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"http://{BOT_SERVICE_HOST}:{port}/seller?user_id={interaction.user.id}&api_key=API_KEY") as resp:
-                    data: dict = await resp.json()
-                    if data.get("response"):
-                        return True
-                    
-                    return False
+            async with self.bot.http_client.get(f"http://{BOT_SERVICE_HOST}:{port}/seller?user_id={interaction.user.id}&api_key=API_KEY") as resp:
+                data: dict = await resp.json()
+                if data.get("response"):
+                    return True
+                
+                return False
             return True
         
         if await check_authorized():
@@ -99,13 +96,12 @@ class SellGoods(discord.ui.Modal):
         payment_method = self.children[1].value
         offer = self.children[2].value
 
-        async with aiohttp.ClientSession() as session:
-            data, status = await fetch_mojang_api(session, username)
-            if data["id"] == "Invalid username.":
-                response_embed.title = "An Error Occurred"
-                response_embed.description = "The username you provided is invalid."
-                await interaction.respond(embed=response_embed, ephemeral=True)
-                return
+        data, status = await fetch_mojang_api(self.bot.http_client, username)
+        if data["id"] == "Invalid username.":
+            response_embed.title = "An Error Occurred"
+            response_embed.description = "The username you provided is invalid."
+            await interaction.respond(embed=response_embed, ephemeral=True)
+            return
 
         category = await self.bot.db.get_config(f"sell_{self.good}_category")
         category: discord.CategoryChannel = self.bot.get_channel(category)
@@ -232,13 +228,12 @@ class CoinTicket(discord.ui.Modal):
         payment_method = self.children[1].value
         amount = self.children[2].value
 
-        async with aiohttp.ClientSession() as session:
-            data, status = await fetch_mojang_api(session, username)
-            if data["id"] == "Invalid username.":
-                response_embed.title = "An Error Occurred"
-                response_embed.description = "The username you provided is invalid."
-                await interaction.respond(embed=response_embed, ephemeral=True)
-                return
+        data, status = await fetch_mojang_api(self.bot.http_client, username)
+        if data["id"] == "Invalid username.":
+            response_embed.title = "An Error Occurred"
+            response_embed.description = "The username you provided is invalid."
+            await interaction.respond(embed=response_embed, ephemeral=True)
+            return
 
         category = await self.bot.db.get_config(f"coins_{self.verb.lower()}_category")
         category: discord.CategoryChannel = self.bot.get_channel(category)
@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import hashlib
+import os
+
+import discord
+from chat_exporter.construct.transcript import Transcript
+
+from .attachment_handler import CustomHandler
+
+TRANSCRIPT_DIR = "./templates"
+
+# Rendering runs on the event loop, so only a couple of tickets render at once
+# and closing many tickets together queues instead of freezing the bot
+RENDER_CONCURRENCY = 2
+CHUNK_SIZE = 256 * 1024
+COMPRESS_LEVEL = 6
+
+_render_slots = asyncio.Semaphore(RENDER_CONCURRENCY)
+
+
+class TranscriptInfo:
+    def __init__(self, name: str, path: str, size: int, compressed_size: int, message_count: int, digest: str):
+        self.name = name
+        self.path = path
+        self.size = size
+        self.compressed_size = compressed_size
+        self.message_count = message_count
+        self.digest = digest
+
+
+def transcript_name(bot_name: str, channel_id: int, opened_by: int) -> str:
+    return f"{bot_name}-{channel_id}-{opened_by}.html"
+
+def _write_compressed(path: str, html: str) -> tuple[int, int, str]:
+    """Gzip `html` to `path` chunk by chunk, returns (size, compressed size, digest)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = memoryview(html.encode())
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    tmp_path = f"{path}.tmp"
+    # No name or timestamp in the header, the same HTML always gives the same bytes
+    with open(tmp_path, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=COMPRESS_LEVEL, mtime=0) as f:
+        for start in range(0, len(data), CHUNK_SIZE):
+            f.write(data[start:start + CHUNK_SIZE])
+    os.replace(tmp_path, path)
+    return len(data), os.path.getsize(path), digest
+
+async def save_transcript(bot, channel: discord.TextChannel, opened_by: int) -> TranscriptInfo:
+    """
+    Render the channel's transcript and store it gzipped under TRANSCRIPT_DIR,
+    indexed in the transcripts table. Compression and file I/O happen in a
+    worker thread.
+    """
+    async with _render_slots:
+        # history() pages 100 messages per request, newest first like chat_exporter expects
+        messages = [message async for message in channel.history(limit=None)]
+        message_count = len(messages)
+        html = (
+            await Transcript(
+                channel=channel,
+                limit=None,
+                messages=messages,
+                pytz_timezone="UTC",
+                military_time=True,
+                fancy_times=True,
+                before=None,
+                after=None,
+                support_dev=True,
+                bot=bot,
+                attachment_handler=CustomHandler()
+            ).export()
+        ).html
+        del messages
+
+    name = transcript_name(bot.bot_name, channel.id, opened_by)
+    path = os.path.join(TRANSCRIPT_DIR, f"{name}.gz")
+    size, compressed_size, digest = await asyncio.to_thread(_write_compressed, path, html)
+
+    await bot.db.execute(
+        """
+        INSERT INTO transcripts (name, channel_id, opened_by, path, size, compressed_size, message_count, digest)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            path = excluded.path, size = excluded.size, compressed_size = excluded.compressed_size,
+            message_count = excluded.message_count, digest = excluded.digest, created_at = CURRENT_TIMESTAMP
+        """,
+        name, channel.id, opened_by, path, size, compressed_size, message_count, digest
+    )
+    return TranscriptInfo(name, path, size, compressed_size, message_count, digest)
+
+def find_transcript(name: str, bot_name: str) -> tuple[str, bool] | None:
+    """
+    Path of a stored transcript and whether it is gzipped. `name` may omit the
+    bot name prefix; transcripts saved before compression are plain .html.
+    """
+    if name != os.path.basename(name) or name.startswith("."):
+        return None
+
+    for candidate in (name, f"{bot_name}-{name}"):
+        path = os.path.join(TRANSCRIPT_DIR, candidate)
+        if os.path.isfile(f"{path}.gz"):
+            return f"{path}.gz", True
+        if os.path.isfile(path):
+            return path, False
+    return None
+
+async def iter_file(path: str, opener=open):
+    """Yield a file in chunks, reading from a worker thread."""
+    f = await asyncio.to_thread(opener, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+def iter_decompressed(path: str):
+    return iter_file(path, opener=gzip.open)
@@ -13,7 +13,7 @@ async def validate_sellauth_data(bot: Bot, api_key: str, store_id: str):
         "perPage": 1,
     }
     
-    async with bot.session.get(url, json=json_data, headers=headers) as response:
+    async with bot.http_client.get(url, json=json_data, headers=headers) as response:
         if response.status != 200:
             return False
         return True
@@ -1,4 +1,4 @@
-import aiohttp
+import asyncio
 import discord
 
 import discord.ext
@@ -8,10 +8,17 @@ from bot.bot import Bot
 from .calcs import *
 from .fetch import fetch_mojang_api, fetch_profile_data
 from .gamemode import gamemode_to_string
+from .ratelimit import TokenBucket
+from .mojang import mojang_resolver
 
 from bot.util.list import list_account, list_profile
 from bot.util.get_payment_methods import get_payment_methods
 
+# Bulk valuation limits, shared by every bulk command running on this bot
+BULK_CONCURRENCY = 8
+BULK_NAME_TIMEOUT = 30
+SKYBLOCK_BUCKET = TokenBucket(rate=4, capacity=8)
+
 
 def create_embed(
         value_type: str, value_data: dict,
@@ -348,36 +355,20 @@ class ToggleView(discord.ui.View):
             else:
                 button.style = discord.ButtonStyle.green
 
-async def old_lowball(ctx, bot, username: str, profile: str=None, uuid: str=None, just_embed: bool=False):
-    if isinstance(ctx, discord.ApplicationContext) and not just_embed:
-        await ctx.defer(ephemeral=True)
-
-    async with aiohttp.ClientSession() as session:
-        if not uuid:
-            mojang_api, status = await fetch_mojang_api(session, username)
-        else:
-            mojang_api = {"id": uuid, "name": username}
-
-        if mojang_api.get("id") is None:
-            if not just_embed:
-                embed = discord.Embed(
-                    title="Error",
-                    description="This username doesn't exist",
-                    color=discord.Color.red()
-                )
-                return await ctx.respond(embed=embed, ephemeral=True)
-            
-            return None, None
-    
-        profile_data, cute_name = await fetch_profile_data(session, mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
-
-    if not profile_data:
-        return None, None
-
-    # Get both value types
-    standard_values = gather_value(profile_data)  # Get standard values first
-    lowball_values = gather_lowball_value(profile_data)  # Get lowball values
+def value_embed(bot, mojang_api: dict, profile_data: dict):
+    return create_embed(
+        value_type="Value",
+        value_data=gather_value(profile_data),
+        username=mojang_api['name'],
+        cute_name=profile_data['name'],
+        profile_type=gamemode_to_string(profile_data['gamemode']),
+        bot=bot,
+        coop=False,
+        uuid=mojang_api['id']
+    )
 
+def lowball_embed(bot, mojang_api: dict, profile_data: dict):
+    standard_values, lowball_values = gather_values(profile_data)
     embed, view = create_embed(
         value_type="Lowball",
         value_data=lowball_values,
@@ -390,8 +381,84 @@ async def old_lowball(ctx, bot, username: str, profile: str=None, uuid: str=None
         disabled_values=[]
     )
 
-    # Now we need to modify the view's original_data to be the standard values
+    # Toggling back to "Value" should show the standard values
     view.original_data = standard_values
+    return embed, view
+
+async def value_username(bot, username: str, lowball: bool = False):
+    """Value one account for a bulk run, returns (embed, view) or (None, None)."""
+    mojang_api, status = await fetch_mojang_api(bot.http_client, username)
+    if status != 200:
+        return None, None
+
+    await SKYBLOCK_BUCKET.acquire()
+    profile_data, _ = await fetch_profile_data(mojang_api['id'], bot, allow_error_handler=False)
+    if not profile_data:
+        return None, None
+
+    if lowball:
+        return lowball_embed(bot, mojang_api, profile_data)
+    return value_embed(bot, mojang_api, profile_data)
+
+async def bulk_valuations(bot, usernames: list[str], lowball: bool = False):
+    """
+    Value many accounts concurrently on the bot's shared HTTP client, yielding
+    (username, embed, view) as each one finishes. A failed or timed out name
+    yields (username, None, None) without holding up the rest.
+    """
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+    # Warm the resolver in batches so each valuation finds its UUID cached
+    try:
+        await mojang_resolver.resolve_many(bot.http_client, usernames)
+    except Exception as e:
+        print(f"Bulk Mojang lookup failed, resolving names one by one: {e}")
+
+    async def run(username: str):
+        async with semaphore:
+            try:
+                embed, view = await asyncio.wait_for(
+                    value_username(bot, username, lowball),
+                    timeout=BULK_NAME_TIMEOUT
+                )
+            except Exception as e:
+                print(f"Bulk valuation failed for {username}: {e}")
+                embed, view = None, None
+            return username, embed, view
+
+    tasks = [asyncio.create_task(run(username)) for username in usernames]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def old_lowball(ctx, bot, username: str, profile: str=None, uuid: str=None, just_embed: bool=False):
+    if isinstance(ctx, discord.ApplicationContext) and not just_embed:
+        await ctx.defer(ephemeral=True)
+
+    if not uuid:
+        mojang_api, status = await fetch_mojang_api(bot.http_client, username)
+    else:
+        mojang_api = {"id": uuid, "name": username}
+
+    if mojang_api.get("id") is None:
+        if not just_embed:
+            embed = discord.Embed(
+                title="Error",
+                description="This username doesn't exist",
+                color=discord.Color.red()
+            )
+            return await ctx.respond(embed=embed, ephemeral=True)
+        
+        return None, None
+
+    profile_data, cute_name = await fetch_profile_data(mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
+
+    if not profile_data:
+        return None, None
+
+    embed, view = lowball_embed(bot, mojang_api, profile_data)
 
     if just_embed:
         return embed, view
@@ -404,37 +471,24 @@ async def old_value(ctx, bot, username: str, profile: str=None, just_embed: bool
     if isinstance(ctx, discord.ApplicationContext) and not just_embed:
         await ctx.defer(ephemeral=True)
 
-    async with aiohttp.ClientSession() as session:
+    mojang_api, status = await fetch_mojang_api(bot.http_client, username)
+    if mojang_api.get("id") is None:
+        if not just_embed:
+            embed = discord.Embed(
+                title="Error",
+                description="This username doesn't exist",
+                color=discord.Color.red()
+            )
+            return await ctx.respond(embed=embed, ephemeral=True)
         
-        mojang_api, status = await fetch_mojang_api(session, username)
-        if mojang_api.get("id") is None:
-            if not just_embed:
-                embed = discord.Embed(
-                    title="Error",
-                    description="This username doesn't exist",
-                    color=discord.Color.red()
-                )
-                return await ctx.respond(embed=embed, ephemeral=True)
-            
-            return None, None
-    
-        profile_data, cute_name  = await fetch_profile_data(session, mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
+        return None, None
+
+    profile_data, cute_name  = await fetch_profile_data(mojang_api['id'], bot, profile, allow_error_handler=False if just_embed else True)
 
     if not profile_data:
         return None, None
-    
-    value_data = gather_value(profile_data)
 
-    embed, view = create_embed(
-        value_type="Value",
-        value_data=value_data,
-        username=mojang_api['name'],
-        cute_name=profile_data['name'],
-        profile_type=gamemode_to_string(profile_data['gamemode']),
-        bot=bot,
-        coop=False,
-        uuid=mojang_api['id']
-    )
+    embed, view = value_embed(bot, mojang_api, profile_data)
 
     if just_embed:
         if return_profile_information:
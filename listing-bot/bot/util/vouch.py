@@ -1,7 +1,72 @@
 from bot.bot import Bot
+from typing import Optional, Tuple
 import discord
 import re
 
+VOUCH_COLUMNS = ("user_id", "message", "avatar", "username", "mentioned_user_id", "amount", "spent")
+
+SPENT_PATTERN = re.compile(r'(\d+)\$|\$(\d+)|(\d+)\s?bucks')
+
+def extract_amount_from_message(message):
+    """Extract dollar amount from vouch message"""
+    if not message:
+        return 0.0
+    
+    # Patterns to match: $50, 50$, 50 bucks, etc.
+    patterns = [
+        r'(\d+(?:\.\d{2})?)\$',  # 50$ or 50.99$
+        r'\$(\d+(?:\.\d{2})?)',  # $50 or $50.99
+        r'(\d+(?:\.\d{2})?)\s?(?:bucks?|dollars?)',  # 50 bucks, 50 dollars
+        r'(\d+(?:\.\d{2})?)\s?(?:usd|USD)',  # 50 USD
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, message, re.IGNORECASE)
+        if match:
+            try:
+                return float(match.group(1))
+            except (ValueError, IndexError):
+                continue
+    
+    return 0.0
+
+def extract_spent_from_message(message) -> int:
+    """Whole dollars a customer spent according to their vouch, as counted for milestones and the leaderboard"""
+    if not message:
+        return 0
+
+    matches = SPENT_PATTERN.findall(message)
+    amounts = [int(match) for group in matches for match in group if match and match.isdigit()]
+    return max(amounts) if amounts else 0
+
+def extract_mentioned_user_from_message(message):
+    """Extract mentioned user ID from vouch message using regex"""
+    if not message:
+        return None
+    
+    # Look for Discord mention pattern: <@userid> or <@!userid>
+    pattern = r'<@!?(\d+)>'
+    match = re.search(pattern, message)
+    
+    if match:
+        try:
+            return int(match.group(1))
+        except ValueError:
+            pass
+    
+    return None
+
+def parse_vouch(message: str) -> Tuple[Optional[int], float]:
+    """Returns the (mentioned_user_id, amount) stored alongside a vouch."""
+    return extract_mentioned_user_from_message(message), extract_amount_from_message(message)
+
+def vouch_row(user_id: int, message: str, avatar: str, username: str) -> tuple:
+    """Build a vouches row in VOUCH_COLUMNS order, with the parsed seller, amount and spent."""
+    return (user_id, message, avatar, username, *parse_vouch(message), extract_spent_from_message(message))
+
+async def store_vouch(bot: Bot, user_id: int, message: str, avatar: str, username: str):
+    await bot.db.insert_many("vouches", VOUCH_COLUMNS, [vouch_row(user_id, message, avatar, username)])
+
 async def insert_vouch(bot: Bot, user_id: int, content: str, author: discord.User, anonymous: bool = False) -> bool:
     pattern = r'(\d+)\$|\$(\d+)|(\d+)\s?bucks'
     matches = re.findall(pattern, content)
@@ -22,5 +87,5 @@ async def insert_vouch(bot: Bot, user_id: int, content: str, author: discord.Use
         profile_picture = author.avatar.url if author.avatar else author.default_avatar.url
         username = author.display_name
 
-    await bot.db.execute("INSERT INTO vouches (user_id, message, avatar, username) VALUES (?, ?, ?, ?)", user_id, content, profile_picture, username)
+    await store_vouch(bot, user_id, content, profile_picture, username)
     return True
\ No newline at end of file
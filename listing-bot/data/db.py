@@ -2,21 +2,77 @@ import aiosqlite
 import asyncio
 import logging
 import re
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+# Database instance whose transaction() the current task is running inside
+_transaction_owner: ContextVar[Optional["Database"]] = ContextVar("transaction_owner", default=None)
+
+# Raw statements that write the config table, used to invalidate the config cache
+_CONFIG_WRITE = re.compile(r'\b(?:INTO|UPDATE|FROM)\s+"?config"?(?:[\s(]|$)', re.IGNORECASE)
+
+# Applied to every connection. WAL lets the read pool run alongside the writer,
+# and synchronous=NORMAL only fsyncs on checkpoints, which is safe in WAL mode
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",  # ~16 MiB page cache
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
 
 class Database:
-    def __init__(self, db_path: str, max_retries: int = 3, retry_delay: float = 1.0):
+    def __init__(self, db_path: str, max_retries: int = 3, retry_delay: float = 1.0,
+                 batch_writes: bool = False, batch_interval: float = 0.005, batch_size: int = 200,
+                 read_pool_size: int = 4):
+        """
+        Args:
+            db_path: Path to the SQLite file
+            max_retries: Attempts for connecting and non-batched statements
+            retry_delay: Seconds to wait between attempts
+            batch_writes: Group-commit mode. Writes are queued and committed together
+                every batch_interval seconds or batch_size statements, whichever comes first
+            batch_interval: Seconds the writer waits to collect a batch
+            batch_size: Maximum statements per committed batch
+            read_pool_size: Read-only connections that fetch/fetchone/fetchall round-robin over,
+                0 to run reads on the writer connection
+        """
         self.db_path = db_path
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.conn = None
 
+        self.batch_writes = batch_writes
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self._write_lock = asyncio.Lock()
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+        self.read_pool_size = read_pool_size
+        self._read_pool: list = []
+        self._read_index = 0
+
+        # Typed copy of the config table, None until loaded or after an invalidating write
+        self._config: Optional[Dict[str, Any]] = None
+        self._config_version = 0
+
     async def connect(self):
         for attempt in range(self.max_retries):
             try:
                 self.conn = await aiosqlite.connect(self.db_path)
+                await self.conn.execute("PRAGMA journal_mode = WAL")
+                for pragma in CONNECTION_PRAGMAS:
+                    await self.conn.execute(pragma)
+                self._start_writer()
                 await self._update_schema() 
                 await self.initialize_schema()
+                await self._backfill_vouches()
+                await self._backfill_customer_spend()
                 await self.ensure_required_tables_data()  # Add this line
+                await self._open_read_pool()
+                await self._load_config()
                 break
             except Exception as e:
                 logging.error(f"Failed to connect to database (attempt {attempt + 1}/{self.max_retries}): {e}")
@@ -25,9 +81,40 @@ class Database:
             raise Exception("Failed to connect to the database after multiple attempts")
 
     async def close(self):
+        if self._writer_task:
+            await self.flush()
+            self._writer_task.cancel()
+            self._writer_task = None
+        await self._close_read_pool()
         if self.conn:
             await self.conn.close()
 
+    async def _open_read_pool(self):
+        await self._close_read_pool()
+        if self.db_path == ":memory:":
+            return
+
+        for _ in range(self.read_pool_size):
+            reader = await aiosqlite.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            for pragma in CONNECTION_PRAGMAS:
+                await reader.execute(pragma)
+            self._read_pool.append(reader)
+
+    async def _close_read_pool(self):
+        pool, self._read_pool = self._read_pool, []
+        for reader in pool:
+            try:
+                await reader.close()
+            except Exception as e:
+                logging.error(f"Failed to close read connection: {e}")
+
+    def _reader(self):
+        """Next read-only connection, or the writer when the pool is empty or inside a transaction."""
+        if not self._read_pool or _transaction_owner.get() is self:
+            return self.conn
+        self._read_index = (self._read_index + 1) % len(self._read_pool)
+        return self._read_pool[self._read_index]
+
     async def ensure_connection(self):
         if not self.conn or not self.conn._conn:
             await self.connect()
@@ -41,41 +128,169 @@ class Database:
         Returns:
             bool: True if update succeeded
         """
-        await self.ensure_connection()
         try:
-            data_type = type(value).__name__
-            
-            await self.conn.execute("DELETE FROM config WHERE key = ?", (option,))
-            
-            await self.conn.execute(
-                "INSERT INTO config (key, value, data_type) VALUES (?, ?, ?)",
-                (option, str(value), data_type)
-            )
-            await self.conn.commit()
+            await self._write_config(option, value)
             return True
         except Exception as e:
             print(f"Error updating config: {e}")
             return False
 
+    def _start_writer(self):
+        if not self.batch_writes or (self._writer_task and not self._writer_task.done()):
+            return
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+
+    async def _writer(self):
+        """Single writer for group-commit mode: drains the queue and commits each batch once."""
+        while True:
+            batch = [await self._write_queue.get()]
+            await asyncio.sleep(self.batch_interval)
+            while len(batch) < self.batch_size and not self._write_queue.empty():
+                batch.append(self._write_queue.get_nowait())
+
+            try:
+                await self._commit_batch(batch)
+            except Exception as e:
+                logging.error(f"Failed to commit write batch of {len(batch)} statements: {e}")
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    async def _commit_batch(self, batch: list):
+        results = []
+        async with self._write_lock:
+            for query, args, many, future in batch:
+                try:
+                    if many:
+                        cursor = await self.conn.executemany(query, args)
+                    else:
+                        cursor = await self.conn.execute(query, args)
+                    results.append((future, cursor, None))
+                except Exception as e:
+                    logging.error(f"Failed to execute batched query: {e}")
+                    results.append((future, None, e))
+
+            try:
+                await self.conn.commit()
+            except Exception:
+                await self.conn.rollback()
+                raise
+
+        for future, cursor, error in results:
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(cursor)
+
+    async def _enqueue(self, query: str, args, many: bool = False):
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((query, args, many, future))
+        return await future
+
+    async def flush(self):
+        """Wait until every queued write has been committed."""
+        if self._write_queue is not None and self._writer_task and not self._writer_task.done():
+            await self._write_queue.join()
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run several statements atomically with a single commit.
+
+        Every execute/executemany awaited inside the block (from the same task)
+        joins the transaction. Nested transaction() blocks are flattened.
+
+        Usage:
+            async with bot.db.transaction():
+                await bot.db.execute(...)
+                await bot.db.executemany(...)
+        """
+        if _transaction_owner.get() is self:
+            yield self
+            return
+
+        await self.ensure_connection()
+        async with self._write_lock:
+            token = _transaction_owner.set(self)
+            try:
+                yield self
+                await self.conn.commit()
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            finally:
+                _transaction_owner.reset(token)
+
     async def execute(self, query: str, *args):
         await self.ensure_connection()
+        self._check_config_write(query)
+        if _transaction_owner.get() is self:
+            return await self.conn.execute(query, args)
+        if self.batch_writes:
+            return await self._enqueue(query, args)
+
         for attempt in range(self.max_retries):
             try:
-                async with self.conn.cursor() as cursor:
-                    await cursor.execute(query, args)
-                    await self.conn.commit()
-                    return cursor
+                async with self._write_lock:
+                    async with self.conn.cursor() as cursor:
+                        await cursor.execute(query, args)
+                        await self.conn.commit()
+                        return cursor
             except Exception as e:
                 logging.error(f"Failed to execute query (attempt {attempt + 1}/{self.max_retries}): {e}")
                 await asyncio.sleep(self.retry_delay)
         else:
             raise Exception("Failed to execute query after multiple attempts")
 
+    async def executemany(self, query: str, rows: Iterable[Sequence]):
+        """Execute one statement for every parameter tuple in rows with a single commit."""
+        rows = list(rows)
+        if not rows:
+            return None
+
+        await self.ensure_connection()
+        self._check_config_write(query)
+        if _transaction_owner.get() is self:
+            return await self.conn.executemany(query, rows)
+        if self.batch_writes:
+            return await self._enqueue(query, rows, many=True)
+
+        for attempt in range(self.max_retries):
+            try:
+                async with self._write_lock:
+                    cursor = await self.conn.executemany(query, rows)
+                    await self.conn.commit()
+                    return cursor
+            except Exception as e:
+                logging.error(f"Failed to execute many (attempt {attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(self.retry_delay)
+        else:
+            raise Exception("Failed to execute many after multiple attempts")
+
+    async def insert_many(self, table: str, columns: Sequence[str], rows: Iterable[Sequence]):
+        """
+        Bulk insert rows into a table.
+
+        Args:
+            table: Table name
+            columns: Column names, in the order of each row's values
+            rows: Iterable of value tuples
+        """
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        return await self.executemany(f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})', rows)
+
     async def fetch(self, query: str, *args):
         await self.ensure_connection()
         for attempt in range(self.max_retries):
             try:
-                async with self.conn.cursor() as cursor:
+                async with self._reader().cursor() as cursor:
                     await cursor.execute(query, args)
                     return await cursor.fetchall()
             except Exception as e:
@@ -88,7 +303,7 @@ class Database:
         await self.ensure_connection()
         for attempt in range(self.max_retries):
             try:
-                async with self.conn.cursor() as cursor:
+                async with self._reader().cursor() as cursor:
                     await cursor.execute(query, args)
                     return await cursor.fetchone()
             except Exception as e:
@@ -101,7 +316,7 @@ class Database:
         await self.ensure_connection()
         for attempt in range(self.max_retries):
             try:
-                async with self.conn.cursor() as cursor:
+                async with self._reader().cursor() as cursor:
                     await cursor.execute(query, args)
                     return await cursor.fetchall()
             except Exception as e:
@@ -110,30 +325,84 @@ class Database:
         else:
             raise Exception("Failed to fetch all after multiple attempts")
         
+    @staticmethod
+    def _convert_config(value: str, data_type: str):
+        if data_type == 'int':
+            return int(value)
+        elif data_type == 'float':
+            return float(value)
+        elif data_type == 'bool':
+            return value.lower() in ('true', '1')
+        else:
+            return value
+
+    def _check_config_write(self, query: str):
+        """Drop the config cache when a raw statement writes the config table."""
+        if _CONFIG_WRITE.search(query):
+            self._config = None
+            self._config_version += 1
+
+    async def _load_config(self):
+        version = self._config_version
+        rows = await self.fetchall("SELECT key, value, data_type FROM config ORDER BY rowid")
+
+        config = {}
+        for key, value, data_type in rows or []:
+            # Keep the first row per key, matching what a single SELECT returned
+            if key in config:
+                continue
+            try:
+                config[key] = self._convert_config(value, data_type)
+            except (ValueError, TypeError, AttributeError) as e:
+                logging.error(f"Invalid stored value for config {key} ({data_type}): {e}")
+                config[key] = value
+
+        # A write raced the load; leave the cache empty so the next read reloads
+        if version == self._config_version:
+            self._config = config
+        return config
+
+    async def _write_config(self, key: str, value: Any):
+        data_type = type(value).__name__
+        async with self.transaction():
+            await self.conn.execute("DELETE FROM config WHERE key = ?", (key,))
+            await self.conn.execute(
+                "INSERT INTO config (key, value, data_type) VALUES (?, ?, ?)",
+                (key, str(value), data_type)
+            )
+        if self._config is not None:
+            # Round-trip through the stored representation so reads match the database
+            self._config[key] = self._convert_config(str(value), data_type)
+
     async def get_config(self, key: str):
-        query = "SELECT value, data_type FROM config WHERE key = ?"
-        result = await self.fetchone(query, key)
-        if result:
-            value, data_type = result
-            if data_type == 'int':
-                return int(value)
-            elif data_type == 'float':
-                return float(value)
-            elif data_type == 'bool':
-                return value.lower() in ('true', '1')
-            else:
-                return value
-        return None
+        config = self._config
+        if config is None:
+            await self.ensure_connection()
+            config = await self._load_config()
+        return config.get(key)
+
+    async def get_configs(self, prefix: str = "") -> Dict[str, Any]:
+        """
+        Get every config option whose key starts with prefix.
+
+        Returns:
+            Dict of key -> typed value
+        """
+        config = self._config
+        if config is None:
+            await self.ensure_connection()
+            config = await self._load_config()
+        return {key: value for key, value in config.items() if key.startswith(prefix)}
     
     async def set_config(self, key: str, value: any):
-        data_type = type(value).__name__
-        query = "INSERT OR REPLACE INTO config (key, value, data_type) VALUES (?, ?, ?)"
-        await self.execute(query, key, str(value), data_type)
+        await self._write_config(key, value)
         return True
     
     async def delete_config(self, key: str):
-        query = "DELETE FROM config WHERE key = ?"
-        await self.execute(query, key)
+        async with self.transaction():
+            await self.conn.execute("DELETE FROM config WHERE key = ?", (key,))
+        if self._config is not None:
+            self._config.pop(key, None)
         return True
     
     async def _update_schema(self):
@@ -318,6 +587,63 @@ class Database:
         await cursor.close()
         logging.info("Database schema check complete.")
 
+    async def _backfill_vouches(self):
+        """
+        Parses the seller and amount of vouches stored before those columns existed
+        (amount IS NULL) and rebuilds seller_vouch_stats from them.
+        """
+        rows = await self.conn.execute_fetchall("SELECT rowid, message FROM vouches WHERE amount IS NULL")
+        if not rows:
+            return
+
+        # Imported here, bot.util.vouch imports the bot package which imports this module
+        from bot.util.vouch import parse_vouch
+
+        logging.info(f"Backfilling seller and amount for {len(rows)} vouches...")
+        updates = [(*parse_vouch(message), rowid) for rowid, message in rows]
+        async with self.transaction():
+            await self.executemany("UPDATE vouches SET mentioned_user_id = ?, amount = ? WHERE rowid = ?", updates)
+            await self.execute("DELETE FROM seller_vouch_stats")
+            await self.execute(
+                """
+                INSERT INTO seller_vouch_stats (user_id, vouch_count, total_amount)
+                SELECT mentioned_user_id, COUNT(*), SUM(amount)
+                FROM vouches
+                WHERE mentioned_user_id IS NOT NULL
+                GROUP BY mentioned_user_id
+                """
+            )
+
+    async def _backfill_customer_spend(self):
+        """
+        Parses the spent amount of vouches stored before that column existed
+        (spent IS NULL) and rebuilds customer_spend from them.
+        """
+        rows = await self.conn.execute_fetchall("SELECT rowid, message FROM vouches WHERE spent IS NULL")
+        if not rows:
+            return
+
+        from bot.util.vouch import extract_spent_from_message
+
+        logging.info(f"Backfilling spent amount for {len(rows)} vouches...")
+        updates = [(extract_spent_from_message(message), rowid) for rowid, message in rows]
+        async with self.transaction():
+            await self.executemany("UPDATE vouches SET spent = ? WHERE rowid = ?", updates)
+            await self.execute("DELETE FROM customer_spend")
+            await self.execute(
+                """
+                INSERT INTO customer_spend (user_id, total_spent, purchase_count, username)
+                SELECT user_id, SUM(spent), COUNT(*), (
+                    SELECT latest.username FROM vouches AS latest
+                    WHERE latest.user_id = vouches.user_id AND latest.spent > 0
+                    ORDER BY latest.rowid DESC LIMIT 1
+                )
+                FROM vouches
+                WHERE spent > 0
+                GROUP BY user_id
+                """
+            )
+
     async def initialize_schema(self):
         schema = DatabaseSchema()
         for query in schema.create_table_queries:
@@ -421,10 +747,160 @@ class DatabaseSchema:
                 "user_id" INTEGER,
                 "message" TEXT,
                 "avatar" TEXT,
-                "username" TEXT
+                "username" TEXT,
+                "mentioned_user_id" INTEGER,
+                "amount" REAL,
+                "spent" INTEGER
+            );
+            """,
+            # mentioned_user_id/amount/spent are parsed once at insert time (bot.util.vouch.vouch_row),
+            # seller_vouch_stats and customer_spend are kept in sync with them by the triggers below
+            """
+            CREATE INDEX IF NOT EXISTS "idx_vouches_mentioned_user_id" ON "vouches" ("mentioned_user_id")
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "seller_vouch_stats" (
+                "user_id" INTEGER,
+                "vouch_count" INTEGER DEFAULT 0,
+                "total_amount" REAL DEFAULT 0.0
             );
             """,
             """
+            CREATE UNIQUE INDEX IF NOT EXISTS "idx_seller_vouch_stats_user_id" ON "seller_vouch_stats" ("user_id")
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS "trg_vouches_insert_stats" AFTER INSERT ON "vouches"
+            WHEN NEW."mentioned_user_id" IS NOT NULL
+            BEGIN
+                INSERT INTO "seller_vouch_stats" ("user_id", "vouch_count", "total_amount")
+                VALUES (NEW."mentioned_user_id", 1, COALESCE(NEW."amount", 0))
+                ON CONFLICT ("user_id") DO UPDATE SET
+                    "vouch_count" = "vouch_count" + 1,
+                    "total_amount" = "total_amount" + excluded."total_amount";
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS "trg_vouches_delete_stats" AFTER DELETE ON "vouches"
+            WHEN OLD."mentioned_user_id" IS NOT NULL
+            BEGIN
+                UPDATE "seller_vouch_stats" SET
+                    "vouch_count" = "vouch_count" - 1,
+                    "total_amount" = "total_amount" - COALESCE(OLD."amount", 0)
+                WHERE "user_id" = OLD."mentioned_user_id";
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS "trg_vouches_update_stats" AFTER UPDATE OF "mentioned_user_id", "amount" ON "vouches"
+            BEGIN
+                UPDATE "seller_vouch_stats" SET
+                    "vouch_count" = "vouch_count" - 1,
+                    "total_amount" = "total_amount" - COALESCE(OLD."amount", 0)
+                WHERE OLD."mentioned_user_id" IS NOT NULL AND "user_id" = OLD."mentioned_user_id";
+                INSERT INTO "seller_vouch_stats" ("user_id", "vouch_count", "total_amount")
+                SELECT NEW."mentioned_user_id", 1, COALESCE(NEW."amount", 0)
+                WHERE NEW."mentioned_user_id" IS NOT NULL
+                ON CONFLICT ("user_id") DO UPDATE SET
+                    "vouch_count" = "vouch_count" + 1,
+                    "total_amount" = "total_amount" + excluded."total_amount";
+            END
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "customer_spend" (
+                "user_id" INTEGER,
+                "total_spent" INTEGER DEFAULT 0,
+                "purchase_count" INTEGER DEFAULT 0,
+                "username" TEXT,
+                "milestone_checked_total" INTEGER DEFAULT 0
+            );
+            """,
+            # milestone_checked_total is the total the milestone checker last looked at,
+            # rows where it differs from total_spent are the ones to re-check
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS "idx_customer_spend_user_id" ON "customer_spend" ("user_id")
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS "idx_customer_spend_leaderboard" ON "customer_spend" ("total_spent" DESC, "purchase_count" DESC)
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS "trg_vouches_insert_spend" AFTER INSERT ON "vouches"
+            WHEN NEW."spent" > 0
+            BEGIN
+                INSERT INTO "customer_spend" ("user_id", "total_spent", "purchase_count", "username")
+                VALUES (NEW."user_id", NEW."spent", 1, NEW."username")
+                ON CONFLICT ("user_id") DO UPDATE SET
+                    "total_spent" = "total_spent" + excluded."total_spent",
+                    "purchase_count" = "purchase_count" + 1,
+                    "username" = excluded."username";
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS "trg_vouches_delete_spend" AFTER DELETE ON "vouches"
+            WHEN OLD."spent" > 0
+            BEGIN
+                UPDATE "customer_spend" SET
+                    "total_spent" = "total_spent" - OLD."spent",
+                    "purchase_count" = "purchase_count" - 1
+                WHERE "user_id" = OLD."user_id";
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS "trg_vouches_update_spend" AFTER UPDATE OF "user_id", "spent" ON "vouches"
+            BEGIN
+                UPDATE "customer_spend" SET
+                    "total_spent" = "total_spent" - OLD."spent",
+                    "purchase_count" = "purchase_count" - 1
+                WHERE OLD."spent" > 0 AND "user_id" = OLD."user_id";
+                INSERT INTO "customer_spend" ("user_id", "total_spent", "purchase_count", "username")
+                SELECT NEW."user_id", NEW."spent", 1, NEW."username"
+                WHERE NEW."spent" > 0
+                ON CONFLICT ("user_id") DO UPDATE SET
+                    "total_spent" = "total_spent" + excluded."total_spent",
+                    "purchase_count" = "purchase_count" + 1,
+                    "username" = excluded."username";
+            END
+            """,
+            # Digest of the embeds last written to each listing message, lets the
+            # listing refresh skip edits that wouldn't change anything
+            """
+            CREATE TABLE IF NOT EXISTS "listing_renders" (
+                "message_id" INTEGER,
+                "digest" TEXT
+            );
+            """,
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS "idx_listing_renders_message_id" ON "listing_renders" ("message_id")
+            """,
+            # Delayed work run by bot.util.scheduler, due_at is a unix timestamp
+            """
+            CREATE TABLE IF NOT EXISTS "scheduled_jobs" (
+                "key" TEXT,
+                "kind" TEXT,
+                "due_at" REAL,
+                "payload" TEXT,
+                "attempts" INTEGER DEFAULT 0
+            );
+            """,
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS "idx_scheduled_jobs_key" ON "scheduled_jobs" ("key")
+            """,
+            # Stored ticket transcripts, size is the uncompressed HTML and digest its blake2b hash
+            """
+            CREATE TABLE IF NOT EXISTS "transcripts" (
+                "name" TEXT,
+                "channel_id" INTEGER,
+                "opened_by" INTEGER,
+                "path" TEXT,
+                "size" INTEGER,
+                "compressed_size" INTEGER,
+                "message_count" INTEGER,
+                "digest" TEXT,
+                "created_at" TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            """,
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS "idx_transcripts_name" ON "transcripts" ("name")
+            """,
+            """
             CREATE TABLE IF NOT EXISTS "alts" (
                 "uuid"	TEXT,
                 "username"	TEXT,
@@ -579,6 +1055,29 @@ class DatabaseSchema:
             )
             """,
             """
+            CREATE TABLE IF NOT EXISTS "fingerprint_suspects" (
+                "user_id" INTEGER,
+                "suspect_id" INTEGER,
+                "similarity" REAL,
+                "detected_at" TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Persistent tier of bot.util.mojang.MojangResolver, rows older than its TTL are ignored
+            """
+            CREATE TABLE IF NOT EXISTS "mojang_cache" (
+                "uuid" TEXT,
+                "name" TEXT,
+                "name_lower" TEXT,
+                "fetched_at" INTEGER
+            )
+            """,
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS "idx_mojang_cache_uuid" ON "mojang_cache" ("uuid")
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS "idx_mojang_cache_name_lower" ON "mojang_cache" ("name_lower")
+            """,
+            """
             CREATE TABLE IF NOT EXISTS "ai_config" (
                 "monthly_limit" INTEGER DEFAULT 2000,
                 "remaining_credits_free" INTEGER DEFAULT 2000,
@@ -1,7 +1,8 @@
 from fastapi import FastAPI, HTTPException, Request, Query, WebSocket, WebSocketDisconnect, Response, Depends
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response as StarletteResponse
-from fastapi.responses import HTMLResponse, RedirectResponse
+from starlette.background import BackgroundTask
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse, FileResponse
 from fastapi.templating import Jinja2Templates
 import os
 import aiohttp
@@ -16,6 +17,16 @@ from functools import lru_cache, wraps
 import logging
 import uuid
 import httpx
+import gzip
+import hashlib
+import mimetypes
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 load_dotenv()
 APP_API_KEY = os.getenv("API_KEY")
@@ -46,6 +57,18 @@ approved_domains_cache: Set[str] = set()
 last_cache_update: Optional[datetime] = None
 CACHE_TTL_SECONDS = 20
 
+# Static file cache
+STATIC_CACHE_MAX_BYTES = int(os.getenv("STATIC_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+STATIC_COMPRESS_MIN_BYTES = 512
+STATIC_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+
+# Transcript cache, TRANSCRIPT_ROOT is the directory holding the bot folders; when a
+# transcript isn't found there it is fetched from the bot and revalidated by ETag
+TRANSCRIPT_ROOT = os.getenv("TRANSCRIPT_ROOT", "../")
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+TRANSCRIPT_REVALIDATE_SECONDS = float(os.getenv("TRANSCRIPT_REVALIDATE_SECONDS", "30"))
+TRANSCRIPT_CONTENT_TYPE = "text/html; charset=utf-8"
+
 def load_approved_domains() -> Set[str]:
     """
     Loads the list of approved domains from custom_domains.json.
@@ -108,6 +131,347 @@ class AppCache:
         self._bots = bots
         self._last_bots_update = datetime.now()
 
+class RoutingTable:
+    """Resident domain/email -> (bot_name, port) routing table"""
+    def __init__(self, ttl: timedelta = timedelta(minutes=5), negative_ttl: timedelta = timedelta(seconds=30)):
+        self._routes: Dict[str, Dict[str, Tuple[str, int]]] = {"domain": {}, "email": {}}
+        self._misses: Dict[Tuple[str, str], datetime] = {}
+        self._last_refresh: Optional[datetime] = None
+        self._last_attempt: Optional[datetime] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+
+    def is_stale(self) -> bool:
+        if self._last_refresh is None:
+            return True
+        return datetime.now() - self._last_refresh >= self._ttl
+
+    def may_rebuild(self, now: datetime) -> bool:
+        """Rebuilds, failed ones included, are attempted at most once per negative TTL"""
+        return self._last_attempt is None or now - self._last_attempt >= self._negative_ttl
+
+    async def _fetch_bot(self, bot_name: str, port: int) -> Dict[str, Optional[str]]:
+        """
+        Ask a single bot for its domain and email. Only kinds the bot answered
+        are returned, a value of None means the bot has none set.
+        """
+        (domain_ok, domain_data), (email_ok, email_data) = await asyncio.gather(
+            make_bot_request(port, "/api/domain", timeout=5),
+            make_bot_request(port, "/get/email", timeout=5)
+        )
+        answered = {}
+        if domain_ok:
+            domain = domain_data.get("domain")
+            answered["domain"] = domain.lower() if domain else None
+        # The bot answers 404 with success: false when no email is set,
+        # transport errors and timeouts carry no success field
+        if email_ok or email_data.get("success") is False:
+            email = email_data.get("email") if email_ok else None
+            answered["email"] = email.lower() if email else None
+        return answered
+
+    async def _rebuild(self):
+        self._last_attempt = datetime.now()
+        bots = await get_listing_bots()
+        ports = get_ports()
+        pairs = [(bot_name, ports[bot_name]) for bot_name in bots if ports.get(bot_name)]
+
+        results = await asyncio.gather(
+            *(self._fetch_bot(bot_name, port) for bot_name, port in pairs),
+            return_exceptions=True
+        )
+
+        routes = {"domain": {}, "email": {}}
+        for (bot_name, port), result in zip(pairs, results):
+            answered = {} if isinstance(result, Exception) else result
+            for kind in routes:
+                if kind in answered:
+                    key = answered[kind]
+                    # First bot wins, matching the order the old fan-out checked them in
+                    if key:
+                        routes[kind].setdefault(key, (bot_name, port))
+                    continue
+                # The bot didn't answer, keep what it had instead of unrouting it
+                for key, route in self._routes[kind].items():
+                    if route[0] == bot_name:
+                        routes[kind].setdefault(key, route)
+
+        self._routes = routes
+        self._misses.clear()
+        self._last_refresh = datetime.now()
+        logger.info(f"Routing table rebuilt: {len(routes['domain'])} domains, {len(routes['email'])} emails")
+
+    async def refresh(self):
+        """Rebuild the whole table; concurrent callers share one rebuild"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._rebuild())
+        try:
+            await asyncio.shield(self._refresh_task)
+        except Exception as e:
+            logger.error(f"Error rebuilding routing table: {e}")
+
+    async def refresh_bot(self, bot_name: str) -> bool:
+        """
+        Re-read one bot's domain and email, e.g. after it changed its config.
+        Kinds the bot fails to answer keep their current routes.
+        """
+        port = get_ports().get(bot_name)
+        if not port:
+            return False
+
+        answered = await self._fetch_bot(bot_name, port)
+        for kind, key in answered.items():
+            routes = self._routes[kind]
+            for stale_key in [k for k, v in routes.items() if v[0] == bot_name and k != key]:
+                del routes[stale_key]
+            if key:
+                # The pushing bot owns the key now, even if another bot had it
+                routes[key] = (bot_name, port)
+                self._misses.pop((kind, key), None)
+        return True
+
+    async def lookup(self, kind: str, key: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Resolve a domain or email to (bot_name, port) without contacting any bot
+        on a warm table. Unknown keys are negatively cached.
+        """
+        key = key.lower()
+        now = datetime.now()
+        if self._last_refresh is None:
+            # Nothing to serve yet, but a failing rebuild is not retried on every request
+            if self.may_rebuild(now):
+                await self.refresh()
+        elif self.is_stale() and self.may_rebuild(now) and (self._refresh_task is None or self._refresh_task.done()):
+            # Serve the current table while it is rebuilt in the background
+            self._refresh_task = asyncio.create_task(self._rebuild())
+
+        route = self._routes[kind].get(key)
+        if route:
+            return route
+
+        now = datetime.now()
+        missed_at = self._misses.get((kind, key))
+        if missed_at and now - missed_at < self._negative_ttl:
+            return None, None
+
+        # The key may belong to a bot added since the last rebuild, but rebuild
+        # at most once per negative TTL so unknown hosts cannot trigger a fan-out each
+        if self.may_rebuild(now):
+            await self.refresh()
+            route = self._routes[kind].get(key)
+            if route:
+                return route
+
+        self._misses[(kind, key)] = datetime.now()
+        return None, None
+
+class StaticAsset:
+    """A static file held in memory together with its precompressed variants"""
+    __slots__ = ("mtime_ns", "size", "content_type", "etag", "last_modified", "variants", "nbytes")
+
+    def __init__(self, content: bytes, mtime_ns: int, content_type: str, variants: Optional[Dict[str, bytes]] = None):
+        self.mtime_ns = mtime_ns
+        self.size = len(content)
+        self.content_type = content_type
+        self.etag = '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+        self.last_modified = formatdate(mtime_ns / 1e9, usegmt=True)
+        self.variants: Dict[str, bytes] = {"identity": content}
+
+        if variants is not None:
+            # Already compressed by the caller
+            self.variants.update(variants)
+        elif self.size >= STATIC_COMPRESS_MIN_BYTES and content_type.startswith(STATIC_COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < self.size:
+                self.variants["gzip"] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(content, quality=11)
+                if len(compressed) < self.size:
+                    self.variants["br"] = compressed
+
+        self.nbytes = sum(len(variant) for variant in self.variants.values())
+
+class StaticFileCache:
+    """LRU cache of static files bounded by a byte budget, invalidated on mtime change"""
+    def __init__(self, directory: str, max_bytes: int):
+        self._root = os.path.realpath(directory)
+        self._entries: "OrderedDict[str, StaticAsset]" = OrderedDict()
+        self._bytes = 0
+        self._max_bytes = max_bytes
+
+    def resolve(self, full_path: str) -> Optional[str]:
+        """Map a request path to a file inside the static directory, or None"""
+        path = os.path.realpath(os.path.join(self._root, full_path))
+        if not path.startswith(self._root + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def _evict(self, path: str):
+        asset = self._entries.pop(path, None)
+        if asset is not None:
+            self._bytes -= asset.nbytes
+
+    async def get(self, path: str) -> Optional[StaticAsset]:
+        """
+        Return the cached asset for a resolved path, loading it on a miss or when
+        the file changed on disk. Returns None when the file is too large to cache.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._evict(path)
+            return None
+
+        asset = self._entries.get(path)
+        if asset is not None and asset.mtime_ns == stat.st_mtime_ns and asset.size == stat.st_size:
+            self._entries.move_to_end(path)
+            return asset
+
+        self._evict(path)
+        if stat.st_size > self._max_bytes:
+            return None
+
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        asset = await asyncio.to_thread(self._load, path, stat.st_mtime_ns, content_type)
+        if asset.nbytes > self._max_bytes:
+            return asset
+
+        # Another request may have loaded the same file while this one was compressing
+        self._evict(path)
+        self._entries[path] = asset
+        self._bytes += asset.nbytes
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+        return asset
+
+    @staticmethod
+    def _load(path: str, mtime_ns: int, content_type: str) -> StaticAsset:
+        with open(path, "rb") as f:
+            return StaticAsset(f.read(), mtime_ns, content_type)
+
+class TranscriptCache:
+    """
+    LRU of rendered transcripts bounded by a byte budget.
+
+    Transcripts are read straight from the owning bot's folder when it is on
+    this machine and re-checked against the file's mtime. Otherwise they are
+    fetched from the bot and revalidated with If-None-Match once they are older
+    than the revalidation interval. Concurrent misses for one transcript share
+    a single load.
+    """
+    def __init__(self, root: str, max_bytes: int, revalidate_after: float):
+        self._root = os.path.realpath(root)
+        self._max_bytes = max_bytes
+        self._revalidate_after = revalidate_after
+        # (bot_name, identifier) -> (asset, validator, checked_at)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[StaticAsset, str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    def local_path(self, bot_name: str, identifier: str) -> Optional[str]:
+        """The transcript file inside the bot's templates folder, gzipped or not, or None"""
+        base = os.path.realpath(os.path.join(self._root, bot_name, "templates", f"{bot_name}-{identifier}.html"))
+        if not base.startswith(self._root + os.sep):
+            return None
+        for path in (f"{base}.gz", base):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def _evict(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0].nbytes
+
+    def _store(self, key: Tuple[str, str], asset: StaticAsset, validator: str):
+        self._evict(key)
+        if asset.nbytes > self._max_bytes:
+            return
+        self._entries[key] = (asset, validator, time.monotonic())
+        self._bytes += asset.nbytes
+        while self._bytes > self._max_bytes:
+            _, (evicted, _, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    async def get(self, bot_name: str, identifier: str, port: int) -> Optional[StaticAsset]:
+        key = (bot_name, identifier)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[2] < self._revalidate_after:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, port))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Tuple[str, str], port: int) -> Optional[StaticAsset]:
+        entry = self._entries.get(key)
+        path = self.local_path(*key)
+        if path is not None:
+            stat = os.stat(path)
+            validator = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+            if entry is not None and entry[1] == validator:
+                return self._revalidated(key, entry)
+            raw = await asyncio.to_thread(self._read, path)
+            asset = await asyncio.to_thread(self._build, raw, path.endswith(".gz"), stat.st_mtime_ns)
+            self._store(key, asset, validator)
+            return asset
+
+        bot_name, identifier = key
+        headers = {"accept-encoding": "gzip"}
+        if entry is not None:
+            headers["if-none-match"] = entry[1]
+        req = proxy_client.build_request(
+            "GET",
+            f"http://{BOT_SERVICE_HOST}:{port}/transcript/{identifier}.html",
+            params={"api_key": INTERNAL_API_KEY},
+            headers=headers
+        )
+        resp = await proxy_client.send(req, stream=True)
+        try:
+            if resp.status_code == 304 and entry is not None:
+                return self._revalidated(key, entry)
+            if resp.status_code != 200:
+                self._evict(key)
+                return None
+            # Raw bytes, the stored gzip is kept as the gzip variant instead of being decoded by httpx
+            raw = b"".join([chunk async for chunk in resp.aiter_raw()])
+            gzipped = resp.headers.get("content-encoding") == "gzip"
+            validator = resp.headers.get("etag", "")
+            try:
+                mtime_ns = int(parsedate_to_datetime(resp.headers["last-modified"]).timestamp() * 1e9)
+            except (KeyError, TypeError, ValueError):
+                mtime_ns = time.time_ns()
+        finally:
+            await resp.aclose()
+
+        asset = await asyncio.to_thread(self._build, raw, gzipped, mtime_ns)
+        if validator:
+            self._store(key, asset, validator)
+        return asset
+
+    def _revalidated(self, key: Tuple[str, str], entry: Tuple[StaticAsset, str, float]) -> StaticAsset:
+        self._entries[key] = (entry[0], entry[1], time.monotonic())
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _build(raw: bytes, gzipped: bool, mtime_ns: int) -> StaticAsset:
+        if gzipped:
+            return StaticAsset(gzip.decompress(raw), mtime_ns, TRANSCRIPT_CONTENT_TYPE, variants={"gzip": raw})
+        # Transcripts from before compression, gzip only since brotli at quality 11 is slow on multi-MB pages
+        return StaticAsset(raw, mtime_ns, TRANSCRIPT_CONTENT_TYPE, variants={"gzip": gzip.compress(raw, compresslevel=6, mtime=0)})
+
 class SessionStorage:
     """In-memory session storage with automatic cleanup"""
     def __init__(self):
@@ -174,6 +538,9 @@ class App(FastAPI):
         super().__init__(*args, **kwargs)
         self.session: Optional[aiohttp.ClientSession] = None
         self.cache = AppCache()
+        self.routing = RoutingTable()
+        self.static_files = StaticFileCache("static", STATIC_CACHE_MAX_BYTES)
+        self.transcripts = TranscriptCache(TRANSCRIPT_ROOT, TRANSCRIPT_CACHE_MAX_BYTES, TRANSCRIPT_REVALIDATE_SECONDS)
         self.sessions = SessionStorage()
 
 app = App(
@@ -292,6 +659,7 @@ async def startup_event():
     
     # Start background task for session cleanup
     asyncio.create_task(session_cleanup_task())
+    asyncio.create_task(app.routing.refresh())
     
     logger.info("Application started with optimized HTTP session and session management")
 
@@ -309,6 +677,7 @@ async def shutdown_event():
     """Clean up resources on shutdown"""
     if app.session:
         await app.session.close()
+    await proxy_client.aclose()
     logger.info("Application shutdown complete")
 
 async def get_listing_bots() -> List[str]:
@@ -387,42 +756,10 @@ async def make_bot_request(port: int, endpoint: str, timeout: int = 10, data: An
 
 async def find_bot_by_email(email: str) -> Tuple[Optional[str], Optional[int]]:
     """
-    Find a bot by email address efficiently using concurrent requests
+    Find a bot by email address using the resident routing table
     Returns: (bot_name, port) or (None, None) if not found
     """
-    bots = await get_listing_bots()
-    ports = get_ports()
-    
-    # Create concurrent tasks for all bots
-    tasks = []
-    bot_port_pairs = []
-    
-    for bot_name in bots:
-        port = ports.get(bot_name)
-        if port:
-            task = make_bot_request(port, "/get/email", timeout=5)
-            tasks.append(task)
-            bot_port_pairs.append((bot_name, port))
-    
-    if not tasks:
-        return None, None
-    
-    # Execute all requests concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Check results for matching email
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            continue
-            
-        success, data = result
-        if success:
-            bot_email = data.get("email")
-            if bot_email and bot_email.lower() == email.lower():
-                bot_name, port = bot_port_pairs[i]
-                return bot_name, port
-    
-    return None, None
+    return await app.routing.lookup("email", email)
 
 async def get_token(bot_name: str) -> Dict:
     """Get token for a bot with better error handling"""
@@ -920,21 +1257,16 @@ async def get_transcript(request: Request, bot_name: str, identifier: str):
                 await app.sessions.delete_session(session_id)
             return RedirectResponse(url="https://www.youtube.com/shorts/cU060_vSuf0")
 
-        success, response = await make_bot_request(port, f"/transcript/{identifier}.html")
-        
-        if not success:
-            if session_id:
-                await app.sessions.delete_session(session_id)
-            return RedirectResponse(url="https://www.youtube.com/shorts/cU060_vSuf0")
+        asset = await app.transcripts.get(bot_name, identifier, port)
         
-        if not response.get("response"):
+        if asset is None:
             if session_id:
                 await app.sessions.delete_session(session_id)
             return RedirectResponse(url="https://www.youtube.com/shorts/cU060_vSuf0")
-            
-        transcript_html = response.get("response")
+
         logger.info(f"Transcript {identifier} accessed by seller {user_id} in bot {bot_name}")
-        return HTMLResponse(content=transcript_html)
+        # Private, browsers revalidate with the ETag so repeat views are a 304 after the seller check
+        return static_file_response(request, asset, cache_control="private, no-cache")
         
     except Exception as e:
         logger.error(f"Transcript access error: {e}")
@@ -1985,39 +2317,28 @@ async def check_domain(domain: str = Query(...)):
     
 async def find_bot_by_domain(domain: str) -> Tuple[Optional[str], Optional[int]]:
     """
-    Find a bot by domain efficiently using concurrent requests
+    Find a bot by domain using the resident routing table
     Returns: (bot_name, port) or (None, None) if not found
     """
-    bots = await get_listing_bots()
-    ports = get_ports()
-    
-    tasks = []
-    bot_port_pairs = []
-    
-    for bot_name in bots:
-        port = ports.get(bot_name)
-        if port:
-            task = make_bot_request(port, "/api/domain", timeout=5)
-            tasks.append(task)
-            bot_port_pairs.append((bot_name, port))
-    
-    if not tasks:
-        return None, None
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            continue
-            
-        success, data = result
-        if success:
-            bot_domain = data.get("domain")
-            if bot_domain and bot_domain.lower() == domain.lower():
-                bot_name, port = bot_port_pairs[i]
-                return bot_name, port
-    
-    return None, None
+    return await app.routing.lookup("domain", domain)
+
+@app.post("/internal/routing/refresh")
+async def refresh_routing(request: Request, data: dict):
+    """
+    Called by a bot after its domain or email changes. The bot's values are
+    re-read from the bot itself, so the payload only names which bot to check.
+    Bots authenticate with the key the parent uses for them (INTERNAL_API_KEY).
+    """
+    api_key = request.headers.get("X-API-Key") or request.query_params.get("api_key")
+    if not api_key or api_key != INTERNAL_API_KEY:
+        raise HTTPException(status_code=403, detail="Invalid API key")
+
+    bot_name = data.get("bot")
+    if not bot_name:
+        raise HTTPException(status_code=400, detail="Missing bot")
+    if not await app.routing.refresh_bot(bot_name):
+        raise HTTPException(status_code=404, detail="Bot not found")
+    return {"success": True}
 
 
 @app.get("/custom/bot/name")
@@ -2043,42 +2364,164 @@ async def get_bot_name_for_domain(request: Request):
     return {"name": bot_name}
 
 
+# Headers that only apply to a single connection and must not be forwarded by a proxy
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade"
+}
+
+# One pooled client for every frontend proxy so connections are reused across requests
+proxy_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+    timeout=httpx.Timeout(30.0, connect=5.0)
+)
+
+async def proxy_to_frontend(
+    request: Request,
+    target_url: str,
+    default_headers: Optional[Dict[str, str]] = None,
+    extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Proxy a request to the shop frontend and stream the body back chunk by chunk.
+    Conditional headers (If-None-Match / If-Modified-Since) are forwarded as-is, so
+    upstream 304s reach the browser. Bodies are relayed without re-encoding.
+    """
+    url = httpx.URL(target_url, params=request.query_params)
+    headers = {
+        key: value for key, value in request.headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS
+    }
+    headers["host"] = f"{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}"
+    for key, value in (default_headers or {}).items():
+        headers.setdefault(key, value)
+
+    req = proxy_client.build_request(
+        method=request.method,
+        url=url,
+        headers=headers,
+        content=await request.body()
+    )
+    resp = await proxy_client.send(req, stream=True)
+
+    response_headers = {
+        key.lower(): value for key, value in resp.headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS
+    }
+    response_headers["access-control-allow-origin"] = "*"
+    response_headers.update(extra_headers or {})
+
+    content_type = response_headers.get("content-type", "")
+    if "text/html" in content_type and "charset" not in content_type:
+        response_headers["content-type"] = "text/html; charset=utf-8"
+
+    if resp.status_code in (204, 304) or request.method == "HEAD":
+        await resp.aclose()
+        # Nothing is relayed, so upstream's body length and encoding don't describe this response
+        response_headers.pop("content-length", None)
+        response_headers.pop("content-encoding", None)
+        return Response(status_code=resp.status_code, headers=response_headers)
+
+    return StreamingResponse(
+        resp.aiter_raw(),
+        status_code=resp.status_code,
+        headers=response_headers,
+        background=BackgroundTask(resp.aclose)
+    )
+
+def _accepted_encodings(accept_encoding: str) -> Set[str]:
+    encodings = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if name:
+            encodings.add(name.strip().lower())
+    return encodings
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single 'bytes=' range into inclusive (start, end); raises ValueError if unsatisfiable"""
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None  # Multipart ranges are not supported, serve the full body instead
+    start, _, end = spec.strip().partition("-")
+    if not start:
+        length = int(end)
+        if length <= 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+def static_file_response(request: Request, asset: StaticAsset, cache_control: str = "public, max-age=3600") -> Response:
+    """Build a response for a cached asset honouring conditional, Range and Accept-Encoding headers"""
+    headers = {
+        "Cache-Control": cache_control,
+        "Last-Modified": asset.last_modified,
+        "Accept-Ranges": "bytes"
+    }
+    if len(asset.variants) > 1:
+        headers["Vary"] = "Accept-Encoding"
+
+    # Every variant shares the identity ETag with an encoding suffix, so strip it before comparing
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/").replace("-gzip", "").replace("-br", "") for tag in if_none_match.split(",")}
+        if "*" in tags or asset.etag in tags:
+            return Response(status_code=304, headers={**headers, "ETag": asset.etag})
+    elif request.headers.get("if-modified-since"):
+        try:
+            if int(parsedate_to_datetime(request.headers["if-modified-since"]).timestamp()) >= int(asset.mtime_ns // 1_000_000_000):
+                return Response(status_code=304, headers={**headers, "ETag": asset.etag})
+        except (TypeError, ValueError):
+            pass
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range in (asset.etag, asset.last_modified)):
+        try:
+            byte_range = _parse_range(range_header, asset.size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{asset.size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers["ETag"] = asset.etag
+            headers["Content-Range"] = f"bytes {start}-{end}/{asset.size}"
+            return Response(
+                content=asset.variants["identity"][start:end + 1],
+                status_code=206,
+                media_type=asset.content_type,
+                headers=headers
+            )
+
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = next((name for name in ("br", "gzip") if name in accepted and name in asset.variants), "identity")
+    if encoding == "identity":
+        headers["ETag"] = asset.etag
+    else:
+        headers["ETag"] = f'{asset.etag[:-1]}-{encoding}"'
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=asset.variants[encoding], media_type=asset.content_type, headers=headers)
+
 @app.get("/static/{full_path:path}")
 async def flexible_static_endpoint(request: Request, full_path: str):
     """
     Serves static files from local directory if they exist, otherwise proxies to React server.
     This works for both main domains and custom domains.
     """
-    local_file_path = os.path.join("static", full_path)
+    local_file_path = app.static_files.resolve(full_path)
     
-    if os.path.isfile(local_file_path):
+    if local_file_path:
         try:
-            content_type = "application/octet-stream"
-            if full_path.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
-                ext = full_path.split('.')[-1].lower()
-                content_type = f"image/{ext}"
-            elif full_path.lower().endswith('.css'):
-                content_type = "text/css"
-            elif full_path.lower().endswith('.js'):
-                content_type = "application/javascript"
-            elif full_path.lower().endswith('.txt'):
-                content_type = "text/plain"
-            elif full_path.lower().endswith('.json'):
-                content_type = "application/json"
-            elif full_path.lower().endswith('.pdf'):
-                content_type = "application/pdf"
-            
-            with open(local_file_path, "rb") as f:
-                content = f.read()
-            
-            return Response(
-                content=content,
-                media_type=content_type,
-                headers={
-                    "Content-Length": str(len(content)),
-                    "Cache-Control": "public, max-age=3600"
-                }
-            )
+            asset = await app.static_files.get(local_file_path)
+            if asset is not None:
+                return static_file_response(request, asset)
+            # Too large for the cache, stream it straight from disk
+            return FileResponse(local_file_path, headers={"Cache-Control": "public, max-age=3600"})
         except Exception as e:
             logger.error(f"Error serving local static file {full_path}: {e}")
     
@@ -2092,41 +2535,7 @@ async def flexible_static_endpoint(request: Request, full_path: str):
     target_url = f"http://{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}/static/{full_path}"
     
     try:
-        url = httpx.URL(target_url, params=request.query_params)
-        headers = dict(request.headers)
-        headers["host"] = f"{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}"
-        
-        async with httpx.AsyncClient() as client:
-            req = client.build_request(
-                method=request.method,
-                url=url,
-                headers=headers,
-                content=await request.body()
-            )
-            
-            resp = await client.send(req, stream=True)
-            
-            content_type = resp.headers.get("content-type", "application/octet-stream")
-            
-            excluded_headers = ["content-encoding", "transfer-encoding"]
-            response_headers = {}
-            
-            for key, value in resp.headers.items():
-                if key.lower() not in excluded_headers:
-                    response_headers[key] = value
-            
-            response_headers["Access-Control-Allow-Origin"] = "*"
-            
-            content = await resp.aread()
-            response_headers["Content-Length"] = str(len(content))
-            
-            return Response(
-                content=content,
-                status_code=resp.status_code,
-                headers=response_headers,
-                media_type=content_type
-            )
-    
+        return await proxy_to_frontend(request, target_url)
     except httpx.RequestError as e:
         logger.error(f"Failed to proxy static file {full_path}: {e}")
         raise HTTPException(status_code=502, detail="Could not contact the backend service.")
@@ -2135,8 +2544,6 @@ async def flexible_static_endpoint(request: Request, full_path: str):
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
-proxy_client = httpx.AsyncClient()
-
 @app.api_route("/static/{full_path:path}", include_in_schema=False)
 async def custom_domain_static_proxy(request: Request, full_path: str):
     """
@@ -2159,48 +2566,9 @@ async def custom_domain_static_proxy(request: Request, full_path: str):
         )
 
     target_url = f"http://{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}/static/{full_path}"
-    
-    print(f"Static asset request: /static/{full_path}")
-    print(f"Target URL: {target_url}")
 
     try:
-        url = httpx.URL(target_url, params=request.query_params)
-        headers = dict(request.headers)
-        
-        headers["host"] = f"{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}"
-        
-        req = proxy_client.build_request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=await request.body()
-        )
-        
-        print(f"Proxying static asset {request.method} {target_url}")
-        resp = await proxy_client.send(req, stream=True)
-        
-        content_type = resp.headers.get("content-type", "application/octet-stream")
-        print(f"Static asset response: {resp.status_code}, Content-Type: {content_type}")
-        
-        excluded_headers = ["content-encoding", "transfer-encoding"]
-        response_headers = {}
-        
-        for key, value in resp.headers.items():
-            if key.lower() not in excluded_headers:
-                response_headers[key] = value
-        
-        response_headers["Access-Control-Allow-Origin"] = "*"
-        
-        content = await resp.aread()
-        response_headers["Content-Length"] = str(len(content))
-        
-        return Response(
-            content=content,
-            status_code=resp.status_code,
-            headers=response_headers,
-            media_type=content_type
-        )
-
+        return await proxy_to_frontend(request, target_url)
     except httpx.RequestError as e:
         logger.error(f"Failed to proxy static asset request for '{host}' to '{target_url}': {e}")
         raise HTTPException(status_code=502, detail="Could not contact the backend shop service.")
@@ -2226,46 +2594,9 @@ async def custom_domain_assets_proxy(request: Request, full_path: str):
         )
 
     target_url = f"http://{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}/assets/{full_path}"
-    
-    print(f"Assets request: /assets/{full_path}")
-    print(f"Target URL: {target_url}")
 
     try:
-        url = httpx.URL(target_url, params=request.query_params)
-        headers = dict(request.headers)
-        headers["host"] = f"{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}"
-        
-        req = proxy_client.build_request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=await request.body()
-        )
-        
-        resp = await proxy_client.send(req, stream=True)
-        
-        content_type = resp.headers.get("content-type", "application/octet-stream")
-        print(f"Assets response: {resp.status_code}, Content-Type: {content_type}")
-        
-        excluded_headers = ["content-encoding", "transfer-encoding"]
-        response_headers = {}
-        
-        for key, value in resp.headers.items():
-            if key.lower() not in excluded_headers:
-                response_headers[key] = value
-        
-        response_headers["Access-Control-Allow-Origin"] = "*"
-        
-        content = await resp.aread()
-        response_headers["Content-Length"] = str(len(content))
-        
-        return Response(
-            content=content,
-            status_code=resp.status_code,
-            headers=response_headers,
-            media_type=content_type
-        )
-
+        return await proxy_to_frontend(request, target_url)
     except httpx.RequestError as e:
         logger.error(f"Failed to proxy assets request for '{host}' to '{target_url}': {e}")
         raise HTTPException(status_code=502, detail="Could not contact the backend shop service.")
@@ -2288,7 +2619,6 @@ async def custom_domain_shop_proxy(request: Request, full_path: str):
         )
 
     bot_name, _ = await find_bot_by_domain(host)
-    print(f"Bot found for domain {host}: {bot_name}")
 
     if not bot_name:
         return Response(
@@ -2296,104 +2626,22 @@ async def custom_domain_shop_proxy(request: Request, full_path: str):
             status_code=404
         )
 
+    # React SPA - all routes serve index.html
     target_url = f"http://{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}/"
-    
-    print(f"Original request path: /shop/{full_path}")
-    print(f"Target URL: {target_url} (React SPA - all routes serve index.html)")
 
     try:
-        url = httpx.URL(target_url, params=request.query_params)
-        headers = dict(request.headers)
-        
-        headers["host"] = f"{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}"
-        
-        if "accept" not in headers:
-            headers["accept"] = "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
-        
-        # Build and send the new request
-        req = proxy_client.build_request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=await request.body()
+        return await proxy_to_frontend(
+            request,
+            target_url,
+            default_headers={
+                "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
+            },
+            # Ensure CORS headers for CSR applications
+            extra_headers={
+                "access-control-allow-methods": "GET, POST, PUT, DELETE, OPTIONS",
+                "access-control-allow-headers": "*"
+            }
         )
-        
-        print(f"Proxying {request.method} {target_url}")
-        resp = await proxy_client.send(req, stream=True)
-        
-        # Get content type from response
-        content_type = resp.headers.get("content-type", "text/html")
-        print(f"Response: {resp.status_code}, Content-Type: {content_type}")
-        
-        # Handle 304 Not Modified responses - pass through directly with minimal processing
-        if resp.status_code == 304:
-            # For 304 responses, preserve original headers as much as possible
-            response_headers = {}
-            excluded_headers = ["content-encoding", "transfer-encoding", "content-length"]
-            
-            for key, value in resp.headers.items():
-                if key.lower() not in excluded_headers:
-                    response_headers[key] = value
-            
-            # Add minimal CORS headers for browser compatibility
-            response_headers["Access-Control-Allow-Origin"] = "*"
-            
-            return Response(
-                content=b"",  # Empty bytes for 304
-                status_code=304,
-                headers=response_headers
-            )
-        
-        # Exclude headers that can cause issues but preserve important ones
-        excluded_headers = ["content-encoding", "transfer-encoding"]
-        response_headers = {}
-        
-        for key, value in resp.headers.items():
-            if key.lower() not in excluded_headers:
-                response_headers[key] = value
-        
-        # Ensure CORS headers for CSR applications
-        response_headers["Access-Control-Allow-Origin"] = "*"
-        response_headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-        response_headers["Access-Control-Allow-Headers"] = "*"
-        
-        # Handle different content types appropriately
-        if "text/html" in content_type:
-            # For HTML, read the full content
-            content = await resp.aread()
-            
-            # Debug: Log content length and beginning of content
-            print(f"HTML content length: {len(content)} bytes")
-            if len(content) > 0:
-                preview = content[:200].decode('utf-8', errors='ignore')
-                print(f"HTML content preview: {preview}")
-            else:
-                print("HTML content is empty!")
-            
-            # Ensure proper charset
-            if "charset" not in content_type:
-                response_headers["Content-Type"] = "text/html; charset=utf-8"
-            
-            # Set content length for the full content
-            response_headers["Content-Length"] = str(len(content))
-            
-            return Response(
-                content=content,
-                status_code=resp.status_code,
-                headers=response_headers
-            )
-        else:
-            # For other content types (JS, CSS, images, etc.), read full content too
-            content = await resp.aread()
-            response_headers["Content-Length"] = str(len(content))
-            
-            return Response(
-                content=content,
-                status_code=resp.status_code,
-                headers=response_headers,
-                media_type=content_type
-            )
-
     except httpx.RequestError as e:
         logger.error(f"Failed to proxy request for '{host}' to '{target_url}': {e}")
         raise HTTPException(status_code=502, detail="Could not contact the backend shop service.")
@@ -2432,46 +2680,9 @@ async def custom_domain_catch_all(request: Request, full_path: str):
     else:
         # Everything else - serve React app
         target_url = f"http://{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}/"
-    
-    print(f"Catch-all request: /{full_path}")
-    print(f"Target URL: {target_url}")
 
     try:
-        url = httpx.URL(target_url, params=request.query_params)
-        headers = dict(request.headers)
-        headers["host"] = f"{SHOP_FRONTEND_HOST}:{SHOP_FRONTEND_PORT}"
-        
-        req = proxy_client.build_request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=await request.body()
-        )
-        
-        resp = await proxy_client.send(req, stream=True)
-        
-        content_type = resp.headers.get("content-type", "application/octet-stream")
-        print(f"Catch-all response: {resp.status_code}, Content-Type: {content_type}")
-        
-        excluded_headers = ["content-encoding", "transfer-encoding"]
-        response_headers = {}
-        
-        for key, value in resp.headers.items():
-            if key.lower() not in excluded_headers:
-                response_headers[key] = value
-        
-        response_headers["Access-Control-Allow-Origin"] = "*"
-        
-        content = await resp.aread()
-        response_headers["Content-Length"] = str(len(content))
-        
-        return Response(
-            content=content,
-            status_code=resp.status_code,
-            headers=response_headers,
-            media_type=content_type
-        )
-
+        return await proxy_to_frontend(request, target_url)
     except httpx.RequestError as e:
         logger.error(f"Failed to proxy catch-all request for '{host}' to '{target_url}': {e}")
         raise HTTPException(status_code=502, detail="Could not contact the backend shop service.")
@@ -0,0 +1,196 @@
+"""
+Benchmark the shop frontend proxy: buffered bodies against streamed bodies.
+
+Starts a stand-in shop frontend serving --size MB assets, then runs the parent
+API under uvicorn in a child process per mode and downloads --requests assets
+through /assets/ with --concurrency in flight:
+    - buffered: each body read in full before it is returned, as the proxies did before
+    - streamed: the current proxy_to_frontend, relaying chunks as they arrive
+
+Domain routing is stubbed out so only the proxy is measured. Reported per
+mode: throughput, time to first byte and to the full body (p50/p95) and the
+child's peak RSS, idle and after the run.
+
+Run from the parent_api directory.
+Usage: python bench_proxy.py [--size 5] [--requests 200] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+MODES = ("buffered", "streamed")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def serve(mode: str, port: int, frontend_port: int):
+    """Child process: the parent API app with routing stubbed and the proxy picked by mode."""
+    import uvicorn
+    from starlette.responses import Response
+
+    import api
+
+    async def find_bot_by_domain(domain: str):
+        return "bench", 0
+
+    async def get_listing_bots():
+        return []
+
+    async def buffered_proxy_to_frontend(request, target_url, default_headers=None, extra_headers=None):
+        """The proxies before streaming: the whole body is read, then returned at once."""
+        headers = dict(request.headers)
+        headers["host"] = f"{api.SHOP_FRONTEND_HOST}:{api.SHOP_FRONTEND_PORT}"
+        for key, value in (default_headers or {}).items():
+            headers.setdefault(key, value)
+        req = api.proxy_client.build_request(
+            method=request.method,
+            url=httpx.URL(target_url, params=request.query_params),
+            headers=headers,
+            content=await request.body()
+        )
+        resp = await api.proxy_client.send(req, stream=True)
+        response_headers = {
+            key: value for key, value in resp.headers.items()
+            if key.lower() not in ("content-encoding", "transfer-encoding")
+        }
+        response_headers["Access-Control-Allow-Origin"] = "*"
+        response_headers.update(extra_headers or {})
+        content = await resp.aread()
+        response_headers["Content-Length"] = str(len(content))
+        return Response(content=content, status_code=resp.status_code, headers=response_headers)
+
+    # Per-request logging (and the missing custom_domains.json outside the server) would skew the timings
+    logging.getLogger("api").setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    api.SHOP_FRONTEND_HOST, api.SHOP_FRONTEND_PORT = "127.0.0.1", str(frontend_port)
+    api.find_bot_by_domain = find_bot_by_domain
+    api.get_listing_bots = get_listing_bots
+    if mode == "buffered":
+        api.proxy_to_frontend = buffered_proxy_to_frontend
+
+    idle = peak_rss_mb()
+    uvicorn.run(api.app, host="127.0.0.1", port=port, log_level="warning")
+    print(json.dumps({"idle_rss_mb": idle, "peak_rss_mb": peak_rss_mb()}), flush=True)
+
+
+async def start_frontend(size: int) -> tuple:
+    from aiohttp import web
+
+    body = os.urandom(size)
+
+    async def asset(request):
+        return web.Response(body=body, content_type="application/javascript")
+
+    app = web.Application()
+    app.router.add_get("/assets/{path:.*}", asset)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+async def wait_for_port(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def download(client: httpx.AsyncClient, index: int, size: int) -> tuple:
+    """Seconds to the first body byte and to the whole body."""
+    start = time.perf_counter()
+    first_byte = None
+    received = 0
+    async with client.stream("GET", f"/assets/chunk-{index}.js", headers={"host": "shop.example"}) as response:
+        async for chunk in response.aiter_raw():
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            received += len(chunk)
+    assert response.status_code == 200 and received == size, (response.status_code, received)
+    return first_byte, time.perf_counter() - start
+
+
+async def bench(mode: str, frontend_port: int, size: int, requests: int, concurrency: int):
+    port = free_port()
+    child = subprocess.Popen(
+        [sys.executable, __file__, "--serve", mode, "--port", str(port), "--frontend-port", str(frontend_port)],
+        stdout=subprocess.PIPE, text=True
+    )
+    try:
+        await wait_for_port(port)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def limited(client, index):
+            async with slots:
+                return await download(client, index, size)
+
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(limited(client, index) for index in range(requests)))
+            wall = time.perf_counter() - start
+    finally:
+        child.send_signal(signal.SIGINT)
+        output, _ = child.communicate(timeout=30)
+
+    memory = json.loads(output.strip().splitlines()[-1])
+    print(f"    {mode}")
+    print(f"        {requests / wall:>7.1f} req/s  {requests * size / wall / 2 ** 20:>8.1f} MB/s")
+    for label, timings in (("first byte", [first for first, _ in results]), ("full body ", [full for _, full in results])):
+        timings.sort()
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        print(f"        {label} p50 {statistics.median(timings) * 1000:>7.0f} ms  p95 {p95 * 1000:>7.0f} ms")
+    print(f"        peak RSS {memory['idle_rss_mb']:>6.0f} MB idle -> {memory['peak_rss_mb']:>6.0f} MB")
+
+
+async def main(args):
+    size = int(args.size * 2 ** 20)
+    runner, frontend_port = await start_frontend(size)
+    print(f"{args.requests} requests of {args.size} MB, {args.concurrency} in flight")
+    try:
+        for mode in MODES:
+            await bench(mode, frontend_port, size, args.requests, args.concurrency)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=float, default=5, help="asset size in MB")
+    parser.add_argument("--requests", type=int, default=200, help="assets downloaded per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="downloads in flight")
+    parser.add_argument("--serve", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--frontend-port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.frontend_port)
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,167 @@
+"""
+Benchmark custom-domain asset requests: a fan-out to every bot against the routing table.
+
+Starts --bots stand-in listing bots, each answering /api/domain and /get/email
+after --bot-latency seconds, and a stand-in shop frontend on local ports. Then
+requests /assets/ files through the parent API app, each with the Host header
+of some bot's custom domain, resolved either:
+    - fan-out: find_bot_by_domain asks every bot for its domain per request, as before
+    - routing table: the resident RoutingTable, built once before the run
+
+Reported per mode: latency p50/p95, throughput with --concurrency requests in
+flight, how many requests reached the bots and how many asset requests failed
+(a fan-out that times out on a busy bot answers 404 for a configured domain).
+
+Run from the parent_api directory.
+Usage: python bench_routing.py [--bots 50] [--requests 500] [--concurrency 20] [--bot-latency 0.005]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from aiohttp import web
+
+import api
+
+ASSET = b"console.log('shop');\n" * 2000
+
+
+def domain_of(index: int) -> str:
+    return f"shop{index}.example"
+
+
+async def start_site(app: web.Application) -> tuple:
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+async def start_bot(index: int, latency: float, hits: list) -> tuple:
+    async def domain(request):
+        hits[0] += 1
+        await asyncio.sleep(latency)
+        return web.json_response({"domain": domain_of(index)})
+
+    async def email(request):
+        hits[0] += 1
+        await asyncio.sleep(latency)
+        return web.json_response({"success": False, "error": "Email not set"}, status=404)
+
+    app = web.Application()
+    app.router.add_get("/api/domain", domain)
+    app.router.add_get("/get/email", email)
+    return await start_site(app)
+
+
+async def start_frontend() -> tuple:
+    async def asset(request):
+        return web.Response(body=ASSET, content_type="application/javascript")
+
+    app = web.Application()
+    app.router.add_get("/assets/{path:.*}", asset)
+    return await start_site(app)
+
+
+async def fan_out_find_bot_by_domain(domain: str):
+    """find_bot_by_domain before the routing table: every bot is asked on every call."""
+    bots = await api.get_listing_bots()
+    ports = api.get_ports()
+    pairs = [(bot_name, ports[bot_name]) for bot_name in bots if ports.get(bot_name)]
+    results = await asyncio.gather(
+        *(api.make_bot_request(port, "/api/domain", timeout=5) for _, port in pairs),
+        return_exceptions=True
+    )
+    for (bot_name, port), result in zip(pairs, results):
+        if isinstance(result, Exception):
+            continue
+        success, data = result
+        if success and (data.get("domain") or "").lower() == domain.lower():
+            return bot_name, port
+    return None, None
+
+
+async def run(client: httpx.AsyncClient, bots: int, requests: int, concurrency: int) -> tuple:
+    slots = asyncio.Semaphore(concurrency)
+    timings, failures = [], []
+
+    async def fetch(index: int):
+        async with slots:
+            start = time.perf_counter()
+            response = await client.get(f"/assets/app-{index}.js", headers={"host": domain_of(index % bots)})
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                failures.append(response.status_code)
+            else:
+                assert response.content == ASSET, "asset body changed in transit"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(index) for index in range(requests)))
+    return time.perf_counter() - start, sorted(timings), failures
+
+
+def report(label: str, requests: int, wall: float, timings: list, failures: list, bot_requests: int):
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"    {label}")
+    print(f"        latency p50 {statistics.median(timings) * 1000:>7.1f} ms  p95 {p95 * 1000:>7.1f} ms   {requests / wall:>7.0f} req/s")
+    print(f"        requests to bots {bot_requests}, failed asset requests {len(failures)}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bots", type=int, default=50, help="stand-in listing bots")
+    parser.add_argument("--requests", type=int, default=500, help="asset requests per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="requests in flight")
+    parser.add_argument("--bot-latency", type=float, default=0.005, help="seconds a bot takes to answer")
+    args = parser.parse_args()
+
+    hits = [0]
+    runners, ports = [], {}
+    for index in range(args.bots):
+        runner, port = await start_bot(index, args.bot_latency, hits)
+        runners.append(runner)
+        ports[f"bot{index}"] = port
+    frontend, frontend_port = await start_frontend()
+    runners.append(frontend)
+
+    async def get_listing_bots():
+        return list(ports)
+
+    api.BOT_SERVICE_HOST = "127.0.0.1"
+    api.SHOP_FRONTEND_HOST, api.SHOP_FRONTEND_PORT = "127.0.0.1", str(frontend_port)
+    api.get_listing_bots = get_listing_bots
+    api.get_ports = lambda: ports
+    table_lookup = api.find_bot_by_domain
+    await api.startup_event()
+    # Let the startup rebuild finish so it is not counted against the fan-out
+    await api.app.routing.refresh()
+
+    print(f"{args.bots} bots, {args.requests} asset requests, {args.concurrency} in flight")
+    transport = httpx.ASGITransport(app=api.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://parent") as client:
+            api.find_bot_by_domain = fan_out_find_bot_by_domain
+            hits[0] = 0
+            wall, timings, failures = await run(client, args.bots, args.requests, args.concurrency)
+            report("fan-out per request", args.requests, wall, timings, failures, hits[0])
+
+            api.find_bot_by_domain = table_lookup
+            hits[0] = 0
+            start = time.perf_counter()
+            await api.app.routing.refresh()
+            build = time.perf_counter() - start
+            build_hits, hits[0] = hits[0], 0
+            wall, timings, failures = await run(client, args.bots, args.requests, args.concurrency)
+            report("routing table", args.requests, wall, timings, failures, hits[0])
+            print(f"        table build {build * 1000:.0f} ms, {build_hits} requests to bots")
+    finally:
+        await api.shutdown_event()
+        for runner in runners:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())